@@ -4,11 +4,18 @@ from django.core.validators import RegexValidator
 from django.core.validators import validate_image_file_extension
 from django.contrib.auth import authenticate
 
+from main.forms import ConstraintErrorsMixin
+
 from .models import UserProfile, User
 
 
 # Custom form for signup validation
-class SignUpForm(forms.ModelForm):
+class SignUpForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = {
+        'email': ('email', 'A user with that email already exists.'),
+        'user_email_ci_uniq': ('email', 'A user with that email already exists.'),
+    }
+
     password1 = forms.CharField(label='Password', widget=forms.PasswordInput)
     password2 = forms.CharField(label='Confirm Password', widget=forms.PasswordInput)
 
@@ -28,8 +35,6 @@ class SignUpForm(forms.ModelForm):
 
     def clean_email(self):
         email = self.cleaned_data['email'].lower()
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError('A user with that email already exists.')
         return email
 
     def clean_password1(self):
@@ -1,7 +1,10 @@
 import uuid 
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, UserManager
 
+from project import fragments
+
 
 class CustomUserManager(UserManager):
 
@@ -50,6 +53,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     # A list of fields required when creating a user via the createsuperuser management command.
     REQUIRED_FIELDS = ['name',]
 
+    class Meta:
+        constraints = [
+            # email stays unique=True for exact lookups at login; this also
+            # rejects addresses that only differ by case.
+            models.UniqueConstraint(Lower('email'), name='user_email_ci_uniq'),
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The owner's name is part of cached project fragments; a login
+        # only touches last_login and leaves them alone.
+        if set(kwargs.get('update_fields') or ()) != {'last_login'}:
+            fragments.invalidate_user(self.pk)
+
 
 class UserProfile(models.Model):
 
@@ -71,4 +88,9 @@ class UserProfile(models.Model):
     x = models.URLField(blank=True, null=True)
 
     def __str__(self):
-        return f"{self.user.name}'s Profile"
\ No newline at end of file
+        return f"{self.user.name}'s Profile"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The avatar is part of cached project fragments.
+        fragments.invalidate_user(self.user_id)
\ No newline at end of file
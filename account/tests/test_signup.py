@@ -1,5 +1,6 @@
 import logging
 
+from django.db import IntegrityError
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -136,6 +137,35 @@ class SignupViewTests(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertIn('A user with that email already exists.', str(messages[0]))
 
+    def test_post_duplicate_email_different_case(self):
+        """Test POST with an existing email in other case is rejected by the constraint"""
+        User.objects.create_user(
+            name='Existing User',
+            email='test@example.com',
+            password='TestPass123!'
+        )
+
+        data = {
+            'name': 'New User',
+            'email': 'Test@Example.com',
+            'password1': 'TestPass123!',
+            'password2': 'TestPass123!'
+        }
+        # No SELECT pre-check: savepoint, INSERT, rollback and release only.
+        with self.assertNumQueries(4):
+            response = self.client.post(self.signup_url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('email', response.context['form'].errors)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_email_unique_ignores_case(self):
+        """Test the database rejects emails that only differ by case"""
+        User.objects.create_user(name='Existing User', email='test@example.com', password='x')
+
+        with self.assertRaises(IntegrityError):
+            User.objects.create(name='Other', email='TEST@example.com')
+
     def test_post_short_password(self):
         """Test POST with password that's too short"""
         data = {
@@ -36,8 +36,9 @@ def signup(request):
     """
     if request.method == 'POST':
         form = SignUpForm(request.POST)
-        if form.is_valid():
-            user = form.save()
+        # The email uniqueness check is the insert itself (see SignUpForm).
+        user = form.save_unique() if form.is_valid() else None
+        if user:
             logger.info(f"New user signed up: {user.email}")
             messages.success(request, FORM_MESSAGES['success'])
             return redirect(reverse('account:login'))
@@ -0,0 +1,17 @@
+import atexit
+
+from django.apps import AppConfig
+from django.core.signals import request_finished
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'audit'
+
+    def ready(self):
+        from . import log
+
+        # Buffered events are written once a response has gone out, and
+        # whatever is left when the worker shuts down is written on exit.
+        request_finished.connect(log.flush_if_due, dispatch_uid='audit_flush_if_due')
+        atexit.register(log.flush)
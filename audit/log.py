@@ -0,0 +1,129 @@
+"""
+Buffered, append-only audit logging.
+
+Views call record() or record_many() after a change. Nothing is written
+then: once the change commits, the event joins an in-process buffer, and
+the buffer is written with bulk_create(), AUDIT_BATCH_SIZE rows per INSERT,
+when it is full, at the end of the first request that finishes after
+AUDIT_FLUSH_INTERVAL seconds, and when the process exits (see
+AuditConfig.ready). A request therefore never waits on an audit write
+except for the one that fills the buffer.
+
+Events that have not been flushed are lost if the process is killed
+outright; a normal worker shutdown runs the exit flush.
+"""
+import logging
+import threading
+import time
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.utils import timezone
+
+from main.background import retry_locked
+
+from .models import AuditEvent
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 5.0
+AUDIT_MAX_PENDING = 10000
+
+_lock = threading.Lock()
+_pending = []
+_oldest = None
+
+
+def _outside_transaction():
+    # Automatic flushes never write into a transaction someone else opened:
+    # if it rolled back, the events would go with it.
+    return not connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def record(user, action, object_type, object_id, project_id=None, changes=None):
+    """
+    Log that `user` applied `action` ('create', 'update', 'delete' or
+    'toggle') to the object of `object_type` with `object_id`. The event is
+    buffered once the current transaction commits, and dropped if it rolls
+    back.
+    """
+    record_many(user, action, object_type, [object_id], project_id, changes)
+
+
+def record_many(user, action, object_type, object_ids, project_id=None, changes=None):
+    """record() for several objects changed together, e.g. by a bulk action."""
+    now = timezone.now()
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    events = [
+        AuditEvent(
+            created_at=now, user_id=user_id, action=action, object_type=object_type,
+            object_id=object_id, project_id=project_id, changes=changes,
+        )
+        for object_id in object_ids
+    ]
+    if events:
+        transaction.on_commit(lambda: _append(events))
+
+
+def _append(events):
+    global _oldest
+    with _lock:
+        if not _pending:
+            _oldest = time.monotonic()
+        _pending.extend(events)
+        full = len(_pending) >= AUDIT_BATCH_SIZE
+    if full and _outside_transaction():
+        flush()
+
+
+def pending():
+    """The number of events waiting to be written."""
+    with _lock:
+        return len(_pending)
+
+
+def clear():
+    """Drop every pending event without writing it. Returns how many there were."""
+    with _lock:
+        dropped = len(_pending)
+        _pending.clear()
+    return dropped
+
+
+def flush_if_due(**kwargs):
+    """Flush when the oldest pending event has waited AUDIT_FLUSH_INTERVAL."""
+    with _lock:
+        due = bool(_pending) and time.monotonic() - _oldest >= AUDIT_FLUSH_INTERVAL
+    if due and _outside_transaction():
+        flush()
+
+
+def _write(events):
+    with transaction.atomic():
+        AuditEvent.objects.bulk_create(events, batch_size=AUDIT_BATCH_SIZE)
+
+
+def flush():
+    """Write every pending event. Returns how many were written."""
+    global _oldest
+    with _lock:
+        events = _pending[:]
+        _pending.clear()
+    if not events:
+        return 0
+
+    try:
+        retry_locked(_write, events)
+    except DatabaseError:
+        logger.exception(f"Failed to write {len(events)} audit events")
+        # Keep them for the next flush, but never grow without bound.
+        with _lock:
+            _pending[:0] = events
+            if len(_pending) > AUDIT_MAX_PENDING:
+                dropped = len(_pending) - AUDIT_MAX_PENDING
+                del _pending[:dropped]
+                logger.error(f"Dropped {dropped} audit events")
+            _oldest = time.monotonic()
+        return 0
+    return len(events)
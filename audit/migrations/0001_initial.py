@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete'), ('toggle', 'Toggle')], max_length=10)),
+                ('object_type', models.CharField(choices=[('todolist', 'To-do list'), ('task', 'Task'), ('note', 'Note'), ('file', 'File')], max_length=10)),
+                ('object_id', models.UUIDField()),
+                ('project_id', models.UUIDField(null=True)),
+                ('changes', models.JSONField(null=True)),
+                ('user', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='audit_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['object_type', 'object_id', 'created_at'], name='audit_object_created_idx'), models.Index(fields=['user', 'created_at'], name='audit_user_created_idx')],
+            },
+        ),
+    ]
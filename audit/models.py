@@ -0,0 +1,65 @@
+from django.db import models
+from django.utils import timezone
+
+from account.models import User
+
+
+class AuditEventQuerySet(models.QuerySet):
+
+    def for_object(self, object_type, object_id):
+        """The history of one object, newest first (audit_object_created_idx)."""
+        return self.filter(object_type=object_type, object_id=object_id).order_by('-created_at', '-id')
+
+    def for_user(self, user):
+        """Everything `user` changed, newest first (audit_user_created_idx)."""
+        return self.filter(user=user).order_by('-created_at', '-id')
+
+
+class AuditEvent(models.Model):
+    """
+    One change made by a user: rows are only ever inserted, in batches, by
+    audit.log. Objects are referenced by type and id rather than by foreign
+    key, so the history outlives what it describes.
+    """
+    ACTIONS = [
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+        ('toggle', 'Toggle'),
+    ]
+    OBJECT_TYPES = [
+        ('todolist', 'To-do list'),
+        ('task', 'Task'),
+        ('note', 'Note'),
+        ('file', 'File'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    # When the change happened, not when the event was flushed.
+    created_at = models.DateTimeField(default=timezone.now)
+    # No constraint: events are written after the fact and stay when the
+    # user goes.
+    user = models.ForeignKey(
+        User, null=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name='audit_events'
+    )
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPES)
+    object_id = models.UUIDField()
+    project_id = models.UUIDField(null=True)
+    changes = models.JSONField(null=True)
+
+    objects = AuditEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['object_type', 'object_id', 'created_at'], name='audit_object_created_idx'),
+            models.Index(fields=['user', 'created_at'], name='audit_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.action} {self.object_type} {self.object_id}'
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Audit events cannot be changed.')
+        super().save(*args, **kwargs)
@@ -0,0 +1,174 @@
+import uuid
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from audit import log
+from audit.models import AuditEvent
+from project.models import Project
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class AuditLogTests(TestCase):
+    def setUp(self):
+        # Drop anything other tests left in the buffer.
+        log.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='Test List', project=self.project, created_by=self.user
+        )
+        self.task = Task.objects.create(
+            name='Task', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+    def _task_url(self, name, pk=None):
+        kwargs = {'project_id': self.project.pk, 'todolist_id': self.todolist.pk}
+        if pk:
+            kwargs['pk'] = pk
+        return reverse(f'task:{name}', kwargs=kwargs)
+
+    def test_events_are_buffered_until_flushed(self):
+        """Test normal case: a change is logged only when the buffer is flushed"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self._task_url('toggle_done', self.task.pk))
+
+        self.assertEqual(log.pending(), 1)
+        self.assertFalse(AuditEvent.objects.exists())
+        self.assertEqual(log.flush(), 1)
+
+        event = AuditEvent.objects.get()
+        self.assertEqual(
+            (event.user, event.action, event.object_type, event.object_id, event.project_id, event.changes),
+            (self.user, 'toggle', 'task', self.task.pk, self.project.pk, {'is_done': True}),
+        )
+
+    def test_rolled_back_changes_are_not_logged(self):
+        """Test edge case: events of a transaction that never commits are dropped"""
+        with self.captureOnCommitCallbacks(execute=False):
+            log.record(self.user, 'update', 'task', self.task.pk, self.project.pk)
+        self.assertEqual(log.pending(), 0)
+
+    def test_full_buffer_is_written_in_batches(self):
+        """Test normal case: a full buffer is written with one INSERT per batch"""
+        ids = [uuid.uuid4() for _ in range(7)]
+        with patch.object(log, 'AUDIT_BATCH_SIZE', 3), patch.object(log, '_outside_transaction', return_value=True):
+            # Three INSERTs inside one savepoint.
+            with self.assertNumQueries(5):
+                with self.captureOnCommitCallbacks(execute=True):
+                    log.record_many(self.user, 'delete', 'task', ids, self.project.pk)
+            self.assertEqual(log.pending(), 0)
+        self.assertEqual(AuditEvent.objects.count(), 7)
+
+    def test_flush_if_due(self):
+        """Test normal case: the end of a request flushes events older than the interval"""
+        with self.captureOnCommitCallbacks(execute=True):
+            log.record(self.user, 'create', 'note', uuid.uuid4(), self.project.pk)
+
+        with patch.object(log, '_outside_transaction', return_value=True):
+            log.flush_if_due()
+            self.assertEqual(log.pending(), 1)
+            with patch.object(log, 'AUDIT_FLUSH_INTERVAL', 0):
+                log.flush_if_due()
+        self.assertEqual(log.pending(), 0)
+        self.assertEqual(AuditEvent.objects.count(), 1)
+
+    def test_failed_flush_keeps_events(self):
+        """Test edge case: events that could not be written stay buffered"""
+        with self.captureOnCommitCallbacks(execute=True):
+            log.record(self.user, 'create', 'file', uuid.uuid4(), self.project.pk)
+        with patch.object(log, '_write', side_effect=OperationalError('disk I/O error')):
+            self.assertEqual(log.flush(), 0)
+        self.assertEqual(log.pending(), 1)
+        self.assertEqual(log.flush(), 1)
+
+    def test_clear_drops_events(self):
+        """Test edge case: cleared events are never written"""
+        with self.captureOnCommitCallbacks(execute=True):
+            log.record(self.user, 'create', 'file', uuid.uuid4(), self.project.pk)
+        self.assertEqual(log.clear(), 1)
+        self.assertEqual(log.flush(), 0)
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_views_record_changes(self):
+        """Test normal case: creating, editing and deleting are logged per object"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self._task_url('add'), {'name': 'New task'})
+        new_task = Task.objects.get(name='New task')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self._task_url('edit', new_task.pk), {'name': 'Renamed', 'description': ''})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(self._task_url('delete', new_task.pk))
+        log.flush()
+
+        actions = list(AuditEvent.objects.for_object('task', new_task.pk).values_list('action', flat=True))
+        self.assertEqual(actions, ['delete', 'update', 'create'])
+
+    def test_bulk_logs_only_tasks_in_the_list(self):
+        """Test invalid input: ids outside the to-do list are not logged"""
+        other_project = Project.objects.create(name='Other', created_by=self.other_user)
+        other_list = Todolist.objects.create(name='Other', project=other_project, created_by=self.other_user)
+        foreign = Task.objects.create(
+            name='Foreign', project=other_project, todolist=other_list, created_by=self.other_user
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self._task_url('bulk'), {'action': 'done', 'tasks': [self.task.pk, foreign.pk]})
+        log.flush()
+
+        self.assertEqual(
+            list(AuditEvent.objects.for_user(self.user).values_list('object_id', flat=True)), [self.task.pk]
+        )
+        self.assertFalse(AuditEvent.objects.for_object('task', foreign.pk).exists())
+
+    def test_activity_view(self):
+        """Test normal case: the activity page lists only the user's own events"""
+        with self.captureOnCommitCallbacks(execute=True):
+            log.record(self.user, 'update', 'task', self.task.pk, self.project.pk)
+            log.record(self.other_user, 'update', 'task', self.task.pk, self.project.pk)
+        log.flush()
+
+        response = self.client.get(reverse('audit:activity'), {
+            'type': 'task', 'id': self.task.pk, 'format': 'json'
+        })
+        self.assertEqual(response.status_code, 200)
+        events = response.json()['events']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['id'], str(self.task.pk))
+
+        response = self.client.get(reverse('audit:activity'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, str(self.task.pk))
+
+    def test_activity_view_invalid_query(self):
+        """Test invalid input: a malformed object id or cursor is a 404"""
+        response = self.client.get(reverse('audit:activity'), {'type': 'task', 'id': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('audit:activity'), {'cursor': '!!'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_events_are_append_only(self):
+        """Test invalid input: a stored event cannot be saved again"""
+        with self.captureOnCommitCallbacks(execute=True):
+            log.record(self.user, 'update', 'task', self.task.pk, self.project.pk)
+        log.flush()
+        event = AuditEvent.objects.get()
+        with self.assertRaises(ValueError):
+            event.save()
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'audit'
+
+
+urlpatterns = [
+    path('', views.activity, name='activity'),
+]
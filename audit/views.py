@@ -0,0 +1,64 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_http_methods
+
+from project.pagination import InvalidCursor, keyset_paginate
+
+from .models import AuditEvent
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# constants
+ACTIVITY_ORDERING = ('-created_at', '-id')
+ACTIVITY_PAGE_SIZE = 50
+
+
+@login_required(login_url='/login')
+@require_http_methods(["GET"])
+def activity(request):
+    """
+    List the authenticated user's changes, newest first, or the history of
+    one object with ?type=<object type>&id=<uuid>. Pages are keyset
+    paginated (?cursor=); ?format=json answers with JSON.
+    """
+    object_type, object_id = request.GET.get('type'), request.GET.get('id')
+    try:
+        if object_type or object_id:
+            events = AuditEvent.objects.for_object(object_type, object_id).filter(user=request.user)
+        else:
+            events = AuditEvent.objects.for_user(request.user)
+        page = keyset_paginate(
+            events, ACTIVITY_ORDERING, cursor=request.GET.get('cursor'), page_size=ACTIVITY_PAGE_SIZE
+        )
+    except (InvalidCursor, ValidationError) as e:
+        logger.warning(f"Invalid activity query from {request.user.email}: {str(e)}")
+        raise Http404('Invalid activity query.')
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'events': [
+                {
+                    'created_at': event.created_at.isoformat(),
+                    'action': event.action,
+                    'type': event.object_type,
+                    'id': str(event.object_id),
+                    'project_id': str(event.project_id) if event.project_id else None,
+                    'changes': event.changes,
+                }
+                for event in page.items
+            ],
+            'next_cursor': page.next_cursor,
+        })
+
+    return render(request, 'audit/activity.html', {
+        'events': page.items,
+        'next_cursor': page.next_cursor,
+        'object_type': object_type,
+        'object_id': object_id,
+    })
@@ -0,0 +1,54 @@
+import logging
+import threading
+import time
+
+from django.db import OperationalError, connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+LOCKED_RETRIES = 20
+LOCKED_BACKOFF = 0.05
+
+
+def run_after_commit(function, *args, **kwargs):
+    """
+    Call `function(*args, **kwargs)` in a daemon thread once the current
+    transaction commits, so slow work does not hold up the request. The
+    thread closes its own database connections when it is done.
+
+    Nothing is persisted: work that must survive a restart needs a way to
+    be picked up again (e.g. a management command).
+    """
+    def start():
+        threading.Thread(
+            target=_run, args=(function, args, kwargs), daemon=True,
+            name=f'background-{function.__name__}',
+        ).start()
+
+    transaction.on_commit(start)
+
+
+def _run(function, args, kwargs):
+    try:
+        function(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Background task {function.__name__} failed")
+    finally:
+        connections.close_all()
+
+
+def retry_locked(function, *args, **kwargs):
+    """
+    Call `function`, retrying it if SQLite refuses the write lock. A
+    background transaction that reads before it writes fails (rather than
+    waits) when it tries to upgrade while a request is mid-write; requests
+    commit quickly, so backing off briefly is enough.
+    """
+    for attempt in range(LOCKED_RETRIES):
+        try:
+            return function(*args, **kwargs)
+        except OperationalError as e:
+            if 'locked' not in str(e) or attempt == LOCKED_RETRIES - 1:
+                raise
+            time.sleep(LOCKED_BACKOFF * (attempt + 1))
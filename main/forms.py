@@ -0,0 +1,79 @@
+from django.db import IntegrityError, transaction
+
+
+class ConstraintErrorsMixin:
+    """
+    Form mixin for uniqueness that is enforced by database constraints
+    rather than by a pre-check query.
+
+    `constraint_errors` maps a UniqueConstraint name (or the name of a
+    unique=True field) of `constraint_model` to the form field and message
+    to report when it is violated:
+
+        constraint_errors = {
+            'project_owner_name_uniq': ('name', 'A project with this name already exists.'),
+        }
+
+    Django's own uniqueness/constraint checks are skipped for those fields
+    (they would each cost a query), so save with save_unique(), or pass an
+    IntegrityError to add_integrity_error() yourself.
+    """
+    constraint_errors = {}
+    constraint_model = None
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.update(field for field, _ in self.constraint_errors.values())
+        return exclude
+
+    def _constraint_model(self):
+        return self.constraint_model or self._meta.model
+
+    def _signatures(self, key):
+        """
+        Substrings identifying a violation of `key` in an IntegrityError
+        message: the constraint name (PostgreSQL, and SQLite for expression
+        indexes), SQLite's "table.column, ..." list and PostgreSQL's
+        "Key (column, ...)=" detail.
+        """
+        opts = self._constraint_model()._meta
+        fields = next(
+            (constraint.fields for constraint in opts.constraints if constraint.name == key),
+            (key,) if key in {field.name for field in opts.concrete_fields} else (),
+        )
+        columns = [opts.get_field(name).column for name in fields]
+        signatures = [key]
+        if columns:
+            signatures.append(', '.join(f'{opts.db_table}.{column}' for column in columns))
+            signatures.append(f"Key ({', '.join(columns)})=")
+        return signatures
+
+    def add_integrity_error(self, error):
+        """
+        Attach `error` to the form if it violates one of `constraint_errors`.
+        Returns False (and adds nothing) for any other integrity error.
+        """
+        message = str(error)
+        for key, (field, text) in self.constraint_errors.items():
+            if any(signature in message for signature in self._signatures(key)):
+                self.add_error(field, text)
+                return True
+        return False
+
+    def save_unique(self, instance=None):
+        """
+        save() the form inside a savepoint, or just `instance.save()` when
+        the view built the instance itself with save(commit=False). Returns
+        the saved instance, or None with the form error set if a known
+        constraint was violated.
+        """
+        try:
+            with transaction.atomic():
+                if instance is None:
+                    return self.save()
+                instance.save()
+                return instance
+        except IntegrityError as e:
+            if not self.add_integrity_error(e):
+                raise
+            return None
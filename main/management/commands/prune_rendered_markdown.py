@@ -0,0 +1,22 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from main.rendering import MARKDOWN_RETENTION, prune
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete stored Markdown HTML that no page has read for longer than the retention, '
+        'e.g. that of text edited since. Run it periodically (e.g. daily from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=float, default=MARKDOWN_RETENTION.days,
+            help='Delete HTML not read for longer than this many days.'
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune(retention=datetime.timedelta(days=options['retention_days']))
+        self.stdout.write(f"rendered texts removed: {pruned}")
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 05:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renderedmarkdown',
+            name='last_used',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
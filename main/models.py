@@ -1,3 +1,18 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class RenderedMarkdown(models.Model):
+    """
+    Sanitized HTML for a Markdown text, addressed by a digest of the text
+    and the renderer settings (see main.rendering). The HTML is never
+    updated: changed text has a new digest. Rows not read for a while are
+    pruned by the `prune_rendered_markdown` management command.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    html = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.digest
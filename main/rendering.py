@@ -0,0 +1,144 @@
+"""
+Markdown rendering for notes and descriptions, cached by content.
+
+render_markdown() turns user Markdown into HTML and sanitizes it with nh3,
+which together cost far more than the rest of a page. Results are keyed by
+a SHA-256 digest of the text and MARKDOWN_VERSION (bump it when changing
+the extensions or the sanitizer rules), and kept at two levels:
+
+1. an in-process LRU of MARKDOWN_CACHE_SIZE entries;
+2. the RenderedMarkdown table, shared by every process and kept across
+   restarts.
+
+Views call warm() after saving text, so the page that later displays it
+reads the stored HTML instead of rendering.
+
+Edited text leaves the row of its old digest behind. Every read, from
+either level, moves the row's last_used forward, at most once per
+MARKDOWN_TOUCH_INTERVAL (the LRU remembers when it last did), and
+prune() (the `prune_rendered_markdown` management command) deletes the
+rows nobody read for MARKDOWN_RETENTION.
+"""
+import datetime
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import markdown
+import nh3
+from django.db import DatabaseError
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .models import RenderedMarkdown
+
+
+logger = logging.getLogger(__name__)
+
+MARKDOWN_VERSION = 1
+MARKDOWN_CACHE_SIZE = 1024
+MARKDOWN_EXTENSIONS = ('fenced_code', 'tables', 'sane_lists')
+MARKDOWN_TOUCH_INTERVAL = datetime.timedelta(days=1)
+MARKDOWN_RETENTION = datetime.timedelta(days=30)
+
+_lock = threading.Lock()
+_recent = OrderedDict()
+
+
+def _digest(text):
+    return hashlib.sha256(f'{MARKDOWN_VERSION}:{text}'.encode()).hexdigest()
+
+
+def _remember(digest, html, used):
+    with _lock:
+        _recent[digest] = (html, used)
+        _recent.move_to_end(digest)
+        while len(_recent) > MARKDOWN_CACHE_SIZE:
+            _recent.popitem(last=False)
+
+
+def _recall(digest):
+    """The LRU's (html, last_used) for `digest`, or None."""
+    with _lock:
+        entry = _recent.get(digest)
+        if entry is not None:
+            _recent.move_to_end(digest)
+        return entry
+
+
+def _render(text):
+    html = markdown.markdown(text, extensions=list(MARKDOWN_EXTENSIONS), output_format='html')
+    return nh3.clean(html, link_rel='noopener noreferrer nofollow')
+
+
+def _touch(digest, now):
+    try:
+        RenderedMarkdown.objects.filter(digest=digest).update(last_used=now)
+    except DatabaseError as e:
+        logger.warning(f"Could not touch rendered Markdown {digest}: {str(e)}")
+
+
+def _load(digest, now):
+    """The stored (html, last_used) for `digest`, or None."""
+    try:
+        row = RenderedMarkdown.objects.filter(digest=digest).values_list('html', 'last_used').first()
+    except DatabaseError as e:
+        logger.warning(f"Could not read rendered Markdown {digest}: {str(e)}")
+        return None
+    if row is None:
+        return None
+    html, last_used = row
+    if now - last_used >= MARKDOWN_TOUCH_INTERVAL:
+        _touch(digest, now)
+        last_used = now
+    return html, last_used
+
+
+def _store(digest, html):
+    try:
+        RenderedMarkdown.objects.bulk_create(
+            [RenderedMarkdown(digest=digest, html=html)], ignore_conflicts=True
+        )
+    except DatabaseError as e:
+        # The LRU still has it; another request will try again.
+        logger.warning(f"Could not store rendered Markdown {digest}: {str(e)}")
+
+
+def render_markdown(text):
+    """Return `text` rendered as sanitized HTML, marked safe for templates."""
+    if not text:
+        return mark_safe('')
+    digest = _digest(text)
+    now = timezone.now()
+    entry = _recall(digest) or _load(digest, now)
+    if entry is None:
+        html, used = _render(text), now
+        _store(digest, html)
+    else:
+        html, used = entry
+        # Reads served from memory keep the stored row alive too.
+        if now - used >= MARKDOWN_TOUCH_INTERVAL:
+            _touch(digest, now)
+            used = now
+    _remember(digest, html, used)
+    return mark_safe(html)
+
+
+def warm(*texts):
+    """Render and store `texts` ahead of the pages that show them."""
+    for text in texts:
+        render_markdown(text)
+
+
+def prune(now=None, retention=MARKDOWN_RETENTION):
+    """Delete the stored HTML not read for longer than `retention` and return how many rows."""
+    cutoff = (now or timezone.now()) - retention
+    deleted, _ = RenderedMarkdown.objects.filter(last_used__lt=cutoff).delete()
+    return deleted
+
+
+def clear():
+    """Forget the in-process LRU (the stored HTML stays)."""
+    with _lock:
+        _recent.clear()
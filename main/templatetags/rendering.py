@@ -0,0 +1,16 @@
+from django import template
+
+from main.rendering import render_markdown
+
+
+register = template.Library()
+
+
+@register.filter(name='markdown')
+def markdown_filter(text):
+    """
+    Render user Markdown as sanitized HTML, from the render cache:
+
+        {% load rendering %} {{ note.body|markdown }}
+    """
+    return render_markdown(text)
@@ -0,0 +1,15 @@
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    The default runner, plus dropping the audit events tests buffered
+    before the test databases go away, so the exit flush does not write
+    them into the real database.
+    """
+
+    def teardown_databases(self, old_config, **kwargs):
+        from audit import log
+
+        log.clear()
+        super().teardown_databases(old_config, **kwargs)
@@ -36,6 +36,8 @@ INSTALLED_APPS = [
     'project.apps.ProjectConfig',
     'todolist.apps.TodolistConfig',
     'task.apps.TaskConfig',
+    'search.apps.SearchConfig',
+    'audit.apps.AuditConfig',
 
     # third-party apps
     'social_django',
@@ -130,6 +132,22 @@ DATABASES = {
     }
 }
 
+# Drops buffered audit events before the test databases are destroyed.
+TEST_RUNNER = 'main.test_runner.TestRunner'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Holds the versioned page fragments of project/fragments.py. Use a shared
+# backend (Memcached, Redis) when running more than one worker process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'planpilot',
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
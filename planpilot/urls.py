@@ -10,6 +10,8 @@ urlpatterns = [
     path('', include('account.urls', namespace='account')),
     path('social-auth/', include('social_django.urls', namespace='social')),
     path('projects/', include('project.urls')),
+    path('search/', include('search.urls')),
+    path('audit/', include('audit.urls')),
     path('projects/<uuid:project_id>/', include('todolist.urls')),
     path('projects/<uuid:project_id>/<uuid:todolist_id>/', include('task.urls')),
     path('__debug__/', include('debug_toolbar.urls')),
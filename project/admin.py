@@ -1,9 +1,10 @@
 from django.contrib import admin
 
 
-from .models import Project, ProjectFile, ProjectNote 
+from .models import ArchivedProject, Project, ProjectFile, ProjectNote 
 
 
 admin.site.register(Project)
 admin.site.register(ProjectFile)
 admin.site.register(ProjectNote)
+admin.site.register(ArchivedProject)
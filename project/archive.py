@@ -0,0 +1,169 @@
+"""
+Archive tier for finished projects.
+
+archive_project() serializes a whole project tree (todolists, tasks, notes
+with their revision history, and file records) into one zlib-compressed JSON document stored on an
+ArchivedProject row, then removes the tree from the hot tables, so live
+queries and their indexes only ever see active work. The document keeps
+every concrete column of every row, so restore_projects() can put the
+tree back exactly, under its original primary keys, without going
+through the model layer.
+
+Attachments stay where they are in storage; only their rows are archived.
+"""
+import base64
+import datetime
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+
+from task.models import Task, TaskRecurrence
+from todolist.models import Todolist
+
+from . import fragments
+from .uploads import discard_uploads
+from .bulk import insert_rows
+from .models import ArchivedProject, FileUpload, NoteRevision, Project, ProjectFile, ProjectNote
+
+
+ARCHIVE_FORMAT = 1
+RESTORE_BATCH_SIZE = 1000
+
+# Section name -> model, in restore (dependency) order.
+ARCHIVE_SECTIONS = {
+    'todolists': Todolist,
+    'tasks': Task,
+    'recurrences': TaskRecurrence,
+    'notes': ProjectNote,
+    'revisions': NoteRevision,
+    'files': ProjectFile,
+}
+
+# Models without a project column, and how their rows reach the project.
+PROJECT_LOOKUPS = {
+    NoteRevision: 'note__project_id',
+}
+
+
+class ArchiveEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder rounds datetimes to milliseconds; keep them exact.
+    Binary columns go in as base64, which BinaryField.to_python() decodes.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        if isinstance(o, (bytes, memoryview)):
+            return base64.b64encode(o).decode()
+        return super().default(o)
+
+
+def _columns(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def _values(model, rows):
+    """
+    Turn JSON rows back into value tuples ordered like concrete_fields.
+    Columns missing from older documents get the field's default.
+    """
+    fields = model._meta.concrete_fields
+    for row in rows:
+        yield tuple(
+            field.to_python(row[field.attname]) if field.attname in row else field.get_default()
+            for field in fields
+        )
+
+
+def _rows(model, project_id):
+    return model.objects.filter(**{PROJECT_LOOKUPS.get(model, 'project_id'): project_id}).order_by()
+
+
+def _restore_rows(model, rows):
+    field_names = [field.name for field in model._meta.concrete_fields]
+    insert_rows(model, field_names, _values(model, rows), batch_size=RESTORE_BATCH_SIZE)
+
+
+def archive_project(project):
+    """
+    Move `project` and everything under it into a new ArchivedProject and
+    return it. Runs in one transaction; the hot rows are removed with a
+    handful of set-based DELETEs.
+    """
+    with transaction.atomic():
+        document = {
+            'format': ARCHIVE_FORMAT,
+            'project': Project.objects.filter(pk=project.pk).values(*_columns(Project)).get(),
+        }
+        for section, model in ARCHIVE_SECTIONS.items():
+            document[section] = list(_rows(model, project.pk).values(*_columns(model)))
+
+        archived = ArchivedProject.objects.create(
+            id=project.pk,
+            name=project.name,
+            description=project.description,
+            created_by_id=project.created_by_id,
+            created_at=project.created_at,
+            todolist_count=len(document['todolists']),
+            task_count=len(document['tasks']),
+            note_count=len(document['notes']),
+            file_count=len(document['files']),
+            payload=zlib.compress(
+                json.dumps(document, cls=ArchiveEncoder, separators=(',', ':')).encode()
+            ),
+        )
+
+        # Children first, leaves before parents, so each DELETE is a plain
+        # set-based statement and the final project delete finds nothing to
+        # cascade to. ProjectFile's delete() is bypassed on purpose: the
+        # attachments must stay in storage for a later restore.
+        for model in reversed(ARCHIVE_SECTIONS.values()):
+            _rows(model, project.pk).delete()
+        # Unfinished uploads are not archived.
+        discard_uploads(FileUpload.objects.filter(project_id=project.pk))
+        project.delete()
+
+    return archived
+
+
+def load_archive(archived):
+    """Return the decompressed document of an ArchivedProject as a dict."""
+    return json.loads(zlib.decompress(bytes(archived.payload)))
+
+
+def restore_project(archived):
+    """
+    Recreate the project tree stored in `archived` under its original ids
+    and delete the archive row. Raises IntegrityError if something now
+    conflicts with it (e.g. a live project took its name).
+    """
+    document = load_archive(archived)
+    project_id = archived.pk
+
+    with transaction.atomic():
+        # Rows go back verbatim, counters and timestamps included.
+        _restore_rows(Project, [document['project']])
+        for section, model in ARCHIVE_SECTIONS.items():
+            # Older archives predate some sections.
+            _restore_rows(model, document.get(section, []))
+        archived.delete()
+        fragments.invalidate_user(archived.created_by_id)
+
+    return Project.objects.get(pk=project_id)
+
+
+def restore_projects(archives):
+    """
+    Restore several archives, each in its own transaction. Returns the
+    restored projects and the archives that could not be restored.
+    """
+    restored, failed = [], []
+    for archived in archives:
+        try:
+            restored.append(restore_project(archived))
+        except IntegrityError:
+            failed.append(archived)
+    return restored, failed
@@ -0,0 +1,66 @@
+"""
+The project board: each to-do list as a column of task cards.
+
+load_board() fills every column with one query whatever the number of
+lists: ROW_NUMBER() OVER (PARTITION BY todolist_id ORDER BY rank, id)
+numbers each list's tasks and only the first BOARD_COLUMN_SIZE (plus one,
+to tell whether more exist) come back. Column totals come from the lists'
+counter columns rather than a COUNT per column. Later cards of a column
+are keyset pages after the column's cursor (column_page()).
+"""
+from dataclasses import dataclass
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from task.models import Task
+from todolist.models import Todolist
+
+from .pagination import encode_cursor, keyset_paginate
+
+
+BOARD_COLUMN_SIZE = 20
+BOARD_ORDERING = ('rank', 'id')
+CARD_FIELDS = ('id', 'name', 'is_done', 'due_at', 'rank', 'todolist_id')
+
+
+@dataclass
+class Column:
+    todolist: Todolist
+    tasks: list
+    next_cursor: str = None
+
+
+def _cursor_after(task):
+    return encode_cursor(getattr(task, field) for field in BOARD_ORDERING)
+
+
+def load_board(project, column_size=BOARD_COLUMN_SIZE):
+    """The project's lists, by name, as Columns of their first cards."""
+    todolists = list(project.todolists.order_by('name'))
+    tasks = Task.objects.filter(project=project).only(*CARD_FIELDS).annotate(
+        position=Window(
+            RowNumber(), partition_by=[F('todolist_id')], order_by=[F('rank').asc(), F('id').asc()]
+        )
+    ).filter(position__lte=column_size + 1).order_by('todolist_id', 'position')
+
+    cards = {todolist.pk: [] for todolist in todolists}
+    for task in tasks:
+        cards[task.todolist_id].append(task)
+
+    columns = []
+    for todolist in todolists:
+        tasks = cards[todolist.pk]
+        column = Column(todolist, tasks[:column_size])
+        if len(tasks) > column_size:
+            column.next_cursor = _cursor_after(tasks[column_size - 1])
+        columns.append(column)
+    return columns
+
+
+def column_page(todolist, cursor, column_size=BOARD_COLUMN_SIZE):
+    """
+    The cards of `todolist` after `cursor`, as a KeysetPage. Raises
+    InvalidCursor for a tampered cursor.
+    """
+    return keyset_paginate(todolist.tasks.only(*CARD_FIELDS), BOARD_ORDERING, cursor, column_size)
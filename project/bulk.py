@@ -0,0 +1,40 @@
+from django.db import transaction
+
+
+def insert_rows(model, field_names, rows, batch_size=2000):
+    """
+    INSERT plain value tuples (ordered like `field_names`) into `model`'s
+    table with executemany(), `batch_size` rows per call.
+
+    This is for copying rows in bulk: at tens of thousands of rows, building
+    model instances for bulk_create costs far more than the INSERT itself.
+    Nothing from the model layer runs: no defaults, no pre_save() (so
+    auto_now fields keep the values given), no save() and no signals, so
+    callers must supply every column and maintain any counters themselves.
+    Returns the number of rows inserted.
+    """
+    connection = transaction.get_connection()
+    fields = [model._meta.get_field(name) for name in field_names]
+    sql = 'INSERT INTO {table} ({columns}) VALUES ({placeholders})'.format(
+        table=connection.ops.quote_name(model._meta.db_table),
+        columns=', '.join(connection.ops.quote_name(field.column) for field in fields),
+        placeholders=', '.join(['%s'] * len(fields)),
+    )
+    preparers = [
+        lambda value, field=field: field.get_db_prep_save(value, connection)
+        for field in fields
+    ]
+
+    inserted = 0
+    batch = []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append([prepare(value) for prepare, value in zip(preparers, row)])
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            inserted += len(batch)
+    return inserted
@@ -0,0 +1,101 @@
+import uuid
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from task.models import Task
+from todolist.models import Todolist
+
+from .bulk import insert_rows
+from .models import Project, ProjectNote
+
+
+CLONE_BATCH_SIZE = 2000
+
+
+def clone_project(source, owner, name, description=None, keep_progress=False):
+    """
+    Deep-copy `source` (todolists, tasks and notes; not files) into a new
+    project called `name` owned by `owner`, and return the new project.
+
+    Everything happens in one transaction. Primary keys are generated up
+    front so children can be linked to their new parents without reading
+    anything back, todolists and notes are written with bulk_create, and the
+    source tasks are streamed in chunks and inserted without building model
+    instances, so the number of queries depends only on the number of
+    batches and memory stays bounded for very large projects.
+
+    Tasks start out not done unless `keep_progress` is set. The new rows'
+    counters are filled in directly since bulk_create skips save().
+    """
+    with transaction.atomic():
+        todolists = list(
+            source.todolists.order_by().values_list('id', 'name', 'description')
+        )
+        notes = list(source.notes.order_by().values_list('name', 'body'))
+        task_totals = {
+            row['todolist']: row
+            for row in Task.objects.filter(project=source)
+                                   .order_by()
+                                   .values('todolist')
+                                   .annotate(
+                                       tasks=Count('pk'),
+                                       completed=Count('pk', filter=Q(is_done=True)),
+                                   )
+        }
+        task_count = sum(row['tasks'] for row in task_totals.values())
+        completed_count = sum(row['completed'] for row in task_totals.values())
+
+        project = Project(
+            name=name,
+            description=source.description if description is None else description,
+            created_by=owner,
+            todolist_count=len(todolists),
+            task_count=task_count,
+            completed_task_count=completed_count if keep_progress else 0,
+            note_count=len(notes),
+        )
+        project.save()
+
+        todolist_ids = {old_id: uuid.uuid4() for old_id, _, _ in todolists}
+        Todolist.objects.bulk_create(
+            [
+                Todolist(
+                    id=todolist_ids[old_id],
+                    name=todolist_name,
+                    description=todolist_description,
+                    project=project,
+                    created_by=owner,
+                    task_count=task_totals.get(old_id, {}).get('tasks', 0),
+                    completed_task_count=(
+                        task_totals.get(old_id, {}).get('completed', 0) if keep_progress else 0
+                    ),
+                )
+                for old_id, todolist_name, todolist_description in todolists
+            ],
+            batch_size=CLONE_BATCH_SIZE,
+        )
+
+        ProjectNote.objects.bulk_create(
+            [ProjectNote(name=note_name, body=body, project=project) for note_name, body in notes],
+            batch_size=CLONE_BATCH_SIZE,
+        )
+
+        # The new tasks never match project=source, so streaming the source
+        # while inserting into the same table is safe even on SQLite.
+        source_tasks = Task.objects.filter(project=source) \
+                                   .order_by() \
+                                   .values_list('todolist_id', 'name', 'description', 'is_done', 'due_at', 'rank') \
+                                   .iterator(chunk_size=CLONE_BATCH_SIZE)
+        insert_rows(
+            Task,
+            ('id', 'name', 'description', 'is_done', 'due_at', 'rank', 'project', 'todolist', 'created_by'),
+            (
+                (uuid.uuid4(), task_name, task_description, is_done and keep_progress, due_at, rank,
+                 project.pk, todolist_ids[todolist_id], owner.pk)
+                for todolist_id, task_name, task_description, is_done, due_at, rank in source_tasks
+            ),
+            batch_size=CLONE_BATCH_SIZE,
+        )
+
+    return project
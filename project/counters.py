@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from task.models import Task
+from todolist.models import Todolist
+
+from .models import Project, ProjectFile, ProjectNote
+
+
+def _aggregate(model, parent, function, output_field=IntegerField(), **filters):
+    """
+    Correlated subquery computing `function` over the rows of `model` whose
+    `parent` foreign key points at the outer row.
+    """
+    rows = model.objects.filter(**{parent: OuterRef('pk')}, **filters) \
+                        .order_by() \
+                        .values(parent) \
+                        .annotate(total=function) \
+                        .values('total')
+    return Coalesce(Subquery(rows, output_field=output_field), 0)
+
+
+def project_counters():
+    """Expressions computing the true value of every Project counter."""
+    return {
+        'todolist_count': _aggregate(Todolist, 'project', Count('pk')),
+        'task_count': _aggregate(Task, 'project', Count('pk')),
+        'completed_task_count': _aggregate(Task, 'project', Count('pk'), is_done=True),
+        'note_count': _aggregate(ProjectNote, 'project', Count('pk')),
+        'file_count': _aggregate(ProjectFile, 'project', Count('pk')),
+        'file_bytes': _aggregate(
+            ProjectFile, 'project', Sum('size'), output_field=BigIntegerField()
+        ),
+    }
+
+
+def todolist_counters():
+    """Expressions computing the true value of every Todolist counter."""
+    return {
+        'task_count': _aggregate(Task, 'todolist', Count('pk')),
+        'completed_task_count': _aggregate(Task, 'todolist', Count('pk'), is_done=True),
+    }
+
+
+def reconcile(model, counters, batch_size=500):
+    """
+    Walk `model` in primary key order, `batch_size` rows at a time, and
+    rewrite the counters that drifted from the values computed by
+    `counters`. Each batch is one SELECT plus at most one bulk UPDATE in
+    its own short transaction, so the table is never locked for long.
+
+    Returns a (checked, repaired) tuple.
+    """
+    fields = list(counters)
+    actual = {f'actual_{field}': expression for field, expression in counters.items()}
+    checked = repaired = 0
+    last_pk = None
+
+    while True:
+        with transaction.atomic():
+            batch = model.objects.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            rows = list(batch.only('pk', *fields).annotate(**actual)[:batch_size])
+            if not rows:
+                break
+
+            drifted = []
+            for row in rows:
+                stale = False
+                for field in fields:
+                    value = getattr(row, f'actual_{field}')
+                    if getattr(row, field) != value:
+                        setattr(row, field, value)
+                        stale = True
+                if stale:
+                    drifted.append(row)
+
+            if drifted:
+                model.objects.bulk_update(drifted, fields)
+
+        checked += len(rows)
+        repaired += len(drifted)
+        last_pk = rows[-1].pk
+
+    return checked, repaired
+
+
+def reconcile_all(batch_size=500):
+    """Reconcile Todolist counters, then Project counters."""
+    return {
+        'todolists': reconcile(Todolist, todolist_counters(), batch_size),
+        'projects': reconcile(Project, project_counters(), batch_size),
+    }
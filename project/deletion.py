@@ -0,0 +1,138 @@
+"""
+Background deletion of projects.
+
+Deleting a project through the ORM collects every todolist, task, note and
+file into memory and holds the database write lock for the whole cascade.
+Instead, schedule_deletion() only marks the project and hands it to a
+background thread; purge_project() then removes the children in bounded
+batches, each in its own short transaction, so other writers only ever
+wait for one batch. The project's rollup counters go down as batches
+commit, which is what the progress page reports.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from main.background import retry_locked, run_after_commit
+from task.models import Task
+from todolist.models import Todolist
+
+from . import fragments
+from .uploads import discard_uploads
+from .models import FileUpload, Project, ProjectFile, ProjectNote
+
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 500
+
+
+def schedule_deletion(project):
+    """
+    Mark `project` as being deleted and start purging it once the current
+    transaction commits. Returns False if it was already scheduled.
+    """
+    total = project.todolist_count + project.task_count + project.note_count + project.file_count
+    scheduled = Project.objects.filter(pk=project.pk, deleting_at__isnull=True) \
+                               .update(deleting_at=timezone.now(), deletion_total=total)
+    if not scheduled:
+        return False
+
+    fragments.invalidate_project(project.pk)
+    fragments.invalidate_user(project.created_by_id)
+    run_after_commit(purge_project, project.pk)
+    return True
+
+
+def deletion_progress(project):
+    """Return how much of a scheduled deletion is left, from the counters."""
+    remaining = max(
+        project.todolist_count + project.task_count + project.note_count + project.file_count, 0
+    )
+    total = max(project.deletion_total, remaining)
+    return {
+        'remaining': remaining,
+        'total': total,
+        'percent': 100 if not total else round(100 * (total - remaining) / total),
+    }
+
+
+def purge_project(project_id, batch_size=DELETE_BATCH_SIZE):
+    """
+    Delete a project scheduled with schedule_deletion() and everything under
+    it, `batch_size` rows per transaction. Safe to re-run after a crash: it
+    simply continues with whatever is left.
+    """
+    project = Project.objects.filter(pk=project_id, deleting_at__isnull=False).first()
+    if project is None:
+        return False
+
+    while retry_locked(_delete_task_batch, project_id, batch_size):
+        pass
+    while retry_locked(_delete_batch, Todolist, project_id, batch_size, 'todolist_count'):
+        pass
+    while retry_locked(_delete_batch, ProjectNote, project_id, batch_size, 'note_count'):
+        pass
+    while retry_locked(_delete_file_batch, project_id, batch_size):
+        pass
+    retry_locked(discard_uploads, FileUpload.objects.filter(project_id=project_id))
+
+    # Only the bare row is left (plus anything added since the last batch).
+    with transaction.atomic():
+        project.delete()
+    logger.info(f"Project {project_id} purged")
+    return True
+
+
+def _delete_task_batch(project_id, batch_size):
+    with transaction.atomic():
+        rows = list(
+            Task.objects.filter(project_id=project_id).values_list('pk', 'is_done')[:batch_size]
+        )
+        if not rows:
+            return False
+        Task.objects.filter(pk__in=[pk for pk, _ in rows]).delete()
+        # The todolists' own counters are left alone: they are deleted next.
+        Project.objects.filter(pk=project_id).adjust(
+            task_count=-len(rows),
+            completed_task_count=-sum(is_done for _, is_done in rows),
+        )
+    return True
+
+
+def _delete_batch(model, project_id, batch_size, counter):
+    with transaction.atomic():
+        pks = list(model.objects.filter(project_id=project_id).values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return False
+        model.objects.filter(pk__in=pks).delete()
+        Project.objects.filter(pk=project_id).adjust(**{counter: -len(pks)})
+    return True
+
+
+def _delete_file_batch(project_id, batch_size):
+    with transaction.atomic():
+        rows = list(
+            ProjectFile.objects.filter(project_id=project_id)
+                               .values_list('pk', 'attachment', 'size')[:batch_size]
+        )
+        if not rows:
+            return False
+        ProjectFile.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+        Project.objects.filter(pk=project_id).adjust(
+            file_count=-len(rows),
+            file_bytes=-sum(size for _, _, size in rows),
+        )
+        names = [name for _, name, _ in rows if name]
+        transaction.on_commit(lambda: _remove_attachments(names))
+    return True
+
+
+def _remove_attachments(names):
+    storage = ProjectFile._meta.get_field('attachment').storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning(f"Could not remove attachment {name}: {e}")
@@ -1,23 +1,48 @@
 from django import forms
 
+from main.forms import ConstraintErrorsMixin
+
 from .models import ProjectFile, Project, ProjectNote
 
 
+PROJECT_NAME_ERRORS = {
+    'project_owner_name_uniq': ('name', 'A project with this name already exists.'),
+}
+
+
 # Project form validation
 
-class ProjectForm(forms.ModelForm):
+class ProjectForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = PROJECT_NAME_ERRORS
+
     class Meta:
         model = Project
-        fields = ['name', 'description']
+        fields = ['name', 'description', 'is_template']
 
     def clean_name(self):
         name = self.cleaned_data['name']
         if len(name) > 100:
             raise forms.ValidationError("Name cannot exceed 100 characters.")
-        elif Project.objects.filter(name=name).exists():
-            raise forms.ValidationError("A project with this name already exists.")
         return name
 
+
+# Project clone form validation
+
+class ProjectCloneForm(ConstraintErrorsMixin, forms.Form):
+    constraint_model = Project
+    constraint_errors = PROJECT_NAME_ERRORS
+
+    name = forms.CharField(max_length=255)
+    description = forms.CharField(widget=forms.Textarea, required=False)
+    keep_progress = forms.BooleanField(required=False)
+
+    def clean_name(self):
+        name = self.cleaned_data['name'].strip()
+        if len(name) > 100:
+            raise forms.ValidationError("Name cannot exceed 100 characters.")
+        return name
+
+
 # Project File form validation
 
 
@@ -63,3 +88,20 @@ class ProjectNoteForm(forms.ModelForm):
         if not body:
             raise forms.ValidationError('Body cannot be empty.')
         return body
+
+
+class NoteAutosaveForm(forms.Form):
+    """
+    One autosave of a note being edited: its text and the version the
+    editor started from. The name is optional.
+    """
+    version = forms.IntegerField(min_value=1)
+    name = forms.CharField(required=False)
+    body = forms.CharField()
+
+    clean_body = ProjectNoteForm.clean_body
+
+    def clean_name(self):
+        if not self.cleaned_data['name'].strip():
+            return ''
+        return ProjectNoteForm.clean_name(self)
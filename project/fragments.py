@@ -0,0 +1,105 @@
+"""
+Versioned fragment cache for the project list and project detail pages.
+
+Every cache key embeds a version number owned by a project or a user.
+Saving or deleting anything under a project bumps that project's version
+(and saving or deleting the project, or editing its owner's name or
+profile, bumps its owner's version), so stale fragments simply stop
+being addressed and age out of the cache on their own; nothing is ever
+purged explicitly.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+FRAGMENT_TIMEOUT = 60 * 60
+HITS_KEY = 'fragments:hits'
+MISSES_KEY = 'fragments:misses'
+
+
+def _version_key(scope, pk):
+    return f'fragments:version:{scope}:{pk}'
+
+
+def _version(scope, pk):
+    key = _version_key(scope, pk)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock rather than 1: if the version key is ever
+        # evicted, the new namespace can't collide with fragments cached
+        # under the old one.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(scope, pk):
+    key = _version_key(scope, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def project_version(project_id):
+    return _version('project', project_id)
+
+
+def user_version(user_id):
+    return _version('user', user_id)
+
+
+def invalidate_project(project_id):
+    """Retire every fragment of a project once the current transaction commits."""
+    transaction.on_commit(lambda: _bump('project', project_id))
+
+
+def invalidate_user(user_id):
+    """Retire every per-user fragment (e.g. the project grid) on commit."""
+    transaction.on_commit(lambda: _bump('user', user_id))
+
+
+def fragment_key(name, *parts):
+    return ':'.join(['fragments', name, *(str(part) for part in parts)])
+
+
+def all_cached(keys):
+    """Report whether every key is present, without touching the hit/miss stats."""
+    keys = list(keys)
+    return len(cache.get_many(keys)) == len(keys)
+
+
+def lookup(key):
+    value = cache.get(key)
+    _count(MISSES_KEY if value is None else HITS_KEY)
+    return value
+
+
+def store(key, value):
+    cache.set(key, value, timeout=FRAGMENT_TIMEOUT)
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def stats():
+    """Return the hit/miss counters shared by every worker using the cache."""
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
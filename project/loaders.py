@@ -0,0 +1,52 @@
+from django.db.models import Prefetch
+from django.db.models.functions import Substr
+from django.shortcuts import get_object_or_404
+
+from todolist.models import Todolist
+
+from .models import Project, ProjectFile, ProjectNote
+
+
+# Characters of a note body or description shown in list views.
+PREVIEW_LENGTH = 50
+
+
+def with_preview(queryset, field, length=PREVIEW_LENGTH):
+    """
+    Defer the text column `field` and annotate `preview` with its first
+    `length` + 1 characters, cut by the database. The extra character lets
+    `preview|truncatechars:length` still tell whether to add an ellipsis,
+    so it renders exactly what `field|truncatechars:length` did without
+    reading the whole text.
+    """
+    return queryset.defer(field).annotate(preview=Substr(field, 1, length + 1))
+
+
+def load_project_detail(user, pk, prefetch=True):
+    """
+    Load everything the project detail page renders in a fixed number of
+    queries, however many children the project has:
+
+    1. the project, its owner and the owner's profile; per-section counts
+       come from the project's denormalized counter columns;
+    2. the todolists;
+    3. the notes;
+    4. the files.
+
+    Descriptions and note bodies stay in the database; the cards show a
+    preview cut by the query (see with_preview).
+
+    Pass prefetch=False when the sections are already cached as fragments;
+    only the ownership-checking project query then runs.
+
+    Raises Http404 unless the project exists and is owned by `user`.
+    """
+    queryset = Project.objects.select_related('created_by__profile')
+    if prefetch:
+        queryset = queryset.prefetch_related(
+            Prefetch('todolists', queryset=with_preview(Todolist.objects.all(), 'description')),
+            Prefetch('notes', queryset=with_preview(ProjectNote.objects.all(), 'body')),
+            Prefetch('files', queryset=ProjectFile.objects.all()),
+        )
+
+    return get_object_or_404(queryset, created_by=user, pk=pk)
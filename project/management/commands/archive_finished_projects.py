@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from project.archive import archive_project
+from project.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Move finished projects (every task done) into the archive so the '
+        'live tables only hold active work.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=30,
+            help='Only archive projects created at least this many days ago.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='List the projects that would be archived without moving them.'
+        )
+
+    def handle(self, *args, **options):
+        # The rollup counters make "finished" a plain column comparison.
+        finished = Project.objects.filter(
+            task_count__gt=0,
+            completed_task_count=F('task_count'),
+            is_template=False,
+            deleting_at__isnull=True,
+            created_at__lte=timezone.now() - timedelta(days=options['days']),
+        ).order_by('created_at')
+
+        archived = 0
+        for project in list(finished):
+            if options['dry_run']:
+                self.stdout.write(f"would archive: {project.name}")
+                continue
+            archive_project(project)
+            archived += 1
+        self.stdout.write(f"projects archived: {archived}")
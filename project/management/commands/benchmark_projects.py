@@ -0,0 +1,78 @@
+import time
+import uuid
+import statistics
+
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from account.models import User
+from project.models import Project
+from project.pagination import encode_cursor, keyset_paginate
+from project.views import PROJECTS_ORDERING, PROJECTS_PAGE_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure project list latency for the first and the deepest keyset '
+        'page as the number of projects grows. Runs inside a transaction '
+        'that is rolled back, so no data is left behind.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+            help='Project counts to benchmark.'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Timed runs per measurement; the median is reported.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'projects':>10} {'first page ms':>14} {'deep page ms':>13} {'offset ms':>10}"
+        )
+        for size in options['sizes']:
+            with transaction.atomic():
+                first, deep, offset = self._measure(size, options['repeat'])
+                transaction.set_rollback(True)
+            self.stdout.write(f"{size:>10} {first:>14.2f} {deep:>13.2f} {offset:>10.2f}")
+
+    def _measure(self, size, repeat):
+        user = User.objects.create_user(
+            name='benchmark', email=f'benchmark-{uuid.uuid4().hex}@example.com'
+        )
+        Project.objects.bulk_create(
+            [Project(name=f'bench-{uuid.uuid4().hex}', created_by=user) for _ in range(size)],
+            batch_size=500,
+        )
+        queryset = Project.objects.filter(created_by=user)
+
+        # Cursor pointing at the last full page, i.e. the deepest scroll.
+        tail = list(
+            queryset.order_by(*PROJECTS_ORDERING)
+                    .values_list('created_at', 'id')[max(size - PROJECTS_PAGE_SIZE - 1, 0):][:1]
+        )
+        deep_cursor = encode_cursor(tail[0]) if tail else None
+
+        def first_page():
+            keyset_paginate(queryset, PROJECTS_ORDERING, page_size=PROJECTS_PAGE_SIZE)
+
+        def deep_page():
+            keyset_paginate(queryset, PROJECTS_ORDERING, cursor=deep_cursor, page_size=PROJECTS_PAGE_SIZE)
+
+        def offset_page():
+            # What the same scroll depth costs with LIMIT/OFFSET.
+            start = max(size - PROJECTS_PAGE_SIZE, 0)
+            list(queryset.order_by(*PROJECTS_ORDERING)[start:start + PROJECTS_PAGE_SIZE])
+
+        return self._time(first_page, repeat), self._time(deep_page, repeat), self._time(offset_page, repeat)
+
+    @staticmethod
+    def _time(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
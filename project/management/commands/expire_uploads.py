@@ -0,0 +1,22 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from project.uploads import UPLOAD_EXPIRY, expire_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove resumable uploads left unfinished and idle for longer than the expiry, '
+        'with the bytes they received. Run it periodically (e.g. hourly from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--expiry-hours', type=float, default=UPLOAD_EXPIRY.total_seconds() / 3600,
+            help='Remove uploads idle for longer than this many hours.'
+        )
+
+    def handle(self, *args, **options):
+        expired = expire_uploads(expiry=datetime.timedelta(hours=options['expiry_hours']))
+        self.stdout.write(f"uploads removed: {expired}")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from project.deletion import DELETE_BATCH_SIZE, purge_project
+from project.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Finish deleting every project marked for deletion, in batches. '
+        'Picks up purges interrupted by a restart.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=DELETE_BATCH_SIZE,
+            help='Rows deleted per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        pending = Project.objects.filter(deleting_at__isnull=False) \
+                                 .order_by('deleting_at') \
+                                 .values_list('pk', flat=True)
+        purged = 0
+        for project_id in list(pending):
+            purged += purge_project(project_id, batch_size=options['batch_size'])
+        self.stdout.write(f"projects purged: {purged}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from project.counters import reconcile_all
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the denormalized todolist/task/note/file counters on '
+        'Todolist and Project and repair any that drifted, in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows checked per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        results = reconcile_all(batch_size=options['batch_size'])
+        for label, (checked, repaired) in results.items():
+            self.stdout.write(f"{label}: checked {checked}, repaired {repaired}")
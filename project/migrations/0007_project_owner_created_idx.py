@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0006_project_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_by', 'created_at'], name='project_owner_created_idx'),
+        ),
+    ]
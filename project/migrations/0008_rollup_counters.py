@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0007_project_owner_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_task_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='file_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='file_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='note_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='todolist_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='projectfile',
+            name='size',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
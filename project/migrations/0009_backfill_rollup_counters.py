@@ -0,0 +1,54 @@
+from django.core.files.storage import default_storage
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def _aggregate(model, parent, function, **filters):
+    rows = model.objects.filter(**{parent: OuterRef('pk')}, **filters) \
+                        .order_by() \
+                        .values(parent) \
+                        .annotate(total=function) \
+                        .values('total')
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def backfill(apps, schema_editor):
+    Project = apps.get_model('project', 'Project')
+    ProjectFile = apps.get_model('project', 'ProjectFile')
+    ProjectNote = apps.get_model('project', 'ProjectNote')
+    Todolist = apps.get_model('todolist', 'Todolist')
+    Task = apps.get_model('task', 'Task')
+
+    for projectfile in ProjectFile.objects.filter(size=0).iterator():
+        try:
+            size = default_storage.size(projectfile.attachment.name)
+        except OSError:
+            continue
+        ProjectFile.objects.filter(pk=projectfile.pk).update(size=size)
+
+    Todolist.objects.update(
+        task_count=_aggregate(Task, 'todolist', Count('pk')),
+        completed_task_count=_aggregate(Task, 'todolist', Count('pk'), is_done=True),
+    )
+    Project.objects.update(
+        todolist_count=_aggregate(Todolist, 'project', Count('pk')),
+        task_count=_aggregate(Task, 'project', Count('pk')),
+        completed_task_count=_aggregate(Task, 'project', Count('pk'), is_done=True),
+        note_count=_aggregate(ProjectNote, 'project', Count('pk')),
+        file_count=_aggregate(ProjectFile, 'project', Count('pk')),
+        file_bytes=_aggregate(ProjectFile, 'project', Sum('size')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0008_rollup_counters'),
+        ('todolist', '0002_rollup_counters'),
+        ('task', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
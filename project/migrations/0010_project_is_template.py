@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0009_backfill_rollup_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='is_template',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0010_project_is_template'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deleting_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deletion_total',
+            field=models.IntegerField(default=0),
+        ),
+    ]
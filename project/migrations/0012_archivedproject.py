@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0011_project_deletion_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('todolist_count', models.IntegerField(default=0)),
+                ('task_count', models.IntegerField(default=0)),
+                ('note_count', models.IntegerField(default=0)),
+                ('file_count', models.IntegerField(default=0)),
+                ('payload', models.BinaryField()),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_projects', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_by', 'archived_at'], name='archive_owner_archived_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0012_archivedproject'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.UniqueConstraint(fields=('created_by', 'name'), name='project_owner_name_uniq'),
+        ),
+    ]
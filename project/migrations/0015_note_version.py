@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0014_noterevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectnote',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-18 05:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0016_fileupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileupload',
+            name='writing',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
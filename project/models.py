@@ -1,16 +1,100 @@
 import uuid 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
     
 from account.models import User
 
+from . import fragments
+
+
+class CounterQuerySet(models.QuerySet):
+
+    def adjust(self, **deltas):
+        """
+        Apply relative changes to denormalized counter columns in a single
+        UPDATE, e.g. adjust(task_count=1, completed_task_count=-1). The
+        arithmetic happens in the database, so concurrent writers never
+        overwrite each other's increments.
+        """
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        return self.update(**changes) if changes else 0
+
 
 
 class Project(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    name = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
+    is_template = models.BooleanField(default=False)
+
+    # Denormalized rollups, kept in step by the child models' save()/delete()
+    # and repaired by the reconcile_counters management command.
+    todolist_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    completed_task_count = models.IntegerField(default=0)
+    note_count = models.IntegerField(default=0)
+    file_count = models.IntegerField(default=0)
+    file_bytes = models.BigIntegerField(default=0)
+
+    # Set when the project is handed to the background purge; deletion_total
+    # is the number of children it had then, for the progress display.
+    deleting_at = models.DateTimeField(blank=True, null=True)
+    deletion_total = models.IntegerField(default=0)
+
+    objects = CounterQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the per-user project list, ordered newest first.
+            models.Index(fields=['created_by', 'created_at'], name='project_owner_created_idx'),
+        ]
+        constraints = [
+            # Project names are unique per owner; the index also serves
+            # lookups of a user's project by name.
+            models.UniqueConstraint(fields=['created_by', 'name'], name='project_owner_name_uniq'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        fragments.invalidate_project(self.pk)
+        fragments.invalidate_user(self.created_by_id)
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        fragments.invalidate_project(pk)
+        fragments.invalidate_user(self.created_by_id)
+        return result
+
+
+class ArchivedProject(models.Model):
+    """
+    A project tree moved out of the hot tables by project.archive. The
+    tree itself lives in `payload` as zlib-compressed JSON; the columns
+    here are just enough to list archives without decompressing them.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_projects')
+
+    todolist_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    note_count = models.IntegerField(default=0)
+    file_count = models.IntegerField(default=0)
+    payload = models.BinaryField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'archived_at'], name='archive_owner_archived_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -20,17 +104,112 @@ class ProjectFile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
     attachment = models.FileField(upload_to='projectfiles')
+    size = models.BigIntegerField(default=0)
     project = models.ForeignKey(Project, related_name='files', on_delete=models.CASCADE)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            if adding and self.attachment:
+                try:
+                    self.size = self.attachment.size
+                except OSError:
+                    # Attachment path without a stored file behind it.
+                    self.size = 0
+            super().save(*args, **kwargs)
+            if adding:
+                Project.objects.filter(pk=self.project_id).adjust(file_count=1, file_bytes=self.size)
+            fragments.invalidate_project(self.project_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Project.objects.filter(pk=self.project_id).adjust(file_count=-1, file_bytes=-self.size)
+            fragments.invalidate_project(self.project_id)
+        return result
+
 
 class ProjectNote(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
     body = models.TextField(blank=True, null=True)
     project = models.ForeignKey(Project, related_name='notes', on_delete=models.CASCADE)
+    # Bumped by every edit; writers send the version they started from
+    # and lose (409) if it moved on (see project.views.note_autosave).
+    version = models.PositiveIntegerField(default=1, editable=False)
     
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Project.objects.filter(pk=self.project_id).adjust(note_count=1)
+            fragments.invalidate_project(self.project_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Project.objects.filter(pk=self.project_id).adjust(note_count=-1)
+            fragments.invalidate_project(self.project_id)
+        return result
+
+
+
+class NoteRevision(models.Model):
+    """
+    One saved version of a note's body. Every few revisions is a full
+    `snapshot`; the others hold only a compressed line `delta` from the
+    revision before (see project.revisions).
+    """
+    id = models.BigAutoField(primary_key=True)
+    note = models.ForeignKey(ProjectNote, related_name='revisions', on_delete=models.CASCADE)
+    number = models.PositiveIntegerField()
+    snapshot = models.TextField(blank=True, null=True)
+    delta = models.BinaryField(blank=True, null=True)
+    # Length of the body at this revision, for the history list.
+    size = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name='note_revisions'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'number'], name='note_revision_number_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.note_id} #{self.number}'
+
+
+class FileUpload(models.Model):
+    """
+    A resumable upload in progress. Chunks are appended in place to the
+    file at `path`, which becomes the ProjectFile's attachment once the
+    upload is finished (see project.uploads).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    path = models.CharField(max_length=255)
+    length = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    project = models.ForeignKey(Project, related_name='uploads', on_delete=models.CASCADE)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='file_uploads')
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Moved by every chunk; uploads idle for too long expire.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Token of the request writing a chunk right now, if any.
+    writing = models.UUIDField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def is_complete(self):
+        return self.offset == self.length
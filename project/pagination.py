@@ -0,0 +1,104 @@
+import json
+import base64
+import binascii
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(values):
+    """
+    Encode the ordering values of the last row of a page into an opaque,
+    URL-safe cursor string.
+    """
+    payload = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into a list of strings.
+    Raises InvalidCursor if the cursor was tampered with or truncated.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor(str(e)) from e
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise InvalidCursor('Malformed cursor payload.')
+    return values
+
+
+def _after(ordering, values):
+    """
+    Build the filter selecting rows strictly after `values` for the given
+    ordering, e.g. ('-created_at', '-id') becomes
+    created_at <= x AND (created_at < x OR (created_at = x AND id < y)).
+    """
+    condition = Q()
+    for position, field in reversed(list(enumerate(ordering))):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        step = Q(**{f'{name}__{lookup}': values[position]})
+        if position < len(ordering) - 1:
+            step |= Q(**{name: values[position]}) & condition
+        condition = step
+
+    # Repeat the leading column as an inclusive bound so the database can
+    # turn it into an index range instead of filtering an OR row by row.
+    leading = ordering[0]
+    bound = 'lte' if leading.startswith('-') else 'gte'
+    return Q(**{f'{leading.lstrip("-")}__{bound}': values[0]}) & condition
+
+
+def keyset_paginate(queryset, ordering, cursor=None, page_size=24):
+    """
+    Return a KeysetPage of `queryset` ordered by `ordering`, starting after
+    `cursor`. The last ordering field must be unique so that ties on the
+    leading fields are broken deterministically.
+
+    Unlike OFFSET pagination the database seeks straight to the cursor
+    position through the index, so every page costs the same no matter how
+    deep the user has scrolled.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(ordering):
+            raise InvalidCursor('Cursor does not match the ordering.')
+        try:
+            queryset = queryset.filter(_after(ordering, values))
+        except ValidationError as e:
+            raise InvalidCursor(str(e)) from e
+
+    try:
+        # Fetch one extra row to learn whether another page exists.
+        items = list(queryset[:page_size + 1])
+    except ValidationError as e:
+        raise InvalidCursor(str(e)) from e
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, field.lstrip('-')) for field in ordering
+        )
+
+    return KeysetPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,88 @@
+"""
+One-query resolution of nested project URLs.
+
+Views under projects/<project_id>/[<todolist_id>/[<pk>]] used to check
+ownership with a get_object_or_404() per level. resolve_path() loads the
+deepest object the URL names together with its parents in a single joined
+query that also checks the project's owner, links the parents to each
+other so templates never fetch them again, and memoizes the result on the
+request. A project scheduled for deletion resolves to nothing: its
+children must not gain rows behind the background purge.
+"""
+import functools
+from dataclasses import dataclass
+
+from django.http import Http404
+
+from task.models import Task
+from todolist.models import Todolist
+
+from .models import Project
+
+
+@dataclass
+class ResolvedPath:
+    project: Project
+    todolist: Todolist = None
+    task: Task = None
+
+
+def _load(user, project_id, todolist_id, task_id):
+    try:
+        if task_id is not None:
+            task = Task.objects.select_related('project', 'todolist').get(
+                pk=task_id, todolist_id=todolist_id, todolist__project_id=project_id,
+                project_id=project_id, project__created_by=user, project__deleting_at__isnull=True,
+            )
+            task.todolist.project = task.project
+            path = ResolvedPath(task.project, task.todolist, task)
+        elif todolist_id is not None:
+            todolist = Todolist.objects.select_related('project').get(
+                pk=todolist_id, project_id=project_id, project__created_by=user,
+                project__deleting_at__isnull=True,
+            )
+            path = ResolvedPath(todolist.project, todolist)
+        else:
+            path = ResolvedPath(Project.objects.get(pk=project_id, created_by=user, deleting_at__isnull=True))
+    except (Project.DoesNotExist, Todolist.DoesNotExist, Task.DoesNotExist):
+        raise Http404('No object matches the given query.')
+    # The owner is the user who asked.
+    path.project.created_by = user
+    return path
+
+
+def resolve(request, project_id, todolist_id=None, task_id=None):
+    """
+    Return the ResolvedPath for the given ids, owned by request.user and
+    not being deleted, or raise Http404. Repeated calls during a request hit the memo.
+    """
+    key = (project_id, todolist_id, task_id)
+    memo = request.__dict__.setdefault('_resolved_paths', {})
+    if key not in memo:
+        memo[key] = _load(request.user, project_id, todolist_id, task_id)
+    return memo[key]
+
+
+def resolve_path(pk=None):
+    """
+    View decorator: replace the URL's project_id, todolist_id and pk (the
+    id of a `pk` object, 'todolist' or 'task') with the objects themselves,
+    passed as the `project`, `todolist` and `task` keyword arguments.
+
+        @resolve_path(pk='task')
+        def edit(request, project, todolist, task): ...
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            ids = {'project_id': kwargs.pop('project_id'), 'todolist_id': kwargs.pop('todolist_id', None)}
+            if pk is not None:
+                ids[f'{pk}_id'] = kwargs.pop('pk')
+            path = resolve(request, **ids)
+            kwargs.update(
+                (name, getattr(path, name)) for name in ('project', 'todolist', 'task')
+                if getattr(path, name) is not None
+            )
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,174 @@
+"""
+Revision history for notes, stored as snapshots plus line deltas.
+
+Each edit of a note that changes its body adds a NoteRevision. The body
+a note was created with becomes revision 1 at its first edit, so notes
+that are never edited keep no history. Most revisions store only a
+delta: the edit from the previous revision as a list of line operations,
+zlib-compressed JSON. Storage therefore grows with the size of the edits
+rather than with the size of the note.
+
+A full snapshot is stored for the first revision, after every
+SNAPSHOT_INTERVAL - 1 deltas, and whenever the delta would be larger than
+the body itself. Rebuilding a revision starts at the nearest snapshot at
+or before it and applies at most SNAPSHOT_INTERVAL - 1 deltas, all read in
+one query.
+
+Delta operations, applied to the previous revision's lines in order:
+
+    n       (int > 0)   copy the next n lines
+    -n      (int < 0)   skip the next n lines
+    [lines] (list)      insert these lines
+"""
+import difflib
+import json
+import zlib
+
+from django.db import transaction
+from django.db.models import Subquery
+
+from .models import NoteRevision
+
+
+SNAPSHOT_INTERVAL = 20
+DIFF_CONTEXT_LINES = 3
+
+
+def _lines(text):
+    return (text or '').splitlines(keepends=True)
+
+
+def make_delta(old, new):
+    """The operations turning text `old` into text `new`."""
+    old_lines, new_lines = _lines(old), _lines(new)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(i1 - i2)
+        if j2 > j1:
+            ops.append(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(old, ops):
+    """Apply operations from make_delta() to text `old`."""
+    old_lines, position, out = _lines(old), 0, []
+    for op in ops:
+        if isinstance(op, list):
+            out.extend(op)
+        elif op > 0:
+            out.extend(old_lines[position:position + op])
+            position += op
+        else:
+            position -= op
+    return ''.join(out)
+
+
+def _pack(ops):
+    return zlib.compress(json.dumps(ops, separators=(',', ':')).encode())
+
+
+def _unpack(delta):
+    return json.loads(zlib.decompress(bytes(delta)))
+
+
+def _chain(note, first=None, last=None):
+    """
+    (number, snapshot, delta) rows from the nearest snapshot at or before
+    revision `first` (the latest snapshot, if None) up to `last` (or the
+    newest revision), in order.
+    """
+    snapshots = note.revisions.filter(snapshot__isnull=False)
+    if first is not None:
+        snapshots = snapshots.filter(number__lte=first)
+    rows = note.revisions.filter(number__gte=Subquery(snapshots.order_by('-number').values('number')[:1]))
+    if last is not None:
+        rows = rows.filter(number__lte=last)
+    return list(rows.order_by('number').values_list('number', 'snapshot', 'delta'))
+
+
+def _replay(rows):
+    body = None
+    for number, snapshot, delta in rows:
+        body = snapshot if snapshot is not None else apply_delta(body, _unpack(delta))
+        yield number, body
+
+
+def bodies(note, first, last):
+    """
+    The note's body at revisions `first` to `last`, as {number: body}, read
+    in one query.
+    """
+    return {number: body for number, body in _replay(_chain(note, first, last)) if number >= first}
+
+
+def body_at(note, number):
+    """
+    The note's body at revision `number`. Raises NoteRevision.DoesNotExist
+    if there is no such revision.
+    """
+    try:
+        return bodies(note, number, number)[number]
+    except KeyError:
+        raise NoteRevision.DoesNotExist(f'Note {note.pk} has no revision {number}.')
+
+
+def record_revision(note, user=None, previous=None):
+    """
+    Store the note's current body as its next revision and return it, or
+    return None if the body is unchanged since the last one.
+
+    `previous` is the body before this save. It becomes revision 1 if the
+    note has no history yet (notes not edited since they were created,
+    or copied by cloning), so the first edit keeps the original.
+    """
+    body = note.body or ''
+    with transaction.atomic():
+        chain = _chain(note)
+        if not chain:
+            if not previous or previous == body:
+                return NoteRevision.objects.create(
+                    note=note, number=1, snapshot=body, size=len(body), created_by=user
+                )
+            NoteRevision.objects.create(note=note, number=1, snapshot=previous, size=len(previous))
+            chain = [(1, previous, None)]
+
+        last, previous_body = list(_replay(chain))[-1]
+        if previous_body == body:
+            return None
+
+        revision = NoteRevision(note=note, number=last + 1, size=len(body), created_by=user)
+        delta = _pack(make_delta(previous_body, body))
+        if len(chain) >= SNAPSHOT_INTERVAL or len(delta) >= len(body.encode()):
+            revision.snapshot = body
+        else:
+            revision.delta = delta
+        revision.save()
+    return revision
+
+
+def history(note):
+    """The note's revisions, newest first, without their contents."""
+    return note.revisions.defer('snapshot', 'delta').select_related('created_by').order_by('-number')
+
+
+def diff(note, number):
+    """
+    Unified diff lines, without line endings, from revision `number` - 1
+    to `number` (from empty text for the first revision). Raises NoteRevision.DoesNotExist if there
+    is no such revision.
+    """
+    found = bodies(note, max(number - 1, 1), number)
+    if number not in found:
+        raise NoteRevision.DoesNotExist(f'Note {note.pk} has no revision {number}.')
+    before = found.get(number - 1, '') if number > 1 else ''
+    return [
+        line.rstrip('\n') for line in difflib.unified_diff(
+            _lines(before), _lines(found[number]),
+            fromfile=f'#{number - 1}', tofile=f'#{number}', n=DIFF_CONTEXT_LINES, lineterm='',
+        )
+    ]
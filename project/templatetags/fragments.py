@@ -0,0 +1,42 @@
+from django import template
+
+from project import fragments
+
+
+register = template.Library()
+
+
+class FragmentNode(template.Node):
+    def __init__(self, nodelist, key):
+        self.nodelist = nodelist
+        self.key = key
+
+    def render(self, context):
+        key = self.key.resolve(context)
+        if not key:
+            # No key means "don't cache", e.g. when the view hit an error.
+            return self.nodelist.render(context)
+
+        value = fragments.lookup(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            fragments.store(key, value)
+        return value
+
+
+@register.tag('fragment')
+def do_fragment(parser, token):
+    """
+    Cache the enclosed template block under a versioned key built by the
+    view with project.fragments.fragment_key:
+
+        {% fragment keys.notes %} ... {% endfragment %}
+
+    Lazy querysets inside the block are only evaluated on a cache miss.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires exactly one argument.")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(nodelist, parser.compile_filter(bits[1]))
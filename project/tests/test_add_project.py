@@ -109,6 +109,30 @@ class AddProjectViewTests(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(str(messages[0]), "Failed to create project: ['Database validation error']")
 
+    def test_add_project_post_duplicate_name(self):
+        """Test invalid input: a duplicate name is reported from the unique constraint"""
+        Project.objects.create(name='Taken', created_by=self.user)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.post(reverse('project:add'), {'name': 'Taken'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['form'].errors['name'], ['A project with this name already exists.']
+        )
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_project_names_are_scoped_per_owner(self):
+        """Test edge case: another user's project name does not block this user"""
+        other = User.objects.create_user(name='other', email='other@gmail.com', password='x')
+        Project.objects.create(name='Shared name', created_by=other)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.post(reverse('project:add'), {'name': 'Shared name'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Project.objects.filter(name='Shared name').count(), 2)
+
     def test_add_project_no_permission(self):
         """Test invalid input: Authenticated user without add_project permission"""
         # Create a user without the add_project permission
@@ -0,0 +1,151 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from project.archive import archive_project, load_archive, restore_projects
+from project.models import ArchivedProject, NoteRevision, Project, ProjectFile, ProjectNote
+from project.revisions import body_at, record_revision
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class ArchiveProjectTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Done', description='Shipped', created_by=self.user)
+        self.todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        for i in range(3):
+            Task.objects.create(
+                name=f'Task {i}', is_done=i < 2, project=self.project,
+                todolist=self.todolist, created_by=self.user
+            )
+        ProjectNote.objects.create(name='Retro', body='Went well', project=self.project)
+        ProjectFile.objects.create(name='Spec', attachment='projectfiles/spec.txt', project=self.project)
+        self.project.refresh_from_db()
+        self.project_id = self.project.pk
+
+    def test_archive_moves_tree_out_of_hot_tables(self):
+        """Test normal case: archiving leaves no rows behind in the live tables"""
+        archived = archive_project(self.project)
+
+        self.assertFalse(Project.objects.filter(pk=self.project_id).exists())
+        self.assertEqual(Todolist.objects.count(), 0)
+        self.assertEqual(Task.objects.count(), 0)
+        self.assertEqual(ProjectNote.objects.count(), 0)
+        self.assertEqual(ProjectFile.objects.count(), 0)
+        self.assertEqual(archived.pk, self.project_id)
+        self.assertEqual(
+            (archived.todolist_count, archived.task_count, archived.note_count, archived.file_count),
+            (1, 3, 1, 1)
+        )
+        self.assertEqual(len(load_archive(archived)['tasks']), 3)
+
+    def test_restore_round_trip(self):
+        """Test normal case: restoring recreates the tree with its ids, timestamps and counters"""
+        archived = archive_project(self.project)
+
+        restored, failed = restore_projects([archived])
+
+        self.assertEqual(failed, [])
+        project = Project.objects.get(pk=self.project_id)
+        self.assertEqual(project.created_at, self.project.created_at)
+        self.assertEqual(project.description, 'Shipped')
+        self.assertEqual((project.task_count, project.completed_task_count), (3, 2))
+        self.assertEqual(Todolist.objects.get(pk=self.todolist.pk).task_count, 3)
+        self.assertEqual(project.tasks.filter(is_done=True).count(), 2)
+        self.assertEqual(project.files.get().attachment.name, 'projectfiles/spec.txt')
+        self.assertFalse(ArchivedProject.objects.exists())
+
+    def test_restore_keeps_note_history(self):
+        """Test normal case: a note's revisions come back under the note after a restore"""
+        note = ProjectNote.objects.get(project=self.project)
+        lines = '\n'.join(f'Point {i}' for i in range(20))
+        for body in (f'{lines}\nShip it', f'{lines}\nShipped', f'{lines}\nShipped\nRetro done'):
+            previous, note.body = note.body, body
+            note.save()
+            record_revision(note, self.user, previous)
+        url = reverse('project:note_history', kwargs={'project_id': self.project_id, 'pk': note.pk})
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        before = self.client.get(url).content
+        revisions = list(NoteRevision.objects.filter(note=note).order_by('number').values())
+        self.assertTrue(any(r['delta'] for r in revisions))
+
+        archived = archive_project(self.project)
+        self.assertFalse(NoteRevision.objects.exists())
+        self.assertEqual(len(load_archive(archived)['revisions']), 4)
+        restore_projects([archived])
+
+        self.assertEqual(list(NoteRevision.objects.filter(note=note).order_by('number').values()), revisions)
+        self.assertEqual(body_at(note, 4), f'{lines}\nShipped\nRetro done')
+        self.assertEqual(self.client.get(url).content, before)
+
+    def test_restore_name_conflict(self):
+        """Test edge case: an archive whose name was taken meanwhile is reported and kept"""
+        archived = archive_project(self.project)
+        Project.objects.create(name='Done', created_by=self.user)
+
+        restored, failed = restore_projects([archived])
+
+        self.assertEqual((restored, failed), ([], [archived]))
+        self.assertTrue(ArchivedProject.objects.filter(pk=archived.pk).exists())
+
+    def test_archive_and_restore_views(self):
+        """Test normal case: archive, browse read-only and restore through the views"""
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.post(reverse('project:archive', kwargs={'pk': self.project_id}))
+        self.assertRedirects(response, reverse('project:archives'))
+
+        response = self.client.get(reverse('project:archives'))
+        self.assertContains(response, 'Done')
+
+        response = self.client.get(reverse('project:archive_detail', kwargs={'pk': self.project_id}))
+        self.assertContains(response, 'Task 2')
+        self.assertContains(response, 'Went well')
+
+        response = self.client.post(reverse('project:restore'), {'archives': [str(self.project_id)]})
+        self.assertRedirects(response, reverse('project:projects'))
+        self.assertTrue(Project.objects.filter(pk=self.project_id).exists())
+
+    def test_archive_view_non_owner(self):
+        """Test invalid input: users cannot archive or read other users' projects"""
+        self.client.login(email='otheruser@gmail.com', password='testpass123')
+
+        response = self.client.post(reverse('project:archive', kwargs={'pk': self.project_id}))
+        self.assertEqual(response.status_code, 404)
+
+        archive_project(self.project)
+        response = self.client.get(reverse('project:archive_detail', kwargs={'pk': self.project_id}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_command_archives_only_finished_projects(self):
+        """Test normal case: the command archives old projects whose tasks are all done"""
+        finished = Project.objects.create(name='Finished', created_by=self.user)
+        todolist = Todolist.objects.create(name='List', project=finished, created_by=self.user)
+        Task.objects.create(
+            name='Only', is_done=True, project=finished, todolist=todolist, created_by=self.user
+        )
+        Project.objects.update(created_at=timezone.now() - timedelta(days=60))
+
+        call_command('archive_finished_projects', days=30, stdout=io.StringIO())
+
+        self.assertEqual(list(ArchivedProject.objects.values_list('name', flat=True)), ['Finished'])
+        self.assertTrue(Project.objects.filter(pk=self.project_id).exists())
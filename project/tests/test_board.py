@@ -0,0 +1,142 @@
+import uuid
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.board import load_board
+from project.models import Project
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class BoardTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.todo = Todolist.objects.create(name='A todo', project=self.project, created_by=self.user)
+        self.doing = Todolist.objects.create(name='B doing', project=self.project, created_by=self.user)
+        self.tasks = [self._task(f'Task {i}', self.todo, is_done=i == 0) for i in range(5)]
+        self.url = reverse('project:board', kwargs={'project_id': self.project.pk})
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _task(self, name, todolist, **kwargs):
+        return Task.objects.create(
+            name=name, project=self.project, todolist=todolist, created_by=self.user, **kwargs
+        )
+
+    def _move_url(self, task, todolist):
+        return reverse('task:reorder', kwargs={
+            'project_id': self.project.pk, 'todolist_id': todolist.pk, 'pk': task.pk
+        })
+
+    def test_columns_in_one_query(self):
+        """Test normal case: every column's first cards load in a single query"""
+        self._task('Doing 1', self.doing)
+        with self.assertNumQueries(2):
+            columns = load_board(self.project, column_size=3)
+
+        self.assertEqual([column.todolist for column in columns], [self.todo, self.doing])
+        self.assertEqual(columns[0].tasks, self.tasks[:3])
+        self.assertIsNotNone(columns[0].next_cursor)
+        self.assertEqual([task.name for task in columns[1].tasks], ['Doing 1'])
+        self.assertIsNone(columns[1].next_cursor)
+
+    def test_query_count_does_not_grow_with_columns(self):
+        """Test edge case: more lists do not add queries to the board page"""
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for i in range(5):
+            todolist = Todolist.objects.create(name=f'List {i}', project=self.project, created_by=self.user)
+            self._task('Card', todolist)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(len(response.context['columns']), 7)
+
+    def test_more_cards(self):
+        """Test normal case: a column's "more" endpoint continues after the first cards"""
+        with patch('project.views.BOARD_COLUMN_SIZE', 2):
+            response = self.client.get(self.url)
+            seen = list(response.context['columns'][0].tasks)
+            self.assertEqual(len(seen), 2)
+            cursor = response.context['columns'][0].next_cursor
+            url = reverse('project:board_column', kwargs={'project_id': self.project.pk, 'todolist_id': self.todo.pk})
+            while cursor:
+                response = self.client.get(url, {'cursor': cursor})
+                seen.extend(response.context['tasks'])
+                cursor = response.context['next_cursor']
+        self.assertEqual(seen, self.tasks)
+
+    def test_more_cards_invalid(self):
+        """Test invalid input: a tampered cursor or another user's column is not found"""
+        url = reverse('project:board_column', kwargs={'project_id': self.project.pk, 'todolist_id': self.todo.pk})
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage!'}).status_code, 404)
+        self.client.login(email='otheruser@gmail.com', password='testpass123')
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_move_between_columns(self):
+        """Test normal case: a card moves to another column with one UPDATE and the counters follow"""
+        done = self.tasks[0]
+        anchor = self._task('Doing 1', self.doing)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self._move_url(done, self.todo), {
+                'todolist': self.doing.pk, 'after': anchor.pk, 'before': ''
+            })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['todolist'], str(self.doing.pk))
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "task_task"')]
+        # Open first, then done: the done card needs the second statement.
+        self.assertEqual(len(updates), 2)
+        done.refresh_from_db()
+        self.assertEqual(done.todolist, self.doing)
+        self.assertEqual(list(self.doing.tasks.order_by('rank')), [anchor, done])
+        self.todo.refresh_from_db()
+        self.doing.refresh_from_db()
+        self.assertEqual((self.todo.task_count, self.todo.completed_task_count), (4, 0))
+        self.assertEqual((self.doing.task_count, self.doing.completed_task_count), (2, 1))
+
+    def test_move_open_card_single_update(self):
+        """Test normal case: an open card moves with a single UPDATE of its row"""
+        card = self.tasks[1]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self._move_url(card, self.todo), {'todolist': self.doing.pk})
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "task_task"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Task.objects.get(pk=card.pk).todolist_id, self.doing.pk)
+
+    def test_move_name_clash(self):
+        """Test invalid input: moving onto a list with a same-named task is refused"""
+        self._task('Task 1', self.doing)
+        response = self.client.post(self._move_url(self.tasks[1], self.todo), {'todolist': self.doing.pk})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Task.objects.get(pk=self.tasks[1].pk).todolist_id, self.todo.pk)
+        self.todo.refresh_from_db()
+        self.assertEqual(self.todo.task_count, 5)
+
+    def test_move_to_unknown_list(self):
+        """Test invalid input: a list outside the project is not found"""
+        other = Project.objects.create(name='Other', created_by=self.user)
+        elsewhere = Todolist.objects.create(name='Elsewhere', project=other, created_by=self.user)
+        for target in [elsewhere.pk, uuid.uuid4()]:
+            response = self.client.post(self._move_url(self.tasks[1], self.todo), {'todolist': target})
+            self.assertEqual(response.status_code, 404)
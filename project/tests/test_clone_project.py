@@ -0,0 +1,149 @@
+from django.contrib.auth.models import Permission
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.cloning import clone_project
+from project.models import Project, ProjectNote
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class CloneProjectTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.user.user_permissions.add(Permission.objects.get(codename='add_project'))
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.source = Project.objects.create(
+            name='Layout', description='Standard layout', created_by=self.user, is_template=True
+        )
+        self.backlog = Todolist.objects.create(
+            name='Backlog', project=self.source, created_by=self.user
+        )
+        self.release = Todolist.objects.create(
+            name='Release', project=self.source, created_by=self.user
+        )
+        ProjectNote.objects.create(name='Readme', body='Start here', project=self.source)
+
+    def _tasks(self, todolist, count, done=0):
+        Task.objects.bulk_create([
+            Task(name=f'{todolist.name} {i}', is_done=i < done, project=self.source,
+                 todolist=todolist, created_by=self.user)
+            for i in range(count)
+        ])
+
+    def test_clone_copies_tree_and_counters(self):
+        """Test normal case: todolists, tasks and notes are copied under new ids"""
+        self._tasks(self.backlog, 3, done=2)
+        self._tasks(self.release, 1)
+
+        clone = clone_project(self.source, self.user, name='Sprint 1')
+
+        self.assertNotEqual(clone.pk, self.source.pk)
+        self.assertEqual(clone.description, 'Standard layout')
+        self.assertFalse(clone.is_template)
+        self.assertEqual(
+            sorted(clone.todolists.values_list('name', flat=True)), ['Backlog', 'Release']
+        )
+        self.assertEqual(clone.tasks.count(), 4)
+        self.assertFalse(clone.tasks.filter(is_done=True).exists())
+        self.assertEqual(list(clone.notes.values_list('name', 'body')), [('Readme', 'Start here')])
+        self.assertFalse(
+            Task.objects.filter(project=clone, todolist__project=self.source).exists()
+        )
+
+        clone.refresh_from_db()
+        self.assertEqual(
+            (clone.todolist_count, clone.task_count, clone.completed_task_count, clone.note_count),
+            (2, 4, 0, 1)
+        )
+        backlog = clone.todolists.get(name='Backlog')
+        self.assertEqual((backlog.task_count, backlog.completed_task_count), (3, 0))
+
+    def test_clone_keep_progress(self):
+        """Test normal case: keep_progress preserves done states and completed counters"""
+        self._tasks(self.backlog, 3, done=2)
+
+        clone = clone_project(self.source, self.user, name='Sprint 2', keep_progress=True)
+
+        self.assertEqual(clone.tasks.filter(is_done=True).count(), 2)
+        self.assertEqual(clone.completed_task_count, 2)
+
+    def test_clone_query_count_is_constant(self):
+        """Test performance: the number of queries does not grow with the task count"""
+        self._tasks(self.backlog, 1)
+        with self.assertNumQueries(10):
+            clone_project(self.source, self.user, name='Small')
+
+        self._tasks(self.release, 100)
+        with self.assertNumQueries(10):
+            clone_project(self.source, self.user, name='Large')
+
+    def test_clone_view_post(self):
+        """Test normal case: POST clones the project and redirects to the copy"""
+        self._tasks(self.backlog, 2)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.post(
+            reverse('project:clone', kwargs={'pk': self.source.pk}), {'name': 'From template'}
+        )
+
+        clone = Project.objects.get(name='From template')
+        self.assertRedirects(
+            response, reverse('project:project_detail', kwargs={'pk': clone.pk})
+        )
+        self.assertEqual(clone.tasks.count(), 2)
+
+    def test_clone_view_get_prefills_name(self):
+        """Test normal case: GET renders the form with a suggested name"""
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.get(reverse('project:clone', kwargs={'pk': self.source.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'project/clone.html')
+        self.assertContains(response, 'Copy of Layout')
+
+    def test_clone_view_duplicate_name(self):
+        """Test invalid input: an existing project name is rejected"""
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.post(
+            reverse('project:clone', kwargs={'pk': self.source.pk}), {'name': 'Layout'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_clone_view_non_owner(self):
+        """Test invalid input: users cannot clone projects they do not own"""
+        self.other_user.user_permissions.add(Permission.objects.get(codename='add_project'))
+        self.client.login(email='otheruser@gmail.com', password='testpass123')
+
+        response = self.client.post(
+            reverse('project:clone', kwargs={'pk': self.source.pk}), {'name': 'Stolen'}
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_templates_view_lists_own_templates(self):
+        """Test normal case: only the user's own templates are listed"""
+        Project.objects.create(name='Not a template', created_by=self.user)
+        Project.objects.create(name='Foreign', created_by=self.other_user, is_template=True)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.get(reverse('project:templates'))
+
+        self.assertEqual(list(response.context['templates']), [self.source])
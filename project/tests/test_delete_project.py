@@ -6,6 +6,7 @@ from unittest.mock import patch
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 
+from project.deletion import purge_project
 from project.models import Project
 from project.views import FORM_MESSAGES
 
@@ -41,36 +42,42 @@ class DeleteProjectViewTests(TestCase):
         self.log_handler.close()
 
     def test_delete_project_get_authenticated(self):
-        """Test normal case: GET request by authenticated user deletes project and redirects"""
+        """Test normal case: GET request by authenticated user schedules the deletion and redirects"""
         self.client.login(email='testuser@example.com', password='testpass123')
 
         with patch('project.views.logger.info') as mock_logger:
             response = self.client.get(reverse('project:delete', kwargs={'pk': self.project.pk}))
 
         self.assertEqual(response.status_code, 302)
-        self.assertEqual(response.url, reverse('project:projects'))
-        self.assertEqual(Project.objects.count(), 0)
+        self.assertEqual(response.url, reverse('project:deletion_status', kwargs={'pk': self.project.pk}))
+        self.assertIsNotNone(Project.objects.get(pk=self.project.pk).deleting_at)
 
-        mock_logger.assert_called_once_with(f"Project {self.project.name} deleted by {self.user.email}")
+        mock_logger.assert_called_once_with(
+            f"Project {self.project.name} scheduled for deletion by {self.user.email}"
+        )
         messages = [msg.message for msg in response.wsgi_request._messages]
 
-        self.assertIn(FORM_MESSAGES['project_deleted'], messages)
+        self.assertIn(FORM_MESSAGES['project_deleting'], messages)
 
     def test_delete_project_post_success(self):
-        """Test normal case: POST request successfully deletes project"""
+        """Test normal case: POST request marks the project and starts the background purge"""
         self.client.login(email='testuser@example.com', password='testpass123')
         
-        with patch('project.views.logger.info') as mock_logger:
+        with patch('project.deletion.run_after_commit') as mock_run, \
+                patch('project.views.logger.info') as mock_logger:
             response = self.client.post(reverse('project:delete', kwargs={'pk': self.project.pk}))
 
         self.assertEqual(response.status_code, 302)
-        self.assertEqual(response.url, reverse('project:projects'))
-        self.assertEqual(Project.objects.count(), 0)
+        self.assertEqual(response.url, reverse('project:deletion_status', kwargs={'pk': self.project.pk}))
+        self.assertIsNotNone(Project.objects.get(pk=self.project.pk).deleting_at)
+        mock_run.assert_called_once_with(purge_project, self.project.pk)
         
-        mock_logger.assert_called_once_with(f"Project {self.project.name} deleted by {self.user.email}")
+        mock_logger.assert_called_once_with(
+            f"Project {self.project.name} scheduled for deletion by {self.user.email}"
+        )
         messages = [msg.message for msg in response.wsgi_request._messages]
         
-        self.assertIn(FORM_MESSAGES['project_deleted'], messages)
+        self.assertIn(FORM_MESSAGES['project_deleting'], messages)
 
     def test_delete_project_unauthenticated(self):
         """Test edge case: Unauthenticated user is redirected to login"""
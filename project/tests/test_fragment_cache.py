@@ -0,0 +1,128 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project import fragments
+from project.models import Project, ProjectFile, ProjectNote
+from todolist.models import Todolist
+
+
+User = get_user_model()
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Cached', created_by=self.user)
+        ProjectNote.objects.create(name='First note', body='body', project=self.project)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        self.detail_url = reverse('project:project_detail', kwargs={'pk': self.project.pk})
+
+    def _get(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_warm_detail_page_skips_section_queries(self):
+        """Test performance: a warm detail page only runs the ownership query"""
+        cold, cold_queries = self._get(self.detail_url)
+        warm, warm_queries = self._get(self.detail_url)
+
+        self.assertEqual(warm_queries, cold_queries - 3)
+        self.assertContains(warm, 'First note')
+        self.assertEqual(fragments.stats()['hits'], 3)
+        self.assertEqual(fragments.stats()['misses'], 3)
+
+    def test_child_save_bumps_project_version(self):
+        """Test normal case: saving a child makes the old fragments unreachable"""
+        self._get(self.detail_url)
+        version = fragments.project_version(self.project.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Todolist.objects.create(name='New list', project=self.project, created_by=self.user)
+
+        self.assertEqual(fragments.project_version(self.project.pk), version + 1)
+        response, _ = self._get(self.detail_url)
+        self.assertContains(response, 'New list')
+
+    def test_owner_edit_refreshes_files_section(self):
+        """Test normal case: renaming the owner shows up in the cached files section"""
+        ProjectFile.objects.create(name='Spec', attachment='projectfiles/spec.pdf', project=self.project)
+        response, _ = self._get(self.detail_url)
+        self.assertContains(response, 'testuser')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = 'Renamed owner'
+            self.user.save()
+
+        response, _ = self._get(self.detail_url)
+        self.assertContains(response, 'Renamed owner')
+
+    def test_login_keeps_owner_fragments(self):
+        """Test edge case: logging in does not retire the owner's fragments"""
+        version = fragments.user_version(self.user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        self.assertEqual(fragments.user_version(self.user.pk), version)
+
+    def test_child_delete_bumps_project_version(self):
+        """Test normal case: deleting a child invalidates the detail fragments"""
+        self._get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectNote.objects.get(name='First note').delete()
+
+        response, _ = self._get(self.detail_url)
+        self.assertNotContains(response, 'First note')
+
+    def test_project_grid_is_cached_per_user_version(self):
+        """Test normal case: the grid is served from cache until a project changes"""
+        url = reverse('project:projects')
+        self._get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any('project_project' in q['sql'] for q in ctx.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name='Brand new', created_by=self.user)
+
+        response, _ = self._get(url)
+        self.assertContains(response, 'Brand new')
+
+    def test_other_users_grid_is_untouched(self):
+        """Test edge case: bumping one user's version leaves other users' keys alone"""
+        other = User.objects.create_user(
+            name='otheruser', email='otheruser@gmail.com', password='testpass123'
+        )
+        other_version = fragments.user_version(other.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(name='Mine', created_by=self.user)
+
+        self.assertEqual(fragments.user_version(other.pk), other_version)
+
+    def test_stats_view_requires_staff(self):
+        """Test invalid input: non-staff users cannot read the cache stats"""
+        response = self.client.get(reverse('project:fragment_stats'))
+        self.assertEqual(response.status_code, 302)
+
+        self.user.is_staff = True
+        self.user.save()
+        self._get(self.detail_url)
+        response = self.client.get(reverse('project:fragment_stats'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['misses'], 3)
@@ -0,0 +1,66 @@
+from django.db import connection
+from django.template.defaultfilters import truncatechars
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.loaders import PREVIEW_LENGTH, with_preview
+from project.models import Project, ProjectNote
+from todolist.models import Todolist
+
+
+User = get_user_model()
+
+
+class ListPreviewTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.long_body = 'x' * 10000
+        self.notes = [
+            ProjectNote.objects.create(name='Long', body=self.long_body, project=self.project),
+            ProjectNote.objects.create(name='Exact', body='y' * PREVIEW_LENGTH, project=self.project),
+            ProjectNote.objects.create(name='Short', body='short', project=self.project),
+        ]
+        Todolist.objects.create(name='List', description='d' * 500, project=self.project, created_by=self.user)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def test_preview_matches_truncated_body(self):
+        """Test normal case: the database preview truncates exactly like the full text"""
+        notes = with_preview(ProjectNote.objects.filter(project=self.project), 'body').order_by('name')
+        for note in notes:
+            full = ProjectNote.objects.get(pk=note.pk).body
+            self.assertEqual(truncatechars(note.preview, PREVIEW_LENGTH), truncatechars(full, PREVIEW_LENGTH))
+            self.assertLessEqual(len(note.preview), PREVIEW_LENGTH + 1)
+
+    def test_detail_page_does_not_read_bodies(self):
+        """Test normal case: the project page selects previews, not whole bodies or descriptions"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project:project_detail', kwargs={'pk': self.project.pk}))
+
+        self.assertContains(response, truncatechars(self.long_body, PREVIEW_LENGTH))
+        self.assertNotContains(response, self.long_body[:PREVIEW_LENGTH + 1])
+        sql = ' '.join(q['sql'] for q in queries.captured_queries)
+        # The long columns appear once each, as the argument of SUBSTR().
+        for column in ['"project_projectnote"."body"', '"todolist_todolist"."description"']:
+            self.assertEqual(sql.count(column), 1)
+            self.assertIn(f'({column}, 1, {PREVIEW_LENGTH + 1})', sql)
+
+    def test_note_detail_reads_full_body(self):
+        """Test normal case: the note page still shows the whole body"""
+        response = self.client.get(reverse('project:note_detail', kwargs={
+            'project_id': self.project.pk, 'pk': self.notes[0].pk
+        }))
+        self.assertContains(response, self.long_body)
+
+    def test_empty_body(self):
+        """Test edge case: a note without a body previews as before"""
+        note = ProjectNote.objects.create(name='Empty', body=None, project=self.project)
+        preview = with_preview(ProjectNote.objects.filter(pk=note.pk), 'body').get().preview
+        self.assertEqual(truncatechars(preview, PREVIEW_LENGTH), truncatechars(note.body, PREVIEW_LENGTH))
@@ -0,0 +1,127 @@
+import datetime
+import io
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from main import rendering
+from main.models import RenderedMarkdown
+from project.models import Project, ProjectNote
+
+
+User = get_user_model()
+
+
+class MarkdownRenderingTests(TestCase):
+    def setUp(self):
+        rendering.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def test_renders_and_sanitizes(self):
+        """Test normal case: Markdown becomes HTML and unsafe markup is removed"""
+        html = rendering.render_markdown(
+            '# Title\n\n**bold** [link](javascript:alert(1)) <script>alert(1)</script>'
+            '<img src="x.png" onerror="alert(1)">'
+        )
+        self.assertIn('<h1>Title</h1>', html)
+        self.assertIn('<strong>bold</strong>', html)
+        self.assertNotIn('<script', html)
+        self.assertNotIn('javascript:', html)
+        self.assertNotIn('onerror', html)
+
+    def test_memory_then_database(self):
+        """Test normal case: repeats come from the LRU, then from the table after a restart"""
+        text = 'Some *notes*'
+        first = rendering.render_markdown(text)
+        with self.assertNumQueries(0):
+            self.assertEqual(rendering.render_markdown(text), first)
+
+        rendering.clear()
+        with patch('main.rendering._render', side_effect=AssertionError('rendered again')), \
+                self.assertNumQueries(1):
+            self.assertEqual(rendering.render_markdown(text), first)
+
+    def test_lru_eviction(self):
+        """Test edge case: the least recently used entry is dropped when the LRU is full"""
+        with patch('main.rendering.MARKDOWN_CACHE_SIZE', 2):
+            rendering.warm('a', 'b')
+            rendering.render_markdown('a')
+            rendering.warm('c')
+        with self.assertNumQueries(0):
+            rendering.warm('a', 'c')
+        with self.assertNumQueries(1):
+            rendering.warm('b')
+
+    def test_empty_text(self):
+        """Test edge case: empty or missing text renders to nothing without storing"""
+        self.assertEqual(rendering.render_markdown(None), '')
+        self.assertEqual(rendering.render_markdown(''), '')
+        self.assertFalse(RenderedMarkdown.objects.exists())
+
+    def test_note_save_prewarms(self):
+        """Test normal case: saving a note renders it, so its page only reads the result"""
+        self.client.post(
+            reverse('project:add_note', kwargs={'project_id': self.project.pk}),
+            {'name': 'Plan', 'body': '- first\n- second'}
+        )
+        note = ProjectNote.objects.get(project=self.project)
+        self.assertEqual(RenderedMarkdown.objects.count(), 1)
+
+        rendering.clear()
+        with patch('main.rendering._render', side_effect=AssertionError('rendered on read')):
+            response = self.client.get(
+                reverse('project:note_detail', kwargs={'project_id': self.project.pk, 'pk': note.pk})
+            )
+        self.assertContains(response, '<li>first</li>', html=True)
+
+        self.client.post(
+            reverse('project:note_edit', kwargs={'project_id': self.project.pk, 'pk': note.pk}),
+            {'name': 'Plan', 'body': '1. changed'}
+        )
+        self.assertEqual(RenderedMarkdown.objects.count(), 2)
+
+    def _last_used(self, text):
+        return RenderedMarkdown.objects.get(digest=rendering._digest(text)).last_used
+
+    def test_prune_keeps_text_still_read(self):
+        """Test normal case: stored HTML of edited text is pruned once nobody reads it"""
+        rendering.warm('old text', 'current text')
+        later = timezone.now() + datetime.timedelta(days=20)
+        rendering.clear()
+        with patch('main.rendering.timezone.now', return_value=later):
+            rendering.render_markdown('current text')
+        self.assertEqual(self._last_used('current text'), later)
+
+        self.assertEqual(rendering.prune(), 0)
+        self.assertEqual(rendering.prune(now=later + datetime.timedelta(days=15)), 1)
+        self.assertEqual(
+            list(RenderedMarkdown.objects.values_list('digest', flat=True)), [rendering._digest('current text')]
+        )
+        call_command('prune_rendered_markdown', stdout=io.StringIO())
+
+    def test_memory_reads_keep_row(self):
+        """Test edge case: text only ever read from the LRU is not pruned"""
+        rendering.warm('popular text')
+
+        for days in (20, 40, 60):
+            later = timezone.now() + datetime.timedelta(days=days)
+            with patch('main.rendering.timezone.now', return_value=later), \
+                    patch('main.rendering._load', side_effect=AssertionError('read from the table')):
+                rendering.render_markdown('popular text')
+            self.assertEqual(self._last_used('popular text'), later)
+            self.assertEqual(rendering.prune(now=later + datetime.timedelta(days=15)), 0)
+
+        with patch('main.rendering.timezone.now', return_value=later + datetime.timedelta(hours=1)):
+            rendering.render_markdown('popular text')
+        self.assertEqual(self._last_used('popular text'), later)
@@ -0,0 +1,141 @@
+import json
+import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from main import rendering
+from main.models import RenderedMarkdown
+from project.models import NoteRevision, Project, ProjectNote
+
+
+User = get_user_model()
+
+
+class NoteAutosaveTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.note = ProjectNote.objects.create(name='Plan', body='First draft', project=self.project)
+        self.url = reverse('project:note_autosave', kwargs={'project_id': self.project.pk, 'pk': self.note.pk})
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _autosave(self, data, url=None):
+        return self.client.patch(url or self.url, json.dumps(data), content_type='application/json')
+
+    def test_autosave_bumps_version(self):
+        """Test normal case: an autosave writes the text and answers the new version"""
+        response = self._autosave({'version': 1, 'name': 'Plan v2', 'body': 'Second draft'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'version': 2})
+        self.note.refresh_from_db()
+        self.assertEqual((self.note.name, self.note.body, self.note.version), ('Plan v2', 'Second draft', 2))
+
+        response = self._autosave({'version': 2, 'body': 'Third draft'})
+        self.assertEqual(response.json(), {'version': 3})
+        self.note.refresh_from_db()
+        self.assertEqual((self.note.name, self.note.body), ('Plan v2', 'Third draft'))
+
+    def test_autosave_is_one_update(self):
+        """Test normal case: the note is written by one conditional UPDATE"""
+        self._autosave({'version': 1, 'body': 'Second draft'})
+        with CaptureQueriesContext(connection) as queries:
+            self._autosave({'version': 2, 'body': 'Third draft'})
+
+        notes = [q['sql'] for q in queries.captured_queries if '"project_projectnote"' in q['sql']]
+        self.assertEqual(len(notes), 1)
+        self.assertTrue(notes[0].startswith('UPDATE'))
+        self.assertIn('"version" = 2', notes[0])
+
+    def test_autosave_prewarms(self):
+        """Test normal case: autosaved text is rendered before the note page reads it"""
+        self._autosave({'version': 1, 'body': '- autosaved'})
+        self.assertTrue(RenderedMarkdown.objects.filter(digest=rendering._digest('- autosaved')).exists())
+
+        rendering.clear()
+        with patch('main.rendering._render', side_effect=AssertionError('rendered on read')):
+            response = self.client.get(
+                reverse('project:note_detail', kwargs={'project_id': self.project.pk, 'pk': self.note.pk})
+            )
+        self.assertContains(response, '<li>autosaved</li>', html=True)
+
+    def test_stale_version_conflicts(self):
+        """Test edge case: an autosave from an outdated version is refused with the current one"""
+        self._autosave({'version': 1, 'body': 'Saved in another tab'})
+
+        response = self._autosave({'version': 1, 'body': 'Older tab'})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['version'], 2)
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.body, 'Saved in another tab')
+
+    def test_other_users_and_missing_notes(self):
+        """Test invalid input: notes of other users and unknown notes are not found"""
+        project = Project.objects.create(name='Theirs', created_by=self.other_user)
+        note = ProjectNote.objects.create(name='Secret', body='Theirs', project=project)
+
+        url = reverse('project:note_autosave', kwargs={'project_id': project.pk, 'pk': note.pk})
+        self.assertEqual(self._autosave({'version': 1, 'body': 'Mine now'}, url).status_code, 404)
+        note.refresh_from_db()
+        self.assertEqual(note.body, 'Theirs')
+
+        url = reverse('project:note_autosave', kwargs={'project_id': self.project.pk, 'pk': note.pk})
+        self.assertEqual(self._autosave({'version': 1, 'body': 'Mine now'}, url).status_code, 404)
+
+    def test_invalid_payloads(self):
+        """Test invalid input: malformed JSON, an empty body or a missing version are rejected"""
+        response = self.client.patch(self.url, 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._autosave({'version': 1, 'body': '   '}).status_code, 400)
+        self.assertEqual(self._autosave({'body': 'No version'}).status_code, 400)
+        self.assertEqual(self.client.post(self.url).status_code, 405)
+        self.note.refresh_from_db()
+        self.assertEqual((self.note.body, self.note.version), ('First draft', 1))
+
+    def test_revisions_are_throttled(self):
+        """Test normal case: autosaves reach the history at most once per interval"""
+        for version in range(1, 4):
+            self._autosave({'version': version, 'body': f'Draft {version}'})
+        # The original body, then the first autosave.
+        self.assertEqual(NoteRevision.objects.filter(note=self.note).count(), 2)
+
+        with patch('project.views.AUTOSAVE_REVISION_INTERVAL', datetime.timedelta(0)):
+            self._autosave({'version': 4, 'body': 'Draft 4'})
+        self.assertEqual(
+            list(NoteRevision.objects.filter(note=self.note).order_by('number').values_list('size', flat=True)),
+            [len('First draft'), len('Draft 1'), len('Draft 4')]
+        )
+
+    def test_edit_form_conflict_keeps_text(self):
+        """Test edge case: saving the form over a newer autosave shows a conflict and keeps the text"""
+        self._autosave({'version': 1, 'body': 'Autosaved'})
+        url = reverse('project:note_edit', kwargs={'project_id': self.project.pk, 'pk': self.note.pk})
+
+        response = self.client.post(url, {'name': 'Plan', 'body': 'From the form', 'version': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'From the form')
+        self.assertContains(response, 'name="version" value="2"')
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.body, 'Autosaved')
+
+        response = self.client.post(url, {'name': 'Plan', 'body': 'From the form', 'version': 2})
+        self.assertRedirects(response, f'/projects/{self.project.pk}/')
+        self.note.refresh_from_db()
+        self.assertEqual((self.note.body, self.note.version), ('From the form', 3))
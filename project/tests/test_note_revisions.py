@@ -0,0 +1,134 @@
+from unittest.mock import patch
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project import revisions
+from project.models import NoteRevision, Project, ProjectNote
+
+
+User = get_user_model()
+
+
+class NoteRevisionTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _edit(self, note, body):
+        self.client.post(
+            reverse('project:note_edit', kwargs={'project_id': self.project.pk, 'pk': note.pk}),
+            {'name': note.name, 'body': body}
+        )
+
+    def test_delta_round_trip(self):
+        """Test normal case: applying a delta rebuilds the new text exactly"""
+        cases = [
+            ('', 'one\ntwo'),
+            ('one\ntwo\nthree\n', 'one\n2\nthree\nfour'),
+            ('a\nb\nc', ''),
+            ('same\n', 'same\n'),
+            ('x\r\ny\n', 'x\r\nz\ny\n'),
+        ]
+        for old, new in cases:
+            self.assertEqual(revisions.apply_delta(old, revisions.make_delta(old, new)), new)
+
+    def test_every_revision_rebuilds(self):
+        """Test normal case: each saved version is rebuilt exactly, across snapshots"""
+        lines = [f'Base line {i} of the note' for i in range(50)]
+        self.client.post(
+            reverse('project:add_note', kwargs={'project_id': self.project.pk}),
+            {'name': 'Plan', 'body': '\n'.join(lines)}
+        )
+        note = ProjectNote.objects.get(project=self.project)
+        versions = ['\n'.join(lines)]
+        with patch('project.revisions.SNAPSHOT_INTERVAL', 3):
+            for i in range(1, 8):
+                lines.append(f'Added line {i}')
+                versions.append('\n'.join(lines))
+                self._edit(note, versions[-1])
+
+        numbers = list(note.revisions.order_by('number').values_list('number', 'snapshot'))
+        self.assertEqual([number for number, _ in numbers], list(range(1, 9)))
+        self.assertEqual([number for number, snapshot in numbers if snapshot is not None], [1, 4, 7])
+        with self.assertNumQueries(1):
+            self.assertEqual(revisions.bodies(note, 1, 8), dict(enumerate(versions, start=1)))
+        with self.assertNumQueries(1):
+            self.assertEqual(revisions.body_at(note, 6), versions[5])
+
+    def test_unchanged_save_adds_nothing(self):
+        """Test edge case: saving the same body again records no revision"""
+        note = ProjectNote.objects.create(name='Plan', body='text', project=self.project)
+        revisions.record_revision(note, self.user)
+        self.assertIsNone(revisions.record_revision(note, self.user))
+        self.assertEqual(note.revisions.count(), 1)
+
+    def test_storage_grows_with_edits(self):
+        """Test normal case: one-line edits to a long note store far less than copies"""
+        body = ''.join(f'Paragraph {i} of a long meeting note with plenty of words.\n' for i in range(2000))
+        note = ProjectNote.objects.create(name='Long', body=body, project=self.project)
+        revisions.record_revision(note, self.user)
+        for i in range(10):
+            note.body = note.body.replace(f'Paragraph {i * 100} ', f'Edited {i * 100} ')
+            note.save()
+            revisions.record_revision(note, self.user)
+
+        stored = sum(
+            len(snapshot or '') + len(bytes(delta or b''))
+            for snapshot, delta in note.revisions.values_list('snapshot', 'delta')
+        )
+        self.assertEqual(note.revisions.count(), 11)
+        self.assertLess(stored, len(body) + 10 * 200)
+        self.assertEqual(revisions.body_at(note, 11), note.body)
+
+    def test_first_edit_keeps_untracked_original(self):
+        """Test edge case: a note without history keeps its original body as revision 1"""
+        note = ProjectNote.objects.create(name='Copied', body='original\n', project=self.project)
+        self._edit(note, 'original\nadded')
+
+        self.assertEqual(revisions.body_at(note, 1), 'original\n')
+        self.assertEqual(revisions.body_at(note, 2), 'original\nadded')
+        self.assertIsNone(note.revisions.get(number=1).created_by)
+
+    def test_history_and_diff_views(self):
+        """Test normal case: the history lists revisions and a revision shows its diff"""
+        note = ProjectNote.objects.create(name='Plan', body='keep\nold\n', project=self.project)
+        self._edit(note, 'keep\nnew')
+
+        response = self.client.get(
+            reverse('project:note_history', kwargs={'project_id': self.project.pk, 'pk': note.pk})
+        )
+        self.assertEqual([r.number for r in response.context['revisions']], [2, 1])
+
+        response = self.client.get(reverse('project:note_revision', kwargs={
+            'project_id': self.project.pk, 'pk': note.pk, 'number': 2
+        }))
+        self.assertIn('-old', response.context['diff'])
+        self.assertIn('+new', response.context['diff'])
+        self.assertIn(' keep', response.context['diff'])
+        self.assertEqual(response.context['body'], 'keep\nnew')
+
+    def test_revision_not_found(self):
+        """Test invalid input: a missing revision or another user's note is not found"""
+        note = ProjectNote.objects.create(name='Plan', body='text', project=self.project)
+        revisions.record_revision(note, self.user)
+        url = reverse('project:note_revision', kwargs={'project_id': self.project.pk, 'pk': note.pk, 'number': 5})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertRaises(NoteRevision.DoesNotExist):
+            revisions.diff(note, 2)
+
+        self.client.login(email='otheruser@gmail.com', password='testpass123')
+        url = reverse('project:note_history', kwargs={'project_id': self.project.pk, 'pk': note.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
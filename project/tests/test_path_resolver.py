@@ -0,0 +1,89 @@
+import uuid
+
+from django.http import Http404
+from django.test import TestCase, Client, RequestFactory
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.models import Project
+from project.resolvers import resolve, resolve_path
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class PathResolverTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        self.task = Task.objects.create(
+            name='Task', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_resolves_chain_in_one_query(self):
+        """Test normal case: the task and its parents load in one query and are linked"""
+        with self.assertNumQueries(1):
+            path = resolve(self.request, self.project.pk, self.todolist.pk, self.task.pk)
+            self.assertEqual((path.project, path.todolist, path.task), (self.project, self.todolist, self.task))
+            self.assertIs(path.task.todolist.project, path.project)
+            self.assertEqual(path.project.created_by, self.user)
+
+    def test_memoized_per_request(self):
+        """Test normal case: resolving the same path twice in a request queries once"""
+        with self.assertNumQueries(1):
+            first = resolve(self.request, self.project.pk, self.todolist.pk)
+            self.assertIs(resolve(self.request, self.project.pk, self.todolist.pk), first)
+
+    def test_other_owner_is_404(self):
+        """Test invalid input: another user's project, list or task is not found"""
+        self.request.user = self.other_user
+        for ids in [(self.project.pk,), (self.project.pk, self.todolist.pk),
+                    (self.project.pk, self.todolist.pk, self.task.pk)]:
+            with self.assertRaises(Http404):
+                resolve(self.request, *ids)
+
+    def test_mismatched_parents_are_404(self):
+        """Test invalid input: ids that do not belong together are not found"""
+        other_list = Todolist.objects.create(name='Other', project=self.project, created_by=self.user)
+        other_project = Project.objects.create(name='Other', created_by=self.user)
+        with self.assertRaises(Http404):
+            resolve(self.request, self.project.pk, other_list.pk, self.task.pk)
+        with self.assertRaises(Http404):
+            resolve(self.request, other_project.pk, self.todolist.pk)
+        with self.assertRaises(Http404):
+            resolve(self.request, self.project.pk, self.todolist.pk, uuid.uuid4())
+
+    def test_decorator_passes_objects(self):
+        """Test normal case: the decorator hands the view objects instead of ids"""
+        @resolve_path(pk='task')
+        def view(request, project, todolist, task):
+            return project, todolist, task
+
+        result = view(self.request, project_id=self.project.pk, todolist_id=self.todolist.pk, pk=self.task.pk)
+        self.assertEqual(result, (self.project, self.todolist, self.task))
+
+    def test_task_detail_queries(self):
+        """Test normal case: the task page loads its whole path with one query"""
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        url = reverse('task:detail', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': self.task.pk
+        })
+        # Session, user, the path, and the navigation bar's profile.
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,160 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.deletion import deletion_progress, purge_project, schedule_deletion
+from project.models import Project, ProjectFile, ProjectNote
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ProjectDeletionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Big', created_by=self.user)
+        todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        for i in range(5):
+            Task.objects.create(
+                name=f'Task {i}', is_done=i < 2, project=self.project,
+                todolist=todolist, created_by=self.user
+            )
+        ProjectNote.objects.create(name='Note', body='body', project=self.project)
+        self.file = ProjectFile.objects.create(
+            name='Spec', project=self.project,
+            attachment=SimpleUploadedFile('spec.txt', b'12345', content_type='text/plain')
+        )
+        self.project.refresh_from_db()
+
+    def _schedule(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertTrue(schedule_deletion(self.project))
+        self.project.refresh_from_db()
+        return callbacks
+
+    def test_schedule_marks_project_and_defers_work(self):
+        """Test normal case: scheduling only marks the project and records its size"""
+        callbacks = self._schedule()
+
+        self.assertIsNotNone(self.project.deleting_at)
+        self.assertEqual(self.project.deletion_total, 8)
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 5)
+        self.assertEqual(len(callbacks), 3)
+
+    def test_schedule_twice_is_a_no_op(self):
+        """Test edge case: a project already being deleted is not scheduled again"""
+        self._schedule()
+
+        self.assertFalse(schedule_deletion(self.project))
+
+    def test_purge_deletes_everything_in_batches(self):
+        """Test normal case: the purge removes children, attachments and finally the project"""
+        self._schedule()
+        storage = self.file.attachment.storage
+        name = self.file.attachment.name
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(purge_project(self.project.pk, batch_size=2))
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Task.objects.count(), 0)
+        self.assertEqual(Todolist.objects.count(), 0)
+        self.assertEqual(ProjectNote.objects.count(), 0)
+        self.assertEqual(ProjectFile.objects.count(), 0)
+        self.assertFalse(storage.exists(name))
+
+    def test_progress_follows_counters(self):
+        """Test normal case: progress is derived from the remaining rollup counters"""
+        self._schedule()
+        self.assertEqual(deletion_progress(self.project)['percent'], 0)
+
+        Project.objects.filter(pk=self.project.pk).adjust(task_count=-4)
+        self.project.refresh_from_db()
+
+        self.assertEqual(deletion_progress(self.project), {'remaining': 4, 'total': 8, 'percent': 50})
+
+    def test_purge_ignores_projects_not_scheduled(self):
+        """Test invalid input: purging a project that was not scheduled does nothing"""
+        self.assertFalse(purge_project(self.project.pk))
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_status_view(self):
+        """Test normal case: the status page and JSON report progress, then completion"""
+        self._schedule()
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        url = reverse('project:deletion_status', kwargs={'pk': self.project.pk})
+
+        response = self.client.get(url)
+        self.assertTemplateUsed(response, 'project/deleting.html')
+        self.assertEqual(self.client.get(url, {'format': 'json'}).json()['remaining'], 8)
+
+        purge_project(self.project.pk)
+
+        self.assertEqual(self.client.get(url, {'format': 'json'}).json()['done'], True)
+        self.assertRedirects(self.client.get(url), reverse('project:projects'))
+
+    def test_detail_redirects_while_deleting(self):
+        """Test edge case: the detail page of a project being deleted shows the progress"""
+        self._schedule()
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+        response = self.client.get(reverse('project:project_detail', kwargs={'pk': self.project.pk}))
+
+        self.assertRedirects(
+            response, reverse('project:deletion_status', kwargs={'pk': self.project.pk})
+        )
+
+    def test_children_not_writable_while_deleting(self):
+        """Test edge case: lists, tasks and notes of a project being deleted are not found"""
+        self._schedule()
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        todolist = Todolist.objects.get(project=self.project)
+        task = Task.objects.filter(todolist=todolist).first()
+        project = {'project_id': self.project.pk}
+
+        responses = [
+            self.client.post(reverse('todolist:add', kwargs=project), {'name': 'Late list'}),
+            self.client.post(reverse('todolist:edit', kwargs={**project, 'pk': todolist.pk}), {'name': 'Renamed'}),
+            self.client.post(
+                reverse('task:add', kwargs={**project, 'todolist_id': todolist.pk}), {'name': 'Late task'}
+            ),
+            self.client.post(
+                reverse('task:edit', kwargs={**project, 'todolist_id': todolist.pk, 'pk': task.pk}),
+                {'name': 'Renamed'}
+            ),
+            self.client.post(reverse('project:add_note', kwargs=project), {'name': 'Late', 'body': 'note'}),
+        ]
+
+        self.assertEqual([response.status_code for response in responses], [404] * 5)
+        self.assertEqual(Todolist.objects.filter(project=self.project).count(), 1)
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 5)
+        self.assertEqual(ProjectNote.objects.filter(project=self.project).count(), 1)
+
+    def test_command_resumes_pending_purges(self):
+        """Test normal case: the management command finishes interrupted deletions"""
+        self._schedule()
+
+        call_command('purge_deleted_projects', batch_size=3, stdout=io.StringIO())
+
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
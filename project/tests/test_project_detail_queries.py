@@ -0,0 +1,96 @@
+from django.db import connection
+from django.http import Http404
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from account.models import UserProfile
+from project.loaders import load_project_detail
+from project.models import Project, ProjectFile, ProjectNote
+from todolist.models import Todolist
+
+
+User = get_user_model()
+
+
+class ProjectDetailQueryTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _project_with_children(self, name, todolists, notes, files):
+        project = Project.objects.create(name=name, created_by=self.user)
+        Todolist.objects.bulk_create([
+            Todolist(name=f'List {i}', project=project, created_by=self.user)
+            for i in range(todolists)
+        ])
+        ProjectNote.objects.bulk_create([
+            ProjectNote(name=f'Note {i}', body='body', project=project)
+            for i in range(notes)
+        ])
+        ProjectFile.objects.bulk_create([
+            ProjectFile(name=f'File {i}', attachment=f'projectfiles/{i}.pdf', project=project)
+            for i in range(files)
+        ])
+        return project
+
+    def _count_queries(self, project):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                reverse('project:project_detail', kwargs={'pk': project.pk})
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_independent_of_children(self):
+        """Test performance: 1 child per section costs as many queries as 10,000 children"""
+        small = self._project_with_children('Small', todolists=1, notes=1, files=1)
+        large = self._project_with_children('Large', todolists=4000, notes=4000, files=2000)
+
+        self.assertEqual(self._count_queries(small), self._count_queries(large))
+
+    def test_query_count_with_profile(self):
+        """Test performance: an owner profile with an avatar is not fetched once per file"""
+        UserProfile.objects.create(user=self.user, avatar='profile_pictures/me.png')
+        small = self._project_with_children('Small', todolists=1, notes=1, files=1)
+        large = self._project_with_children('Large', todolists=0, notes=0, files=50)
+
+        self.assertEqual(self._count_queries(small), self._count_queries(large))
+
+    def test_loader_counts_and_sections(self):
+        """Test normal case: loader returns section counts and prefetched children"""
+        project = Project.objects.create(name='Counted', created_by=self.user)
+        for i in range(3):
+            Todolist.objects.create(name=f'List {i}', project=project, created_by=self.user)
+        for i in range(2):
+            ProjectNote.objects.create(name=f'Note {i}', body='body', project=project)
+        ProjectFile.objects.create(name='File', attachment='projectfiles/missing.pdf', project=project)
+
+        with self.assertNumQueries(4):
+            loaded = load_project_detail(self.user, project.pk)
+            todolists = list(loaded.todolists.all())
+            notes = list(loaded.notes.all())
+            files = list(loaded.files.all())
+            owner = loaded.created_by
+
+        self.assertEqual(
+            (loaded.todolist_count, loaded.note_count, loaded.file_count), (3, 2, 1)
+        )
+        self.assertEqual((len(todolists), len(notes), len(files)), (3, 2, 1))
+        self.assertEqual(owner, self.user)
+
+    def test_loader_rejects_other_users(self):
+        """Test invalid input: another user's project is a 404"""
+        other = User.objects.create_user(
+            name='otheruser', email='otheruser@gmail.com', password='testpass123'
+        )
+        project = Project.objects.create(name='Private', created_by=other)
+
+        with self.assertRaises(Http404):
+            load_project_detail(self.user, project.pk)
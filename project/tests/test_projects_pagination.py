@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.models import Project
+from project.pagination import (
+    InvalidCursor, decode_cursor, encode_cursor, keyset_paginate
+)
+from project.views import PROJECTS_ORDERING
+
+
+User = get_user_model()
+
+
+class ProjectsPaginationTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.projects = Project.objects.bulk_create([
+            Project(name=f'Project {i}', created_by=self.user) for i in range(7)
+        ])
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _walk(self, page_size):
+        """Follow next cursors until the last page and return every page."""
+        pages, cursor = [], None
+        while True:
+            page = keyset_paginate(
+                Project.objects.filter(created_by=self.user),
+                PROJECTS_ORDERING, cursor=cursor, page_size=page_size
+            )
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_project_once(self):
+        """Test normal case: walking the cursors yields each project exactly once, newest first"""
+        pages = self._walk(page_size=3)
+        seen = [project.pk for page in pages for project in page.items]
+
+        self.assertEqual([len(page.items) for page in pages], [3, 3, 1])
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(
+            seen,
+            list(Project.objects.order_by(*PROJECTS_ORDERING).values_list('pk', flat=True))
+        )
+
+    def test_ties_on_created_at_are_broken_by_id(self):
+        """Test edge case: projects sharing a timestamp are neither skipped nor repeated"""
+        timestamp = self.projects[0].created_at
+        Project.objects.filter(created_by=self.user).update(created_at=timestamp)
+
+        seen = [project.pk for page in self._walk(page_size=2) for project in page.items]
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_cursor_round_trip(self):
+        """Test normal case: cursors decode back to the encoded values"""
+        project = self.projects[0]
+        cursor = encode_cursor([project.created_at, project.pk])
+
+        self.assertEqual(decode_cursor(cursor), [str(project.created_at), str(project.pk)])
+
+    def test_garbage_cursor_is_rejected(self):
+        """Test invalid input: undecodable or mistyped cursors raise InvalidCursor"""
+        queryset = Project.objects.filter(created_by=self.user)
+
+        for cursor in ['not-base64!', encode_cursor(['x']), encode_cursor(['not a date', 'nope'])]:
+            with self.assertRaises(InvalidCursor):
+                keyset_paginate(queryset, PROJECTS_ORDERING, cursor=cursor)
+
+    def test_view_renders_load_more_link(self):
+        """Test normal case: a full page exposes the next cursor to the template"""
+        with patch('project.views.PROJECTS_PAGE_SIZE', 5):
+            response = self.client.get(reverse('project:projects'))
+
+        self.assertEqual(len(response.context['projects']), 5)
+        self.assertIsNotNone(response.context['next_cursor'])
+        self.assertContains(response, 'Load more')
+
+        with patch('project.views.PROJECTS_PAGE_SIZE', 5):
+            response = self.client.get(
+                reverse('project:projects'), {'cursor': response.context['next_cursor']}
+            )
+
+        self.assertEqual(len(response.context['projects']), 2)
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertNotContains(response, 'Load more')
+
+    def test_view_invalid_cursor_redirects_to_first_page(self):
+        """Test invalid input: a tampered cursor sends the user back to the first page"""
+        response = self.client.get(reverse('project:projects'), {'cursor': '%%%'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, reverse('project:projects'))
+
+    def test_deep_page_costs_one_indexed_query(self):
+        """Test performance: deep pages run a single query seeking through the owner index"""
+        first = keyset_paginate(
+            Project.objects.filter(created_by=self.user), PROJECTS_ORDERING, page_size=2
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            keyset_paginate(
+                Project.objects.filter(created_by=self.user), PROJECTS_ORDERING,
+                cursor=first.next_cursor, page_size=2
+            )
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + ctx.captured_queries[0]['sql'])
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn('project_owner_created_idx', plan)
@@ -0,0 +1,264 @@
+import base64
+import datetime
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from unittest.mock import patch
+
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from project import uploads
+from project.models import FileUpload, Project, ProjectFile
+from project.uploads import OffsetMismatch, append_chunk, expire_uploads
+
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PNG = b'\x89PNG\r\n\x1a\n'
+
+
+def b64(data):
+    return base64.b64encode(data if isinstance(data, bytes) else data.encode()).decode()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ResumableUploadTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.create_url = reverse('project:create_upload', kwargs={'project_id': self.project.pk})
+        self.finish_url = reverse('project:finish_uploads', kwargs={'project_id': self.project.pk})
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _create(self, length, name='Report', filename='report.pdf'):
+        return self.client.post(
+            self.create_url, HTTP_TUS_RESUMABLE='1.0.0', HTTP_UPLOAD_LENGTH=str(length),
+            HTTP_UPLOAD_METADATA=f'name {b64(name)},filename {b64(filename)}',
+        )
+
+    def _patch(self, url, offset, data, checksum=None):
+        headers = {'HTTP_TUS_RESUMABLE': '1.0.0', 'HTTP_UPLOAD_OFFSET': str(offset)}
+        if checksum:
+            headers['HTTP_UPLOAD_CHECKSUM'] = checksum
+        return self.client.patch(url, data, content_type='application/offset+octet-stream', **headers)
+
+    def _upload(self, data, **kwargs):
+        url = self._create(len(data), **kwargs)['Location']
+        self._patch(url, 0, data)
+        return url
+
+    def _path(self, upload):
+        return os.path.join(MEDIA_ROOT, upload.path)
+
+    def test_chunks_append_in_place(self):
+        """Test normal case: chunks land in the file in order and HEAD reports the offset"""
+        response = self._create(11)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Tus-Resumable'], '1.0.0')
+        url = response['Location']
+        upload = FileUpload.objects.get(project=self.project)
+        self.assertEqual((upload.name, upload.length), ('Report', 11))
+        self.assertTrue(upload.path.startswith('projectfiles/report'))
+
+        checksum = 'sha256 ' + b64(hashlib.sha256(b'Hello ').digest())
+        response = self._patch(url, 0, b'Hello ', checksum)
+        self.assertEqual((response.status_code, response['Upload-Offset']), (204, '6'))
+        response = self._patch(url, 6, b'world', 'md5 ' + b64(hashlib.md5(b'world').digest()))
+        self.assertEqual(response['Upload-Offset'], '11')
+
+        response = self.client.head(url, HTTP_TUS_RESUMABLE='1.0.0')
+        self.assertEqual((response['Upload-Offset'], response['Upload-Length']), ('11', '11'))
+        with open(self._path(upload), 'rb') as f:
+            self.assertEqual(f.read(), b'Hello world')
+
+    def test_checksum_mismatch_keeps_offset(self):
+        """Test edge case: a corrupted chunk is cut off and can be sent again"""
+        url = self._create(5)['Location']
+
+        response = self._patch(url, 0, b'hellx', 'sha1 ' + b64(hashlib.sha1(b'hello').digest()))
+
+        self.assertEqual(response.status_code, 460)
+        upload = FileUpload.objects.get(project=self.project)
+        self.assertEqual(upload.offset, 0)
+        self.assertEqual(os.path.getsize(self._path(upload)), 0)
+        response = self._patch(url, 0, b'hello', 'sha1 ' + b64(hashlib.sha1(b'hello').digest()))
+        self.assertEqual(response['Upload-Offset'], '5')
+
+    def test_racing_chunk_leaves_file_alone(self):
+        """Test edge case: a PATCH at an offset another one is writing is refused and writes nothing"""
+        self._create(6)
+        upload = FileUpload.objects.get(project=self.project)
+        test = self
+
+        class RacingStream(io.BytesIO):
+            def read(stream, size=-1):
+                if not stream.tell():
+                    # Another request arrives while this chunk streams in.
+                    with test.assertRaises(OffsetMismatch):
+                        append_chunk(FileUpload.objects.get(pk=upload.pk), 0, io.BytesIO(b'loser!'))
+                return super().read(size)
+
+        self.assertEqual(append_chunk(upload, 0, RacingStream(b'first!')), 6)
+
+        upload.refresh_from_db()
+        self.assertEqual((upload.offset, upload.writing), (6, None))
+        with open(self._path(upload), 'rb') as f:
+            self.assertEqual(f.read(), b'first!')
+
+    def test_abandoned_claim_lapses(self):
+        """Test edge case: an upload claimed by a request that died takes chunks again later"""
+        url = self._create(5)['Location']
+        upload = FileUpload.objects.get(project=self.project)
+        FileUpload.objects.filter(pk=upload.pk).update(writing=uuid.uuid4())
+
+        self.assertEqual(self._patch(url, 0, b'hello').status_code, 409)
+        FileUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(self._patch(url, 0, b'hello')['Upload-Offset'], '5')
+        upload.refresh_from_db()
+        self.assertIsNone(upload.writing)
+
+    def test_chunk_size_limit(self):
+        """Test invalid input: chunks over the advertised size are refused and release the upload"""
+        response = self._create(10)
+        self.assertEqual(response['Upload-Max-Chunk-Size'], str(uploads.MAX_CHUNK_SIZE))
+        url = response['Location']
+
+        self.assertEqual(self._patch(url, 0, b'x' * (uploads.MAX_CHUNK_SIZE + 1)).status_code, 413)
+        with patch('project.uploads.MAX_CHUNK_SIZE', 4), patch('project.uploads.UPLOAD_BUFFER_SIZE', 2):
+            with self.assertRaises(uploads.UploadTooLarge):
+                append_chunk(FileUpload.objects.get(project=self.project), 0, io.BytesIO(b'abcdef'))
+
+        upload = FileUpload.objects.get(project=self.project)
+        self.assertEqual((upload.offset, upload.writing), (0, None))
+        self.assertEqual(os.path.getsize(self._path(upload)), 0)
+        self.assertEqual(self._patch(url, 0, b'abcdef')['Upload-Offset'], '6')
+
+    def test_finish_refuses_other_file_types(self):
+        """Test invalid input: uploads that are not PDF, JPEG or PNG files are not finished"""
+        pdf = self._upload(b'%PDF-1.7', name='Report').rstrip('/').split('/')[-1]
+        script = self._upload(b'#!/bin/sh\n', name='Script', filename='report.pdf').rstrip('/').split('/')[-1]
+
+        response = self.client.post(
+            self.finish_url, json.dumps({'uploads': [pdf, script]}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 415)
+        self.assertIn('Script', response.json()['errors']['uploads'][0])
+        self.assertEqual(FileUpload.objects.count(), 2)
+        self.assertFalse(ProjectFile.objects.exists())
+
+    def test_invalid_chunks(self):
+        """Test invalid input: wrong offsets, overlong chunks and bad headers are refused"""
+        url = self._create(4)['Location']
+
+        self.assertEqual(self._patch(url, 2, b'ab').status_code, 409)
+        self.assertEqual(self._patch(url, 0, b'abcdef').status_code, 413)
+        self.assertEqual(self._patch(url, 0, b'ab', 'crc32 AAAA').status_code, 400)
+        response = self.client.patch(url, b'ab', content_type='application/octet-stream',
+                                     HTTP_TUS_RESUMABLE='1.0.0', HTTP_UPLOAD_OFFSET='0')
+        self.assertEqual(response.status_code, 415)
+        response = self.client.patch(url, b'ab', content_type='application/offset+octet-stream',
+                                     HTTP_UPLOAD_OFFSET='0')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(FileUpload.objects.get(project=self.project).offset, 0)
+
+    def test_invalid_creation(self):
+        """Test invalid input: missing lengths and names or oversized files are refused"""
+        response = self.client.post(self.create_url, HTTP_TUS_RESUMABLE='1.0.0',
+                                    HTTP_UPLOAD_METADATA=f'name {b64("Report")}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._create(10, name='', filename='').status_code, 400)
+        self.assertEqual(self._create(10, name='x' * 101).status_code, 400)
+        self.assertEqual(self._create(2 * 1024 ** 3).status_code, 413)
+        self.assertFalse(FileUpload.objects.exists())
+
+        response = self.client.options(self.create_url)
+        self.assertIn('checksum', response['Tus-Extension'])
+
+    def test_finish_creates_files_in_one_step(self):
+        """Test normal case: parallel uploads become project files together"""
+        first = self._upload(b'%PDF-first', name='First', filename='a.pdf')
+        second = self._upload(PNG + b'second', name='Second', filename='b.png')
+        ids = [first.rstrip('/').split('/')[-1], second.rstrip('/').split('/')[-1]]
+
+        response = self.client.post(self.finish_url, json.dumps({'uploads': ids}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([f['name'] for f in response.json()['files']], ['First', 'Second'])
+        self.assertFalse(FileUpload.objects.exists())
+        files = {f.name: f for f in ProjectFile.objects.filter(project=self.project)}
+        self.assertEqual(files['Second'].size, 14)
+        with files['First'].attachment.open('rb') as f:
+            self.assertEqual(f.read(), b'%PDF-first')
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.file_count, self.project.file_bytes), (2, 24))
+
+    def test_finish_refuses_incomplete_uploads(self):
+        """Test edge case: one unfinished upload keeps every upload from finishing"""
+        done = self._upload(b'%PDF-done').rstrip('/').split('/')[-1]
+        partial = self._create(10)['Location'].rstrip('/').split('/')[-1]
+
+        response = self.client.post(
+            self.finish_url, json.dumps({'uploads': [done, partial]}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(FileUpload.objects.count(), 2)
+        self.assertFalse(ProjectFile.objects.exists())
+
+        response = self.client.post(
+            self.finish_url, json.dumps({'uploads': [str(uuid.uuid4())]}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(self.finish_url, json.dumps({'uploads': 'x'}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_other_users_uploads(self):
+        """Test invalid input: another user's project and uploads are not found"""
+        url = self._create(3)['Location']
+        self.client.login(email='otheruser@gmail.com', password='testpass123')
+
+        self.assertEqual(self._patch(url, 0, b'abc').status_code, 404)
+        self.assertEqual(self._create(3).status_code, 404)
+
+    def test_abandon_and_expire(self):
+        """Test normal case: abandoned and idle uploads are removed with their bytes"""
+        url = self._create(3)['Location']
+        upload = FileUpload.objects.get(project=self.project)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url, HTTP_TUS_RESUMABLE='1.0.0')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(FileUpload.objects.exists())
+        self.assertFalse(os.path.exists(self._path(upload)))
+
+        self._create(3)
+        upload = FileUpload.objects.get(project=self.project)
+        self.assertEqual(expire_uploads(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(expire_uploads(now=timezone.now() + datetime.timedelta(days=2)), 1)
+        self.assertFalse(os.path.exists(self._path(upload)))
+        call_command('expire_uploads', stdout=io.StringIO())
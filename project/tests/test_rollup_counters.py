@@ -0,0 +1,135 @@
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.counters import reconcile_all
+from project.models import Project, ProjectFile, ProjectNote
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class RollupCounterTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Counted', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='List', project=self.project, created_by=self.user
+        )
+
+    def _task(self, name, is_done=False, todolist=None):
+        return Task.objects.create(
+            name=name, is_done=is_done, project=self.project,
+            todolist=todolist or self.todolist, created_by=self.user
+        )
+
+    def _counters(self):
+        self.project.refresh_from_db()
+        self.todolist.refresh_from_db()
+        return {
+            'project': (
+                self.project.todolist_count, self.project.task_count,
+                self.project.completed_task_count,
+            ),
+            'todolist': (self.todolist.task_count, self.todolist.completed_task_count),
+        }
+
+    def test_task_create_and_delete(self):
+        """Test normal case: creating and deleting tasks moves both parents' counters"""
+        self._task('Open')
+        done = self._task('Done', is_done=True)
+
+        self.assertEqual(self._counters(), {'project': (1, 2, 1), 'todolist': (2, 1)})
+
+        done.delete()
+
+        self.assertEqual(self._counters(), {'project': (1, 1, 0), 'todolist': (1, 0)})
+
+    def test_toggle_done_view_updates_completed_counts(self):
+        """Test normal case: toggle_done moves the completed counters both ways"""
+        task = self._task('Toggle me')
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+        url = reverse('task:toggle_done', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': task.pk
+        })
+
+        self.client.post(url)
+        self.assertEqual(self._counters()['todolist'], (1, 1))
+        self.assertEqual(self.project.completed_task_count, 1)
+
+        self.client.post(url)
+        self.assertEqual(self._counters()['todolist'], (1, 0))
+        self.assertEqual(self.project.completed_task_count, 0)
+
+    def test_todolist_delete_rolls_tasks_off_project(self):
+        """Test normal case: deleting a todolist subtracts its cascaded tasks"""
+        other = Todolist.objects.create(name='Other', project=self.project, created_by=self.user)
+        self._task('Stays')
+        self._task('Goes', todolist=other)
+        self._task('Goes too', is_done=True, todolist=other)
+
+        other.delete()
+
+        self.assertEqual(self._counters()['project'], (1, 1, 0))
+
+    @override_settings(MEDIA_ROOT='/tmp/planpilot-test-media')
+    def test_note_and_file_counters(self):
+        """Test normal case: notes and files keep count and byte totals"""
+        note = ProjectNote.objects.create(name='Note', body='body', project=self.project)
+        projectfile = ProjectFile.objects.create(
+            name='File', project=self.project,
+            attachment=SimpleUploadedFile('spec.pdf', b'x' * 1234, content_type='application/pdf'),
+        )
+        self.project.refresh_from_db()
+
+        self.assertEqual(
+            (self.project.note_count, self.project.file_count, self.project.file_bytes),
+            (1, 1, 1234)
+        )
+
+        note.delete()
+        projectfile.attachment.delete(save=False)
+        projectfile.delete()
+        self.project.refresh_from_db()
+
+        self.assertEqual(
+            (self.project.note_count, self.project.file_count, self.project.file_bytes),
+            (0, 0, 0)
+        )
+
+    def test_reconcile_repairs_drift(self):
+        """Test edge case: bulk writes that bypass save() are repaired in batches"""
+        Task.objects.bulk_create([
+            Task(name=f'Bulk {i}', is_done=i % 2 == 0, project=self.project,
+                 todolist=self.todolist, created_by=self.user)
+            for i in range(5)
+        ])
+        healthy = Project.objects.create(name='Healthy', created_by=self.user)
+
+        results = reconcile_all(batch_size=1)
+
+        self.assertEqual(results['todolists'], (1, 1))
+        self.assertEqual(results['projects'], (2, 1))
+        self.assertEqual(self._counters(), {'project': (1, 5, 3), 'todolist': (5, 3)})
+
+        healthy.refresh_from_db()
+        self.assertEqual(healthy.task_count, 0)
+
+    def test_reconcile_command(self):
+        """Test normal case: the management command reports its work"""
+        out = StringIO()
+        call_command('reconcile_counters', '--batch-size', '10', stdout=out)
+
+        self.assertIn('projects: checked 1, repaired 0', out.getvalue())
+        self.assertIn('todolists: checked 1, repaired 0', out.getvalue())
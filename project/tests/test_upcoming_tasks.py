@@ -0,0 +1,124 @@
+import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from project.models import Project
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class UpcomingTasksTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@gmail.com',
+            password='testpass123'
+        )
+        self.now = timezone.now()
+        self.lists = []
+        for i in range(2):
+            project = Project.objects.create(name=f'Project {i}', created_by=self.user)
+            self.lists.append(Todolist.objects.create(name='List', project=project, created_by=self.user))
+        self.url = reverse('project:upcoming')
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _task(self, name, hours, todolist=None, **kwargs):
+        todolist = todolist or self.lists[0]
+        return Task.objects.create(
+            name=name, project=todolist.project, todolist=todolist, created_by=todolist.created_by,
+            due_at=self.now + datetime.timedelta(hours=hours), **kwargs
+        )
+
+    def test_upcoming_across_projects(self):
+        """Test normal case: open tasks from every project are listed by due date"""
+        later = self._task('Later', 5, self.lists[1])
+        sooner = self._task('Sooner', 1)
+        late = self._task('Late', -2, self.lists[1])
+        self._task('Done', 2, is_done=True)
+        Task.objects.create(name='Undated', project=self.lists[0].project, todolist=self.lists[0], created_by=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['overdue']), [late])
+        self.assertEqual(response.context['upcoming'], [sooner, later])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_other_users_and_deleting_projects_are_hidden(self):
+        """Test edge case: other users' tasks and projects being deleted are left out"""
+        other_project = Project.objects.create(name='Other', created_by=self.other_user)
+        other_list = Todolist.objects.create(name='List', project=other_project, created_by=self.other_user)
+        self._task('Theirs', 1, other_list)
+        self._task('Going', 1, self.lists[1])
+        Project.objects.filter(pk=self.lists[1].project_id).update(deleting_at=self.now)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.context['upcoming'], [])
+        self.assertContains(response, 'Nothing is due')
+
+    def test_pages_follow_the_cursor(self):
+        """Test normal case: later pages continue after the cursor and skip overdue tasks"""
+        tasks = [self._task(f'Task {i}', i + 1) for i in range(5)]
+        self._task('Late', -1)
+
+        with patch('project.views.UPCOMING_PAGE_SIZE', 2):
+            seen, cursor = [], None
+            while True:
+                response = self.client.get(self.url, {'cursor': cursor} if cursor else {})
+                if cursor:
+                    self.assertEqual(response.context['overdue'], [])
+                seen.extend(response.context['upcoming'])
+                cursor = response.context['next_cursor']
+                if not cursor:
+                    break
+
+        self.assertEqual(seen, tasks)
+
+    def test_single_index_range_scan(self):
+        """Test normal case: each list is read through the partial due-date index"""
+        self._task('Soon', 1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        task_queries = [q['sql'] for q in queries.captured_queries if 'due_at' in q['sql']]
+        self.assertEqual(len(task_queries), 2)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {task_queries[0]}')
+                plan = ' '.join(str(row) for row in cursor.fetchall())
+            self.assertIn('task_open_due_idx', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_invalid_cursor(self):
+        """Test invalid input: a tampered cursor redirects to the first page"""
+        response = self.client.get(self.url, {'cursor': 'garbage!'})
+        self.assertRedirects(response, self.url)
+
+    def test_edit_sets_and_clears_due_date(self):
+        """Test normal case: the edit form saves and clears the due date"""
+        task = self._task('Task', 1)
+        url = reverse('task:edit', kwargs={
+            'project_id': task.project_id, 'todolist_id': task.todolist_id, 'pk': task.pk
+        })
+        self.client.post(url, {'name': 'Task', 'description': '', 'due_at': '2030-01-02T09:30'})
+        task.refresh_from_db()
+        self.assertEqual(timezone.localtime(task.due_at).strftime('%Y-%m-%d %H:%M'), '2030-01-02 09:30')
+
+        self.client.post(url, {'name': 'Task', 'description': '', 'due_at': ''})
+        task.refresh_from_db()
+        self.assertIsNone(task.due_at)
@@ -0,0 +1,276 @@
+"""
+Resumable, chunked uploads of project files, in the style of tus
+(https://tus.io/protocols/resumable-upload): the core protocol plus its
+creation, checksum, termination and expiration extensions.
+
+A client creates an upload with the file's name and total length and
+gets its URL back. The file is created empty right away, under the
+storage name its ProjectFile will have, and each PATCH appends one chunk
+to it in place, so finishing an upload never copies it. A chunk may
+carry a checksum (Upload-Checksum: <algorithm> <base64 digest>). A chunk
+that does not match is cut off again and the offset stays put, so the
+client resends it. After an interruption the client asks for the offset
+(HEAD) and resumes from there.
+
+Several uploads can run in parallel, but each takes one chunk at a
+time. A PATCH first claims the upload at its offset with a conditional
+UPDATE (FileUpload.writing) that commits at once, then writes, then moves
+the offset with a second one. No database lock is held while the bytes
+arrive, and of two PATCHes racing at the same offset the one that loses
+the claim never touches the file. A claim left by a request that died
+lapses after UPLOAD_CLAIM_TIMEOUT.
+
+finish_uploads() turns any number of complete uploads of a project into
+ProjectFiles in one transaction. Uploads left idle for UPLOAD_EXPIRY are
+removed by expire_uploads() (the `expire_uploads` management command).
+
+Files are limited to the types project files accept (ALLOWED_FILE_TYPES,
+recognized by their first bytes rather than by what the client says),
+checked when the uploads are finished. MAX_UPLOAD_SIZE is
+above the 5 MB of a form upload on purpose: large files are what this is
+for. A chunk is at most MAX_CHUNK_SIZE, which the client is told.
+
+Chunks are written through the storage's local path, so this needs a
+file system storage, which is what the project uses.
+"""
+import base64
+import datetime
+import hashlib
+import logging
+import os
+import uuid
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import fragments
+from .models import FileUpload, Project, ProjectFile
+
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = '1.0.0'
+TUS_EXTENSIONS = ('creation', 'checksum', 'termination', 'expiration')
+CHECKSUM_ALGORITHMS = ('md5', 'sha1', 'sha256')
+MAX_UPLOAD_SIZE = 100 * 1024 ** 2
+MAX_CHUNK_SIZE = 8 * 1024 ** 2
+# Bytes read from the request and written per step while a chunk streams in.
+UPLOAD_BUFFER_SIZE = 64 * 1024
+UPLOAD_EXPIRY = datetime.timedelta(days=1)
+# How long a chunk may take before another request can claim its offset.
+UPLOAD_CLAIM_TIMEOUT = datetime.timedelta(minutes=15)
+MAX_NAME_LENGTH = 100
+# Content type -> how files of that type start.
+ALLOWED_FILE_TYPES = {
+    'application/pdf': b'%PDF-',
+    'image/jpeg': b'\xff\xd8\xff',
+    'image/png': b'\x89PNG\r\n\x1a\n',
+}
+
+
+class UploadError(ValueError):
+    """Raised when an upload request cannot be applied; `status` is the HTTP answer."""
+    status = 400
+    reason = None
+
+
+class OffsetMismatch(UploadError):
+    status = 409
+
+
+class ChecksumMismatch(UploadError):
+    # tus answers a checksum mismatch with this non-standard status.
+    status = 460
+    reason = 'Checksum Mismatch'
+
+
+class UploadTooLarge(UploadError):
+    status = 413
+
+
+class UnsupportedFileType(UploadError):
+    status = 415
+
+
+def _storage():
+    return ProjectFile._meta.get_field('attachment').storage
+
+
+def parse_metadata(header):
+    """Upload-Metadata, `key base64value` pairs separated by commas, as a dict."""
+    metadata = {}
+    for pair in filter(None, (part.strip() for part in (header or '').split(','))):
+        key, _, value = pair.partition(' ')
+        try:
+            metadata[key] = base64.b64decode(value.strip(), validate=True).decode()
+        except ValueError:
+            raise UploadError(f'Invalid Upload-Metadata value for {key!r}.')
+    return metadata
+
+
+def parse_checksum(header):
+    """Upload-Checksum as (algorithm, digest), or None if there is none."""
+    if not header:
+        return None
+    algorithm, _, digest = header.strip().partition(' ')
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise UploadError(f'Unsupported checksum algorithm {algorithm!r}.')
+    try:
+        return algorithm, base64.b64decode(digest.strip(), validate=True)
+    except ValueError:
+        raise UploadError('Invalid Upload-Checksum digest.')
+
+
+def expires_at(upload):
+    return upload.updated_at + UPLOAD_EXPIRY
+
+
+def start_upload(project, user, name, filename, length):
+    """
+    Create an upload of `length` bytes for `project` and the empty file
+    it is written to, and return it. `name` becomes the ProjectFile's
+    name, `filename` (defaulting to `name`) that of the stored file.
+    """
+    name = (name or filename or '').strip()
+    if not name:
+        raise UploadError('Name cannot be empty.')
+    if len(name) > MAX_NAME_LENGTH:
+        raise UploadError(f'Name cannot exceed {MAX_NAME_LENGTH} characters.')
+    if length < 0:
+        raise UploadError('Upload-Length cannot be negative.')
+    if length > MAX_UPLOAD_SIZE:
+        raise UploadTooLarge(f'Files cannot exceed {MAX_UPLOAD_SIZE} bytes.')
+
+    field = ProjectFile._meta.get_field('attachment')
+    filename = os.path.basename((filename or name).replace('\\', '/')) or 'upload'
+    path = _storage().save(field.generate_filename(None, filename), ContentFile(b''))
+    try:
+        return FileUpload.objects.create(
+            name=name, path=path, length=length, project=project, created_by=user
+        )
+    except Exception:
+        _storage().delete(path)
+        raise
+
+
+def _write_chunk(path, upload, offset, stream, checksum):
+    """Write the chunk at `offset` and return the offset after it."""
+    digest = hashlib.new(checksum[0]) if checksum else None
+    size = 0
+    with open(path, 'r+b') as f:
+        try:
+            f.seek(offset)
+            while True:
+                data = stream.read(UPLOAD_BUFFER_SIZE)
+                if not data:
+                    break
+                size += len(data)
+                if size > MAX_CHUNK_SIZE:
+                    raise UploadTooLarge(f'Chunks cannot exceed {MAX_CHUNK_SIZE} bytes.')
+                if offset + size > upload.length:
+                    raise UploadTooLarge(f'The chunk runs past the upload length of {upload.length} bytes.')
+                f.write(data)
+                if digest:
+                    digest.update(data)
+            if digest and digest.digest() != checksum[1]:
+                raise ChecksumMismatch('The chunk does not match its checksum.')
+        except BaseException:
+            f.truncate(offset)
+            raise
+        # Also drops whatever a failed earlier attempt left past the chunk.
+        f.truncate()
+    return offset + size
+
+
+def append_chunk(upload, offset, stream, checksum=None):
+    """
+    Append the bytes read from `stream` to `upload` at `offset`, which must
+    be its current offset, and return the new offset. `checksum` is an
+    (algorithm, digest) pair from parse_checksum() for the whole chunk.
+    """
+    if offset != upload.offset:
+        raise OffsetMismatch(f'Upload is at offset {upload.offset}, not {offset}.')
+    token, now = uuid.uuid4(), timezone.now()
+    claimed = FileUpload.objects.filter(pk=upload.pk, offset=offset) \
+                                .filter(Q(writing__isnull=True) | Q(updated_at__lt=now - UPLOAD_CLAIM_TIMEOUT)) \
+                                .update(writing=token, updated_at=now)
+    if not claimed:
+        raise OffsetMismatch('Another request moved the upload first or is writing to it.')
+
+    upload_row = FileUpload.objects.filter(pk=upload.pk, writing=token)
+    try:
+        new_offset = _write_chunk(_storage().path(upload.path), upload, offset, stream, checksum)
+    except BaseException:
+        upload_row.update(writing=None)
+        raise
+
+    now = timezone.now()
+    if not upload_row.update(offset=new_offset, writing=None, updated_at=now):
+        raise OffsetMismatch('Another request took the upload over while the chunk was written.')
+    upload.offset, upload.updated_at = new_offset, now
+    return new_offset
+
+
+def _file_type(path):
+    with _storage().open(path, 'rb') as f:
+        head = f.read(max(len(signature) for signature in ALLOWED_FILE_TYPES.values()))
+    return next((t for t, signature in ALLOWED_FILE_TYPES.items() if head.startswith(signature)), None)
+
+
+def finish_uploads(project, user, upload_ids):
+    """
+    Turn the complete uploads `upload_ids` (UUIDs) of `project`, started by
+    `user`, into ProjectFiles in one transaction and return the files, in
+    the order given. Raises FileUpload.DoesNotExist for an unknown upload,
+    OffsetMismatch for one still missing bytes and UnsupportedFileType for
+    a file not of ALLOWED_FILE_TYPES, leaving every upload as it was.
+    """
+    upload_ids = list(dict.fromkeys(upload_ids))
+    with transaction.atomic():
+        uploads = FileUpload.objects.select_for_update() \
+                                    .filter(project=project, created_by=user).in_bulk(upload_ids)
+        files = []
+        for upload_id in upload_ids:
+            upload = uploads.get(upload_id)
+            if upload is None:
+                raise FileUpload.DoesNotExist(f'No upload {upload_id} in project {project.pk}.')
+            if not upload.is_complete:
+                raise OffsetMismatch(f'Upload {upload_id} has {upload.offset} of {upload.length} bytes.')
+            if _file_type(upload.path) is None:
+                raise UnsupportedFileType(f'{upload.name} is not a PDF, JPEG or PNG file.')
+            files.append(ProjectFile(name=upload.name, attachment=upload.path, size=upload.length, project=project))
+
+        # bulk_create() skips ProjectFile.save(), so the counters move here.
+        ProjectFile.objects.bulk_create(files)
+        FileUpload.objects.filter(pk__in=[upload.pk for upload in uploads.values()]).delete()
+        Project.objects.filter(pk=project.pk).adjust(
+            file_count=len(files), file_bytes=sum(f.size for f in files)
+        )
+        fragments.invalidate_project(project.pk)
+    return files
+
+
+def discard_uploads(uploads):
+    """Delete the uploads in the queryset `uploads` and, after commit, their files."""
+    with transaction.atomic():
+        paths = list(uploads.values_list('path', flat=True))
+        uploads.delete()
+        transaction.on_commit(lambda: _remove_files(paths))
+    return len(paths)
+
+
+def expire_uploads(now=None, expiry=UPLOAD_EXPIRY):
+    """Discard the uploads idle for longer than `expiry` and return how many."""
+    cutoff = (now or timezone.now()) - expiry
+    return discard_uploads(FileUpload.objects.filter(updated_at__lt=cutoff))
+
+
+def _remove_files(paths):
+    storage = _storage()
+    for path in paths:
+        try:
+            storage.delete(path)
+        except OSError as e:
+            logger.warning(f"Could not remove upload {path}: {e}")
@@ -9,13 +9,31 @@ app_name = 'project'
 urlpatterns = [
     path('', views.projects, name='projects'),
     path('add/', views.add_project, name='add'),
+    path('templates/', views.templates, name='templates'),
+    path('upcoming/', views.upcoming, name='upcoming'),
+    path('fragments/stats/', views.fragment_stats, name='fragment_stats'),
+    path('archive/', views.archives, name='archives'),
+    path('archive/restore/', views.restore, name='restore'),
+    path('archive/<uuid:pk>/', views.archive_detail, name='archive_detail'),
     path('<uuid:pk>/', views.project_detail, name='project_detail'),
     path('<uuid:pk>/edit/', views.edit, name='edit'),
     path('<uuid:pk>/delete/', views.delete, name='delete'),
+    path('<uuid:pk>/deleting/', views.deletion_status, name='deletion_status'),
+    path('<uuid:pk>/clone/', views.clone, name='clone'),
+    path('<uuid:pk>/archive/', views.archive, name='archive'),
+    path('<uuid:pk>/export/', views.export, name='export'),
+    path('<uuid:project_id>/board/', views.board, name='board'),
+    path('<uuid:project_id>/board/<uuid:todolist_id>/', views.board_column, name='board_column'),
     path('<uuid:project_id>/files/upload/', views.upload_file, name='upload_file'),
+    path('<uuid:project_id>/files/uploads/', views.create_upload, name='create_upload'),
+    path('<uuid:project_id>/files/uploads/finish/', views.finish_uploads, name='finish_uploads'),
+    path('<uuid:project_id>/files/uploads/<uuid:pk>/', views.file_upload, name='file_upload'),
     path('<uuid:project_id>/files/<uuid:pk>/delete/', views.delete_file, name='delete_file'),
     path('<uuid:project_id>/notes/add/', views.add_note, name='add_note'),
     path('<uuid:project_id>/notes/<uuid:pk>/detail', views.note_detail, name='note_detail'),
     path('<uuid:project_id>/notes/<uuid:pk>/edit/', views.note_edit, name='note_edit'),
+    path('<uuid:project_id>/notes/<uuid:pk>/autosave/', views.note_autosave, name='note_autosave'),
     path('<uuid:project_id>/notes/<uuid:pk>/delete/', views.note_delete, name='note_delete'),
+    path('<uuid:project_id>/notes/<uuid:pk>/history/', views.note_history, name='note_history'),
+    path('<uuid:project_id>/notes/<uuid:pk>/history/<int:number>/', views.note_revision, name='note_revision'),
 ]
\ No newline at end of file
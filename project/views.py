@@ -1,15 +1,36 @@
+import json
+import uuid
 import logging
+import datetime
 
 from django.urls import reverse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.contrib import messages
 from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError, MultipleObjectsReturned
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, redirect, get_object_or_404
-
-from .forms import ProjectFileForm, ProjectForm, ProjectNoteForm
-from .models import Project
+from django.utils import timezone
+from django.utils.http import http_date
+
+from audit import log as audit
+from main import rendering
+from task.exporting import EXPORT_FORMATS, export_response
+from task.models import Task
+
+from . import fragments, revisions, uploads
+from .archive import archive_project, load_archive, restore_projects
+from .board import BOARD_COLUMN_SIZE, column_page, load_board
+from .cloning import clone_project
+from .deletion import deletion_progress, schedule_deletion
+from .forms import NoteAutosaveForm, ProjectCloneForm, ProjectFileForm, ProjectForm, ProjectNoteForm
+from .loaders import load_project_detail, with_preview
+from .models import ArchivedProject, FileUpload, NoteRevision, Project, ProjectNote
+from .pagination import InvalidCursor, keyset_paginate
+from .resolvers import resolve_path
 
 
 logger = logging.getLogger(__name__)
@@ -20,13 +41,29 @@ FORM_MESSAGES = {
     'project_created': 'Project created successfully.',
     'update_project': 'Project updated successfully.',
     'project_deleted': 'Project deleted successfully.',
+    'project_deleting': 'Project is being deleted.',
+    'project_cloned': 'Project created from copy successfully.',
+    'project_archived': 'Project archived successfully.',
+    'projects_restored': 'Projects restored successfully.',
     'upload_file': 'File uploaded successfully.',
     'delete_file': 'File deleted successfully.',
     'note_created': 'Note created successfully',
     'note_updated': 'Note updated successfully',
     'note_deleted': 'Note deleted successfully',
+    'note_conflict': 'This note was changed elsewhere since you opened it. Reload it to see the latest version.',
 }
 
+PROJECTS_PAGE_SIZE = 24
+PROJECTS_ORDERING = ('-created_at', '-id')
+DETAIL_SECTIONS = ('todolists', 'notes', 'files')
+# Sections showing the owner's name or avatar, so also keyed by the owner's version.
+OWNER_SECTIONS = ('files',)
+UPCOMING_PAGE_SIZE = 50
+UPCOMING_ORDERING = ('due_at', 'id')
+OVERDUE_LIMIT = 50
+# Autosaves land in the note's history at most this often.
+AUTOSAVE_REVISION_INTERVAL = datetime.timedelta(minutes=5)
+
 
 # Project
 
@@ -35,21 +72,38 @@ FORM_MESSAGES = {
 def projects(request):
     """
     View to display a list of projects created by the authenticated user.
-    Projects are always sorted by creation date (newest first).
+    Projects are always sorted by creation date (newest first) and served
+    in keyset pages; the `cursor` query parameter selects the next page.
     """
+    cursor = request.GET.get('cursor')
+    grid_key = fragments.fragment_key(
+        'project_grid', request.user.pk,
+        fragments.user_version(request.user.pk), cursor or ''
+    )
+    context = {'grid_key': grid_key, 'projects': [], 'next_cursor': None}
+
+    if fragments.all_cached([grid_key]):
+        # The grid fragment is warm, skip the database entirely.
+        return render(request, 'project/projects.html', context)
+
     try:
         # Get projects sorted by created_at (newest first)
-        projects_list = Project.objects.select_related('created_by') \
-                                    .filter(created_by=request.user) \
-                                    .order_by('-created_at')
+        projects_list = with_preview(
+            Project.objects.select_related('created_by').filter(created_by=request.user), 'description'
+        )
+        page = keyset_paginate(
+            projects_list, PROJECTS_ORDERING,
+            cursor=cursor, page_size=PROJECTS_PAGE_SIZE
+        )
+        context['projects'], context['next_cursor'] = page.items, page.next_cursor
+    except InvalidCursor:
+        logger.warning(f"Invalid projects cursor from {request.user.email}: {cursor!r}")
+        return redirect(reverse('project:projects'))
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         messages.error(request, 'An error occurred while fetching projects.')
-        projects_list = Project.objects.none()  # Return empty queryset
-
-    context = {
-        'projects': projects_list
-    }
+        context['projects'] = Project.objects.none()  # Return empty queryset
+        context['grid_key'] = None  # Don't cache the error state
 
     return render(request, 'project/projects.html', context)
 
@@ -69,13 +123,16 @@ def add_project(request):
             try:
                 project = form.save(commit=False)
                 project.created_by = request.user
-                project.save()
-                logger.info(
-                    f"New project created: {project.name} by "
-                    f"{request.user.email}"
-                )
-                messages.success(request, FORM_MESSAGES['project_created'])
-                return redirect(reverse('project:projects'))
+                if form.save_unique(project):
+                    rendering.warm(project.description)
+                    logger.info(
+                        f"New project created: {project.name} by "
+                        f"{request.user.email}"
+                    )
+                    messages.success(request, FORM_MESSAGES['project_created'])
+                    return redirect(reverse('project:projects'))
+                logger.warning(f"Failed project creation attempt: {form.errors}")
+                messages.error(request, form.errors.as_text())
             except ValidationError as e:
                 logger.error(f"Failed to create project: {str(e)}")
                 messages.error(request, f'Failed to create project: {str(e)}')
@@ -93,22 +150,65 @@ def add_project(request):
 def project_detail(request, pk):
     """
     View to display details of a single project owned by the authenticated
-    user.
+    user. The project and all of its sections are loaded in a fixed number
+    of queries by load_project_detail; sections whose fragments are cached
+    under the project's current version are not queried at all.
     """
-    try:
-        project_detail = get_object_or_404(
-            Project.objects.select_related('created_by'),
-            created_by=request.user,
-            pk=pk
+    version = fragments.project_version(pk)
+    owner_version = fragments.user_version(request.user.pk)
+    keys = {
+        section: fragments.fragment_key(
+            section, pk, version, *([owner_version] if section in OWNER_SECTIONS else [])
         )
-        context = {'project': project_detail}
-    except Exception as e:
-        logger.error(f'Error fetching project {pk}: {str(e)}', exc_info=True)
-        messages.error(request, 'An error occurred while fetching the project.')
+        for section in DETAIL_SECTIONS
+    }
+    project_detail = load_project_detail(
+        request.user, pk, prefetch=not fragments.all_cached(keys.values())
+    )
+    if project_detail.deleting_at:
+        return redirect(reverse('project:deletion_status', kwargs={'pk': pk}))
+    context = {'project': project_detail, 'keys': keys}
 
     return render(request, 'project/project_detail.html', context)
 
 
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+@resolve_path()
+def board(request, project):
+    """
+    View to show a project as a board with a column per to-do list. Every
+    column's first cards load in one windowed query (see project.board);
+    each column fetches its further cards from board_column.
+    """
+    return render(request, 'project/board.html', {
+        'project': project,
+        'columns': load_board(project, BOARD_COLUMN_SIZE),
+    })
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+@resolve_path()
+def board_column(request, project, todolist):
+    """
+    View to render the next cards of a board column after ?cursor=, as an
+    HTML fragment.
+    """
+    try:
+        page = column_page(todolist, request.GET.get('cursor'), BOARD_COLUMN_SIZE)
+    except InvalidCursor:
+        raise Http404('Invalid page cursor.')
+
+    return render(request, 'project/_board_cards.html', {
+        'project': project,
+        'todolist': todolist,
+        'board_url': reverse('project:project_detail', kwargs={'pk': project.pk}),
+        'tasks': page.items,
+        'next_cursor': page.next_cursor,
+    })
+
+
 @login_required(login_url='/login/')
 @require_http_methods(["GET", "POST"])
 def edit(request, pk):
@@ -129,8 +229,8 @@ def edit(request, pk):
     )
 
     if request.method == 'POST':
-        if form.is_valid():
-            form.save()
+        if form.is_valid() and form.save_unique():
+            rendering.warm(project_edit.description)
             logger.info(
                 f"Project updated: {project_edit.name} by {request.user.email}"
             )
@@ -149,8 +249,9 @@ def edit(request, pk):
 def delete(request, pk):
     """
     View to delete a project owned by the authenticated user.
-    On GET, renders a confirmation template. On POST, deletes the project and
-    redirects to the project list.
+    The project is only marked as deleting here; its children are removed
+    in small batches by a background worker (see project.deletion), and the
+    user is redirected to a page showing the progress.
     """
     project = get_object_or_404(
         Project.objects.select_related('created_by'),
@@ -158,16 +259,254 @@ def delete(request, pk):
     )
     try:
         with transaction.atomic():
-            project.delete()
-        logger.info(f"Project {project.name} deleted by {request.user.email}")
-        messages.success(request, FORM_MESSAGES['project_deleted'])
-        return redirect(reverse('project:projects'))
+            schedule_deletion(project)
+        logger.info(f"Project {project.name} scheduled for deletion by {request.user.email}")
+        messages.success(request, FORM_MESSAGES['project_deleting'])
+        return redirect(reverse('project:deletion_status', kwargs={'pk': project.pk}))
     except Exception:
         logger.error(f"Failed to delete project {project.name} by {request.user.email}")
         messages.error(request, 'An error occurred while deleting the project.')
         return redirect(reverse('project:projects'))
 
 
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def deletion_status(request, pk):
+    """
+    View to follow the background deletion of a project. Renders a progress
+    page, or JSON when called with ?format=json (the page polls it). Once the
+    project is gone, the page redirects to the project list.
+    """
+    project = Project.objects.filter(pk=pk, created_by=request.user).first()
+    as_json = request.GET.get('format') == 'json'
+
+    if project is None:
+        if as_json:
+            return JsonResponse({'done': True, 'remaining': 0, 'percent': 100})
+        messages.success(request, FORM_MESSAGES['project_deleted'])
+        return redirect(reverse('project:projects'))
+    if not project.deleting_at:
+        return redirect(reverse('project:project_detail', kwargs={'pk': pk}))
+
+    progress = deletion_progress(project)
+    if as_json:
+        return JsonResponse({'done': False, **progress})
+
+    return render(request, 'project/deleting.html', {'project': project, 'progress': progress})
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def upcoming(request):
+    """
+    View to list the authenticated user's open tasks that have a due date,
+    across all of their projects: the overdue ones, then the upcoming ones
+    by due date, keyset paginated. Both lists are range scans of the
+    partial task_open_due_idx index, however many projects there are.
+    """
+    now = timezone.now()
+    cursor = request.GET.get('cursor')
+    open_tasks = Task.objects.filter(
+        created_by=request.user, is_done=False, due_at__isnull=False, project__deleting_at__isnull=True
+    ).select_related('project', 'todolist').only(
+        'id', 'name', 'due_at', 'project_id', 'todolist_id', 'project__name', 'todolist__name'
+    )
+
+    try:
+        page = keyset_paginate(
+            open_tasks.filter(due_at__gte=now), UPCOMING_ORDERING,
+            cursor=cursor, page_size=UPCOMING_PAGE_SIZE
+        )
+    except InvalidCursor:
+        logger.warning(f"Invalid upcoming cursor from {request.user.email}: {cursor!r}")
+        return redirect(reverse('project:upcoming'))
+
+    # Overdue tasks head the first page only.
+    overdue = [] if cursor else open_tasks.filter(due_at__lt=now).order_by(*UPCOMING_ORDERING)[:OVERDUE_LIMIT]
+
+    return render(request, 'project/upcoming.html', {
+        'overdue': overdue,
+        'upcoming': page.items,
+        'next_cursor': page.next_cursor,
+    })
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def templates(request):
+    """
+    View to list the projects the authenticated user marked as templates.
+    """
+    templates_list = with_preview(Project.objects.filter(
+        created_by=request.user, is_template=True, deleting_at__isnull=True
+    ), 'description').order_by('name')
+
+    return render(request, 'project/templates.html', {'templates': templates_list})
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET", "POST"])
+@permission_required('project.add_project', raise_exception=True)
+def clone(request, pk):
+    """
+    View to create a new project as a deep copy of an existing project or
+    template owned by the authenticated user. Todolists, tasks and notes
+    are copied in bulk inside a single transaction.
+    """
+    source = get_object_or_404(Project, pk=pk, created_by=request.user, deleting_at__isnull=True)
+
+    if request.method == 'POST':
+        form = ProjectCloneForm(request.POST)
+        if form.is_valid():
+            try:
+                project = clone_project(
+                    source, request.user,
+                    name=form.cleaned_data['name'],
+                    description=form.cleaned_data['description'] or source.description,
+                    keep_progress=form.cleaned_data['keep_progress'],
+                )
+                logger.info(
+                    f"Project {source.name} cloned as {project.name} by "
+                    f"{request.user.email}"
+                )
+                messages.success(request, FORM_MESSAGES['project_cloned'])
+                return redirect(reverse('project:project_detail', kwargs={'pk': project.pk}))
+            except IntegrityError as e:
+                if form.add_integrity_error(e):
+                    messages.error(request, form.errors.as_text())
+                else:
+                    logger.error(f"Failed to clone project {pk}: {str(e)}")
+                    messages.error(request, 'Failed to create the project copy.')
+        else:
+            logger.warning(f"Failed project clone attempt: {form.errors}")
+            messages.error(request, form.errors.as_text())
+    else:
+        form = ProjectCloneForm(initial={'name': f'Copy of {source.name}'})
+
+    return render(request, 'project/clone.html', {'form': form, 'source': source})
+
+
+@staff_member_required
+@require_http_methods(["GET"])
+def fragment_stats(request):
+    """
+    Expose the fragment cache hit/miss counters to staff as JSON.
+    """
+    return JsonResponse(fragments.stats())
+
+
+# Archive
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET", "POST"])
+def archive(request, pk):
+    """
+    View to move a project owned by the authenticated user, with all of its
+    todolists, tasks, notes and file records, into the archive.
+    """
+    project = get_object_or_404(
+        Project, pk=pk, created_by=request.user, deleting_at__isnull=True
+    )
+    try:
+        archive_project(project)
+        logger.info(f"Project {project.name} archived by {request.user.email}")
+        messages.success(request, FORM_MESSAGES['project_archived'])
+        return redirect(reverse('project:archives'))
+    except Exception as e:
+        logger.error(f"Failed to archive project {project.name} by {request.user.email}: {e}")
+        messages.error(request, 'An error occurred while archiving the project.')
+        return redirect(reverse('project:project_detail', kwargs={'pk': pk}))
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def export(request, pk):
+    """
+    View to download every task of a project owned by the authenticated user
+    as CSV (default) or JSONL (?format=jsonl), streamed as the rows are read.
+    """
+    project = get_object_or_404(Project, pk=pk, created_by=request.user)
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        raise Http404('Unknown export format.')
+
+    # One list at a time, each read in order from the (todolist, rank)
+    # index, rather than sorting the whole project before the first row.
+    querysets = (
+        Task.objects.filter(todolist_id=todolist_id).order_by('rank', 'id')
+        for todolist_id in project.todolists.order_by('name').values_list('pk', flat=True)
+    )
+    return export_response(querysets, fmt, project.name)
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def archives(request):
+    """
+    View to list the authenticated user's archived projects, newest first.
+    Only the summary columns and a description preview are read; the
+    compressed trees are not loaded.
+    """
+    archived_list = with_preview(
+        ArchivedProject.objects.filter(created_by=request.user).defer('payload'), 'description'
+    ).order_by('-archived_at')
+
+    return render(request, 'project/archives.html', {'archives': archived_list})
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def archive_detail(request, pk):
+    """
+    Read-only view of an archived project tree.
+    """
+    archived = get_object_or_404(ArchivedProject, pk=pk, created_by=request.user)
+    document = load_archive(archived)
+
+    tasks_by_todolist = {}
+    for task in document['tasks']:
+        tasks_by_todolist.setdefault(task['todolist_id'], []).append(task)
+    todolists = [
+        {**todolist, 'tasks': tasks_by_todolist.get(todolist['id'], [])}
+        for todolist in document['todolists']
+    ]
+
+    context = {
+        'archived': archived,
+        'todolists': todolists,
+        'notes': document['notes'],
+        'files': document['files'],
+    }
+    return render(request, 'project/archive_detail.html', context)
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["POST"])
+def restore(request):
+    """
+    View to restore one or more archived projects (the `archives` POST
+    values) back into the live tables.
+    """
+    archived_list = ArchivedProject.objects.filter(
+        created_by=request.user, pk__in=request.POST.getlist('archives')
+    )
+    try:
+        restored, failed = restore_projects(archived_list)
+    except ValidationError:
+        messages.error(request, 'Invalid archive selection.')
+        return redirect(reverse('project:archives'))
+
+    if restored:
+        logger.info(f"{len(restored)} projects restored by {request.user.email}")
+        messages.success(request, FORM_MESSAGES['projects_restored'])
+    for archived in failed:
+        logger.warning(f"Failed to restore archived project {archived.pk} for {request.user.email}")
+        messages.error(
+            request, f'Could not restore "{archived.name}": a project with that name already exists.'
+        )
+    return redirect(reverse('project:projects' if restored else 'project:archives'))
+
+
 # Files
 
 @login_required(login_url='/login/')
@@ -180,7 +519,7 @@ def upload_file(request, project_id):
     """
     project = get_object_or_404(
         Project.objects.select_related('created_by'),
-        pk=project_id
+        pk=project_id, deleting_at__isnull=True
     )
 
     if request.method == 'POST':
@@ -189,6 +528,7 @@ def upload_file(request, project_id):
             projectfile = form.save(commit=False)
             projectfile.project = project
             projectfile.save()
+            audit.record(request.user, 'create', 'file', projectfile.pk, project.pk)
             messages.success(request, FORM_MESSAGES['upload_file'])
             return redirect(f'/projects/{project_id}/')
         else:
@@ -220,6 +560,7 @@ def delete_file(request, project_id, pk):
     try:
         with transaction.atomic():
             projectfile.delete()
+        audit.record(request.user, 'delete', 'file', pk, project.pk)
         logger.info(f"User {request.user} deleted file from project {project_id}")
         messages.success(request, FORM_MESSAGES['delete_file'])
         return redirect(f'/projects/{project_id}/')
@@ -231,6 +572,155 @@ def delete_file(request, project_id, pk):
 
 
 
+def _tus_response(status=204, headers=None):
+    response = HttpResponse(status=status)
+    response['Tus-Resumable'] = uploads.TUS_VERSION
+    for header, value in (headers or {}).items():
+        response[header] = value
+    return response
+
+
+def _tus_error(error):
+    response = HttpResponse(str(error), status=error.status, reason=error.reason, content_type='text/plain')
+    response['Tus-Resumable'] = uploads.TUS_VERSION
+    return response
+
+
+def _tus_version_mismatch(request):
+    if request.headers.get('Tus-Resumable') == uploads.TUS_VERSION:
+        return None
+    return _tus_response(412, {'Tus-Version': uploads.TUS_VERSION})
+
+
+def _upload_expires(upload):
+    return http_date(uploads.expires_at(upload).timestamp())
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["OPTIONS", "POST"])
+def create_upload(request, project_id):
+    """
+    Start a resumable upload of a file to a project (tus creation).
+    POST: Upload-Length and Upload-Metadata (`name` and `filename`) create
+    the upload; answers 201 with its URL in Location and the largest chunk
+    a PATCH may carry in Upload-Max-Chunk-Size.
+    OPTIONS: Describes the supported protocol version, extensions and limits.
+    """
+    project = get_object_or_404(Project, pk=project_id, created_by=request.user, deleting_at__isnull=True)
+
+    if request.method == 'OPTIONS':
+        return _tus_response(204, {
+            'Tus-Version': uploads.TUS_VERSION,
+            'Tus-Extension': ','.join(uploads.TUS_EXTENSIONS),
+            'Tus-Max-Size': str(uploads.MAX_UPLOAD_SIZE),
+            'Upload-Max-Chunk-Size': str(uploads.MAX_CHUNK_SIZE),
+            'Tus-Checksum-Algorithm': ','.join(uploads.CHECKSUM_ALGORITHMS),
+        })
+
+    mismatch = _tus_version_mismatch(request)
+    if mismatch:
+        return mismatch
+    try:
+        length = request.headers.get('Upload-Length', '')
+        if not length.isdigit():
+            raise uploads.UploadError('Upload-Length must be a whole number of bytes.')
+        metadata = uploads.parse_metadata(request.headers.get('Upload-Metadata'))
+        upload = uploads.start_upload(
+            project, request.user, metadata.get('name'), metadata.get('filename'), int(length)
+        )
+    except uploads.UploadError as e:
+        logger.warning(f"Failed upload creation for project {project_id}: {str(e)}")
+        return _tus_error(e)
+
+    logger.info(f"User {request.user} started upload {upload.pk} of {upload.length} bytes to project {project_id}")
+    return _tus_response(201, {
+        'Location': reverse('project:file_upload', kwargs={'project_id': project_id, 'pk': upload.pk}),
+        'Upload-Expires': _upload_expires(upload),
+        'Upload-Max-Chunk-Size': str(uploads.MAX_CHUNK_SIZE),
+    })
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["HEAD", "PATCH", "DELETE"])
+def file_upload(request, project_id, pk):
+    """
+    One resumable upload (tus core and termination).
+    HEAD: Reports how many bytes have arrived (Upload-Offset).
+    PATCH: Appends the chunk in the body at Upload-Offset, checking its
+    Upload-Checksum if given; answers 204 with the new offset.
+    DELETE: Abandons the upload and removes what arrived.
+    """
+    upload = get_object_or_404(
+        FileUpload, pk=pk, project_id=project_id, created_by=request.user, project__deleting_at__isnull=True
+    )
+
+    mismatch = _tus_version_mismatch(request)
+    if mismatch:
+        return mismatch
+
+    if request.method == 'HEAD':
+        return _tus_response(200, {
+            'Upload-Offset': str(upload.offset),
+            'Upload-Length': str(upload.length),
+            'Upload-Expires': _upload_expires(upload),
+            'Cache-Control': 'no-store',
+        })
+
+    if request.method == 'DELETE':
+        uploads.discard_uploads(FileUpload.objects.filter(pk=upload.pk))
+        logger.info(f"User {request.user} abandoned upload {pk} to project {project_id}")
+        return _tus_response(204)
+
+    if request.content_type != 'application/offset+octet-stream':
+        return _tus_response(415)
+    try:
+        offset = request.headers.get('Upload-Offset', '')
+        if not offset.isdigit():
+            raise uploads.UploadError('Upload-Offset must be a whole number of bytes.')
+        if int(request.headers.get('Content-Length') or 0) > uploads.MAX_CHUNK_SIZE:
+            raise uploads.UploadTooLarge(f'Chunks cannot exceed {uploads.MAX_CHUNK_SIZE} bytes.')
+        checksum = uploads.parse_checksum(request.headers.get('Upload-Checksum'))
+        # The request itself is the stream: the chunk goes to the file as it arrives.
+        uploads.append_chunk(upload, int(offset), request, checksum)
+    except uploads.UploadError as e:
+        logger.warning(f"Rejected chunk for upload {pk} to project {project_id}: {str(e)}")
+        return _tus_error(e)
+    except FileNotFoundError:
+        # Abandoned or expired while the chunk was on its way.
+        raise Http404('No upload matches the given query.')
+
+    return _tus_response(204, {'Upload-Offset': str(upload.offset), 'Upload-Expires': _upload_expires(upload)})
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["POST"])
+def finish_uploads(request, project_id):
+    """
+    Turn complete uploads into project files, all in one step, from a JSON
+    POST of {"uploads": [upload ids]}. Answers 201 with the new files.
+    """
+    project = get_object_or_404(Project, pk=project_id, created_by=request.user, deleting_at__isnull=True)
+
+    try:
+        upload_ids = [uuid.UUID(str(upload_id)) for upload_id in json.loads(request.body)['uploads']]
+    except (ValueError, KeyError, TypeError):
+        upload_ids = []
+    if not upload_ids:
+        return JsonResponse({'errors': {'uploads': ['Expected a list of upload ids.']}}, status=400)
+
+    try:
+        files = uploads.finish_uploads(project, request.user, upload_ids)
+    except FileUpload.DoesNotExist as e:
+        return JsonResponse({'errors': {'uploads': [str(e)]}}, status=404)
+    except uploads.UploadError as e:
+        return JsonResponse({'errors': {'uploads': [str(e)]}}, status=e.status)
+
+    audit.record_many(request.user, 'create', 'file', [f.pk for f in files], project.pk)
+    logger.info(f"User {request.user} added {len(files)} uploaded files to project {project_id}")
+    messages.success(request, FORM_MESSAGES['upload_file'])
+    return JsonResponse({'files': [{'id': str(f.pk), 'name': f.name, 'size': f.size} for f in files]}, status=201)
+
+
 # Notes
 
 @login_required(login_url='/login/')
@@ -241,7 +731,7 @@ def add_note(request, project_id):
     """
     project = get_object_or_404(
         Project, pk=project_id,
-        created_by=request.user
+        created_by=request.user, deleting_at__isnull=True
     )
 
     if request.method == 'POST':
@@ -250,7 +740,11 @@ def add_note(request, project_id):
             try:
                 note = form.save(commit=False)
                 note.project = project
+                # History starts at the first edit (see revisions.record_revision).
                 note.save()
+                audit.record(request.user, 'create', 'note', note.pk, project.pk)
+                # Render now so the note page never does.
+                rendering.warm(note.body)
                 messages.success(request, FORM_MESSAGES['note_created'])
                 return redirect(f'/projects/{project_id}/')
             except IntegrityError:
@@ -296,18 +790,36 @@ def note_edit(request, project_id, pk):
 
     project = get_object_or_404(
         Project, pk=project_id,
-        created_by=request.user
+        created_by=request.user, deleting_at__isnull=True
     )
     note = get_object_or_404(project.notes, pk=pk)
 
     if request.method == 'POST':
+        previous, version = note.body, note.version
+        if request.POST.get('version', '').isdigit():
+            version = int(request.POST['version'])
         form = ProjectNoteForm(request.POST, instance=note)
         if form.is_valid():
             try:
-                form.save()
-                logger.info(f"User {request.user} updated note pk={pk} for project {project_id}")
-                messages.success(request, FORM_MESSAGES['note_updated'])
-                return redirect(f'/projects/{project_id}/')
+                with transaction.atomic():
+                    # Claim the next version first: an autosave or another
+                    # editor that got there since this form loaded wins.
+                    claimed = ProjectNote.objects.filter(pk=note.pk, version=version) \
+                                                 .update(version=F('version') + 1)
+                    if claimed:
+                        note.version = version + 1
+                        form.save()
+                        revisions.record_revision(note, request.user, previous=previous)
+                if claimed:
+                    audit.record(request.user, 'update', 'note', note.pk, project.pk, {'fields': form.changed_data})
+                    rendering.warm(note.body)
+                    logger.info(f"User {request.user} updated note pk={pk} for project {project_id}")
+                    messages.success(request, FORM_MESSAGES['note_updated'])
+                    return redirect(f'/projects/{project_id}/')
+                # Keep the user's text on the page; saving it again from the
+                # current version replaces the other edit knowingly.
+                note.version = ProjectNote.objects.values_list('version', flat=True).get(pk=note.pk)
+                messages.error(request, FORM_MESSAGES['note_conflict'])
             except IntegrityError:
                 logger.error(f"Integrity error updating note pk={pk} for project_id={project_id}")
                 messages.error(request, form.errors.as_text())
@@ -320,6 +832,101 @@ def note_edit(request, project_id, pk):
     return render(request, 'project/note_edit.html', {'project': project, 'note': note, 'form': form})
 
 
+@login_required(login_url='/login/')
+@require_http_methods(["PATCH"])
+def note_autosave(request, project_id, pk):
+    """
+    Save a note being edited from a JSON PATCH of {version, body[, name]},
+    sent by the edit page a moment after the user stops typing.
+
+    The write is one conditional UPDATE that also checks ownership and
+    that the note is still at `version`. The answer is just the new
+    version, or 409 with the current one if someone else saved in
+    between, so nothing is overwritten unseen. The note's history and the
+    audit log take an autosave at most every AUTOSAVE_REVISION_INTERVAL.
+    """
+    try:
+        form = NoteAutosaveForm(json.loads(request.body))
+    except ValueError:
+        return JsonResponse({'errors': {'__all__': ['Expected a JSON object.']}}, status=400)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    version, body = form.cleaned_data['version'], form.cleaned_data['body']
+    changes = {'body': body, 'version': F('version') + 1}
+    if form.cleaned_data['name']:
+        changes['name'] = form.cleaned_data['name']
+    notes = ProjectNote.objects.filter(
+        pk=pk, project_id=project_id, project__created_by=request.user, project__deleting_at__isnull=True
+    )
+
+    try:
+        with transaction.atomic():
+            last_saved = NoteRevision.objects.filter(note_id=pk).order_by('-number') \
+                                             .values_list('created_at', flat=True).first()
+            # The first save of a note keeps its original body as revision 1.
+            previous = notes.values_list('body', flat=True).first() if last_saved is None else None
+            if not notes.filter(version=version).update(**changes):
+                current = notes.values_list('version', flat=True).first()
+                if current is None:
+                    raise Http404('No note matches the given query.')
+                return JsonResponse({'version': current, 'errors': {'__all__': [FORM_MESSAGES['note_conflict']]}}, status=409)
+
+            fragments.invalidate_project(project_id)
+            if last_saved is None or timezone.now() - last_saved >= AUTOSAVE_REVISION_INTERVAL:
+                note = ProjectNote(pk=pk, project_id=project_id, body=body)
+                revisions.record_revision(note, request.user, previous=previous)
+                audit.record(request.user, 'update', 'note', pk, project_id, {'fields': ['body'], 'autosave': True})
+    except IntegrityError as e:
+        # Lost a race for the next revision number to a concurrent save.
+        logger.error(f"Error autosaving note pk={pk} for project_id={project_id}: {str(e)}")
+        return JsonResponse({'errors': {'__all__': [FORM_MESSAGES['note_conflict']]}}, status=409)
+
+    rendering.warm(body)
+    return JsonResponse({'version': version + 1})
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def note_history(request, project_id, pk):
+    """
+    List the saved revisions of a note owned by the authenticated user.
+    """
+    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
+    note = get_object_or_404(project.notes.only('id', 'name', 'project_id'), pk=pk)
+
+    return render(request, 'project/note_history.html', {
+        'project': project,
+        'note': note,
+        'revisions': revisions.history(note),
+    })
+
+
+@login_required(login_url='/login/')
+@require_http_methods(["GET"])
+def note_revision(request, project_id, pk, number):
+    """
+    Show one revision of a note and what changed from the revision before.
+    The body is rebuilt from the nearest snapshot (see project.revisions).
+    """
+    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
+    note = get_object_or_404(project.notes.only('id', 'name', 'project_id'), pk=pk)
+
+    try:
+        body = revisions.body_at(note, number)
+        diff = revisions.diff(note, number)
+    except NoteRevision.DoesNotExist:
+        raise Http404('No revision matches the given query.')
+
+    return render(request, 'project/note_revision.html', {
+        'project': project,
+        'note': note,
+        'number': number,
+        'body': body,
+        'diff': diff,
+    })
+
+
 @login_required(login_url='/login/')
 def note_delete(request, project_id, pk):
     """
@@ -333,6 +940,7 @@ def note_delete(request, project_id, pk):
 
     try:
         note.delete()
+        audit.record(request.user, 'delete', 'note', pk, project.pk)
         messages.success(request, FORM_MESSAGES['note_deleted'])
     except IntegrityError:
         logger.error(f"IntegrityError deleting note pk={pk} for project_id={project_id}")
@@ -0,0 +1,270 @@
+"""
+Full-text search over a user's projects, to-do lists, tasks and notes.
+
+On SQLite the searchable text lives in one FTS5 table, `search_index`,
+kept in sync by triggers on the four source tables. Triggers (rather than
+signals) also see bulk_create(), insert_rows(), queryset update()s and the
+set-based deletes used by archiving and purging.
+
+Index rowids are partitioned by owner: the owning user's rowid in the
+high bits (above OWNER_SHIFT), then the source row's rowid times
+len(SEARCH_KINDS) plus its kind. Scoping a query to one user is then a
+rowid range, which FTS5 seeks to directly, and trigger updates and
+deletes are rowid lookups. VACUUM may renumber those rowids: run
+`manage.py rebuild_search_index` after one.
+
+Other databases fall back to a case-insensitive name match.
+"""
+import re
+import uuid
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from project.models import Project, ProjectNote
+from task.models import Task
+from todolist.models import Todolist
+
+
+User = get_user_model()
+
+SEARCH_TABLE = 'search_index'
+SEARCH_LIMIT = 50
+RANK_WINDOW = 1000
+OWNER_SHIFT = 40
+MIN_PREFIX_LENGTH = 2
+SEARCH_MAX_TERMS = 8
+SNIPPET_TOKENS = 16
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# kind -> (model, body field, parent field). The kind is stored in the
+# index, so never renumber these.
+SEARCH_KINDS = {
+    0: (Project, 'description', None),
+    1: (Todolist, 'description', None),
+    2: (Task, 'description', 'todolist'),
+    3: (ProjectNote, 'body', None),
+}
+KIND_LABELS = {0: 'Project', 1: 'To-do list', 2: 'Task', 3: 'Note'}
+
+# Control characters never occur in stored text, so they can mark matches
+# until the text has been escaped.
+_MARK_START, _MARK_END = '\x02', '\x03'
+_TERM = re.compile(r'\w+')
+
+
+@dataclass
+class SearchResult:
+    kind: int
+    object_id: uuid.UUID
+    project_id: uuid.UUID
+    parent_id: uuid.UUID
+    title: str
+    snippet: str
+
+    @property
+    def label(self):
+        return KIND_LABELS[self.kind]
+
+    @property
+    def url(self):
+        if self.kind == 0:
+            return reverse('project:project_detail', kwargs={'pk': self.object_id})
+        if self.kind == 1:
+            return reverse('todolist:todolist', kwargs={'project_id': self.project_id, 'pk': self.object_id})
+        if self.kind == 2:
+            return reverse('task:detail', kwargs={
+                'project_id': self.project_id, 'todolist_id': self.parent_id, 'pk': self.object_id
+            })
+        return reverse('project:note_detail', kwargs={'project_id': self.project_id, 'pk': self.object_id})
+
+
+class SearchResults(list):
+    """
+    SearchResults, best first. `windowed` is True when the query matched
+    at least RANK_WINDOW rows, so only the newest RANK_WINDOW of them were
+    ranked and an older, better match may be missing.
+    """
+    windowed = False
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+def _source(kind, row):
+    """SQL expressions for the index columns of a source `row` ('new'/'old')."""
+    model, body, parent = SEARCH_KINDS[kind]
+    opts = model._meta
+    users = _qn(User._meta.db_table)
+    if model is Project:
+        project = f'{row}.{_qn(opts.pk.column)}'
+        owner = f'(SELECT rowid FROM {users} WHERE {_qn(User._meta.pk.column)} = ' \
+                f'{row}.{_qn(opts.get_field("created_by").column)})'
+    else:
+        project = f'{row}.{_qn(opts.get_field("project").column)}'
+        owner = '(SELECT {users}.rowid FROM {projects} JOIN {users} ON {users}.{user_pk} = {projects}.{owner} ' \
+                'WHERE {projects}.{pk} = {project})'.format(
+                    users=users,
+                    user_pk=_qn(User._meta.pk.column),
+                    projects=_qn(Project._meta.db_table),
+                    owner=_qn(Project._meta.get_field('created_by').column),
+                    pk=_qn(Project._meta.pk.column),
+                    project=project,
+                )
+    return {
+        'rowid': f'({owner} << {OWNER_SHIFT}) + {row}.rowid * {len(SEARCH_KINDS)} + {kind}',
+        'kind': str(kind),
+        'object_id': f'{row}.{_qn(opts.pk.column)}',
+        'project_id': project,
+        'parent_id': f'{row}.{_qn(opts.get_field(parent).column)}' if parent else 'NULL',
+        'title': f'{row}.{_qn(opts.get_field("name").column)}',
+        'body': f'{row}.{_qn(opts.get_field(body).column)}',
+    }
+
+
+def _trigger_sql(kind):
+    model, body, parent = SEARCH_KINDS[kind]
+    table = model._meta.db_table
+    new = _source(kind, 'new')
+    watched = ['name', body] + ([parent] if parent else [])
+    columns = ', '.join(new)
+    return [
+        f'CREATE TRIGGER {_qn(f"{SEARCH_TABLE}_{table}_ai")} AFTER INSERT ON {_qn(table)} BEGIN '
+        f'INSERT INTO {SEARCH_TABLE} ({columns}) VALUES ({", ".join(new.values())}); END',
+
+        f'CREATE TRIGGER {_qn(f"{SEARCH_TABLE}_{table}_ad")} AFTER DELETE ON {_qn(table)} BEGIN '
+        f'DELETE FROM {SEARCH_TABLE} WHERE rowid = {_source(kind, "old")["rowid"]}; END',
+
+        f'CREATE TRIGGER {_qn(f"{SEARCH_TABLE}_{table}_au")} AFTER UPDATE OF '
+        f'{", ".join(_qn(model._meta.get_field(name).column) for name in watched)} ON {_qn(table)} BEGIN '
+        f'UPDATE {SEARCH_TABLE} SET title = {new["title"]}, body = {new["body"]}, '
+        f'parent_id = {new["parent_id"]} WHERE rowid = {new["rowid"]}; END',
+    ]
+
+
+def create_index(schema_editor):
+    """Create the FTS5 table and its triggers, and index what exists."""
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+        'kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, parent_id UNINDEXED, '
+        "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    for kind in SEARCH_KINDS:
+        for sql in _trigger_sql(kind):
+            schema_editor.execute(sql)
+    populate_index(schema_editor.connection)
+
+
+def drop_index(schema_editor):
+    for model, _, _ in SEARCH_KINDS.values():
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {_qn(f"{SEARCH_TABLE}_{model._meta.db_table}_{suffix}")}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def populate_index(connection):
+    """(Re)fill the index from the source tables. Returns the rows indexed."""
+    indexed = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        for kind, (model, _, _) in SEARCH_KINDS.items():
+            row = _source(kind, 'new')
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} ({", ".join(row)}) '
+                f'SELECT {", ".join(row.values())} FROM {_qn(model._meta.db_table)} AS new'
+            )
+            indexed += cursor.rowcount
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return indexed
+
+
+def match_expression(query):
+    """
+    Turn free text into a safe FTS5 expression: every word must match, and
+    the last one is a prefix unless the query ends with a space.
+    """
+    terms = _TERM.findall(query)[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    phrases = [f'"{term}"' for term in terms]
+    if not query[-1:].isspace() and len(terms[-1]) >= MIN_PREFIX_LENGTH:
+        phrases[-1] += '*'
+    return ' '.join(phrases)
+
+
+def _marked(text):
+    if not text:
+        return ''
+    return mark_safe(
+        escape(text).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+    )
+
+
+def _uuid(value):
+    return uuid.UUID(value) if value else None
+
+
+def search(user, query, limit=SEARCH_LIMIT):
+    """
+    Return up to `limit` SearchResults for `query` among `user`'s own
+    projects and everything in them, best bm25 match first among the
+    newest RANK_WINDOW matches (see SearchResults.windowed).
+    """
+    expression = match_expression(query)
+    if expression is None:
+        return SearchResults()
+    if connection.vendor != 'sqlite':
+        return _search_names(user, query, limit)
+
+    # The user's rows are one rowid range. FTS5 walks matches lazily in
+    # rowid order, newest first with DESC; only the newest RANK_WINDOW
+    # matches are scored and sorted, so a word found in most of a user's
+    # rows does not score all of them.
+    owner = f'SELECT rowid FROM {_qn(User._meta.db_table)} WHERE {_qn(User._meta.pk.column)} = %s'
+    sql = (
+        f'SELECT kind, object_id, project_id, parent_id, title, snippet, count(*) OVER () FROM ('
+        f'SELECT kind, object_id, project_id, parent_id, '
+        f'bm25({SEARCH_TABLE}, 0, 0, 0, 0, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score, '
+        f'highlight({SEARCH_TABLE}, 4, %s, %s) AS title, '
+        f"snippet({SEARCH_TABLE}, 5, %s, %s, '…', {SNIPPET_TOKENS}) AS snippet "
+        f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+        f'AND rowid BETWEEN ({owner}) << {OWNER_SHIFT} AND (({owner}) + 1 << {OWNER_SHIFT}) - 1 '
+        f'ORDER BY rowid DESC LIMIT %s'
+        f') ORDER BY score LIMIT %s'
+    )
+    user_id = User._meta.pk.get_db_prep_value(user.pk, connection)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [
+            _MARK_START, _MARK_END, _MARK_START, _MARK_END, expression, user_id, user_id, RANK_WINDOW, limit,
+        ])
+        rows = cursor.fetchall()
+    results = SearchResults(
+        SearchResult(kind, _uuid(object_id), _uuid(project_id), _uuid(parent_id), _marked(title), _marked(snippet))
+        for kind, object_id, project_id, parent_id, title, snippet, _ in rows
+    )
+    # Matches counted before the outer LIMIT: the window was full.
+    results.windowed = bool(rows) and rows[0][-1] >= RANK_WINDOW
+    return results
+
+
+def _search_names(user, query, limit):
+    results = SearchResults()
+    for kind, (model, _, parent) in SEARCH_KINDS.items():
+        owner = 'created_by' if model is Project else 'project__created_by'
+        project = 'pk' if model is Project else 'project_id'
+        parent_id = f'{parent}_id' if parent else project
+        rows = model.objects.filter(**{owner: user, 'name__icontains': query.strip()}) \
+                            .values_list('pk', project, parent_id, 'name')[:limit - len(results)]
+        results.extend(
+            SearchResult(kind, pk, project_id, parent_pk if parent else None, escape(name), '')
+            for pk, project_id, parent_pk, name in rows
+        )
+        if len(results) >= limit:
+            break
+    return results
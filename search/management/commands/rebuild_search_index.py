@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from search.fts import populate_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the full-text search index from the source tables. '
+        'Run it after a VACUUM, which can renumber the rowids the index is keyed by.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The search index only exists on SQLite.')
+        with transaction.atomic():
+            indexed = populate_index(connection)
+        self.stdout.write(f"rows indexed: {indexed}")
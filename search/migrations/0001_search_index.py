@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+# The schema as it was when this migration was written, frozen here rather
+# than built by search.fts, so later changes to fts.py never alter what
+# this migration creates. SQLite only: other databases have no index.
+CREATE_INDEX = [
+    "CREATE VIRTUAL TABLE search_index USING fts5(kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, parent_id UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    'CREATE TRIGGER "search_index_project_project_ai" AFTER INSERT ON "project_project" BEGIN INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) VALUES (((SELECT rowid FROM "account_user" WHERE "id" = new."created_by_id") << 40) + new.rowid * 4 + 0, 0, new."id", new."id", NULL, new."name", new."description"); END',
+    'CREATE TRIGGER "search_index_project_project_ad" AFTER DELETE ON "project_project" BEGIN DELETE FROM search_index WHERE rowid = ((SELECT rowid FROM "account_user" WHERE "id" = old."created_by_id") << 40) + old.rowid * 4 + 0; END',
+    'CREATE TRIGGER "search_index_project_project_au" AFTER UPDATE OF "name", "description" ON "project_project" BEGIN UPDATE search_index SET title = new."name", body = new."description", parent_id = NULL WHERE rowid = ((SELECT rowid FROM "account_user" WHERE "id" = new."created_by_id") << 40) + new.rowid * 4 + 0; END',
+    'CREATE TRIGGER "search_index_todolist_todolist_ai" AFTER INSERT ON "todolist_todolist" BEGIN INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) VALUES (((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 1, 1, new."id", new."project_id", NULL, new."name", new."description"); END',
+    'CREATE TRIGGER "search_index_todolist_todolist_ad" AFTER DELETE ON "todolist_todolist" BEGIN DELETE FROM search_index WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = old."project_id") << 40) + old.rowid * 4 + 1; END',
+    'CREATE TRIGGER "search_index_todolist_todolist_au" AFTER UPDATE OF "name", "description" ON "todolist_todolist" BEGIN UPDATE search_index SET title = new."name", body = new."description", parent_id = NULL WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 1; END',
+    'CREATE TRIGGER "search_index_task_task_ai" AFTER INSERT ON "task_task" BEGIN INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) VALUES (((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 2, 2, new."id", new."project_id", new."todolist_id", new."name", new."description"); END',
+    'CREATE TRIGGER "search_index_task_task_ad" AFTER DELETE ON "task_task" BEGIN DELETE FROM search_index WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = old."project_id") << 40) + old.rowid * 4 + 2; END',
+    'CREATE TRIGGER "search_index_task_task_au" AFTER UPDATE OF "name", "description", "todolist_id" ON "task_task" BEGIN UPDATE search_index SET title = new."name", body = new."description", parent_id = new."todolist_id" WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 2; END',
+    'CREATE TRIGGER "search_index_project_projectnote_ai" AFTER INSERT ON "project_projectnote" BEGIN INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) VALUES (((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 3, 3, new."id", new."project_id", NULL, new."name", new."body"); END',
+    'CREATE TRIGGER "search_index_project_projectnote_ad" AFTER DELETE ON "project_projectnote" BEGIN DELETE FROM search_index WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = old."project_id") << 40) + old.rowid * 4 + 3; END',
+    'CREATE TRIGGER "search_index_project_projectnote_au" AFTER UPDATE OF "name", "body" ON "project_projectnote" BEGIN UPDATE search_index SET title = new."name", body = new."body", parent_id = NULL WHERE rowid = ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 3; END',
+    'INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) SELECT ((SELECT rowid FROM "account_user" WHERE "id" = new."created_by_id") << 40) + new.rowid * 4 + 0, 0, new."id", new."id", NULL, new."name", new."description" FROM "project_project" AS new',
+    'INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) SELECT ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 1, 1, new."id", new."project_id", NULL, new."name", new."description" FROM "todolist_todolist" AS new',
+    'INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) SELECT ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 2, 2, new."id", new."project_id", new."todolist_id", new."name", new."description" FROM "task_task" AS new',
+    'INSERT INTO search_index (rowid, kind, object_id, project_id, parent_id, title, body) SELECT ((SELECT "account_user".rowid FROM "project_project" JOIN "account_user" ON "account_user"."id" = "project_project"."created_by_id" WHERE "project_project"."id" = new."project_id") << 40) + new.rowid * 4 + 3, 3, new."id", new."project_id", NULL, new."name", new."body" FROM "project_projectnote" AS new',
+    "INSERT INTO search_index (search_index) VALUES ('optimize')",
+]
+
+DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS "search_index_project_project_ai"',
+    'DROP TRIGGER IF EXISTS "search_index_project_project_ad"',
+    'DROP TRIGGER IF EXISTS "search_index_project_project_au"',
+    'DROP TRIGGER IF EXISTS "search_index_todolist_todolist_ai"',
+    'DROP TRIGGER IF EXISTS "search_index_todolist_todolist_ad"',
+    'DROP TRIGGER IF EXISTS "search_index_todolist_todolist_au"',
+    'DROP TRIGGER IF EXISTS "search_index_task_task_ai"',
+    'DROP TRIGGER IF EXISTS "search_index_task_task_ad"',
+    'DROP TRIGGER IF EXISTS "search_index_task_task_au"',
+    'DROP TRIGGER IF EXISTS "search_index_project_projectnote_ai"',
+    'DROP TRIGGER IF EXISTS "search_index_project_projectnote_ad"',
+    'DROP TRIGGER IF EXISTS "search_index_project_projectnote_au"',
+    'DROP TABLE IF EXISTS search_index',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('todolist', '0003_scoped_unique_names'),
+        ('task', '0003_task_rank'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE_INDEX), run(DROP_INDEX)),
+    ]
@@ -0,0 +1,149 @@
+import io
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.models import Project, ProjectNote
+from todolist.models import Todolist
+from task.models import Task
+from search.fts import match_expression, search
+
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(
+            name='Garden', description='Plant tomatoes in spring', created_by=self.user
+        )
+        self.todolist = Todolist.objects.create(
+            name='Watering', project=self.project, created_by=self.user
+        )
+        self.task = Task.objects.create(
+            name='Buy hose', description='A long garden hose', project=self.project,
+            todolist=self.todolist, created_by=self.user
+        )
+        self.note = ProjectNote.objects.create(
+            name='Soil', body='Tomatoes like <acid> soil', project=self.project
+        )
+
+    def _titles(self, query, user=None):
+        return [str(result.title) for result in search(user or self.user, query)]
+
+    def test_finds_every_kind(self):
+        """Test normal case: projects, lists, tasks and notes are all indexed"""
+        results = search(self.user, 'garden')
+        self.assertEqual(
+            {(result.label, result.object_id) for result in results},
+            {('Project', self.project.pk), ('Task', self.task.pk)},
+        )
+        self.assertEqual(search(self.user, 'watering')[0].object_id, self.todolist.pk)
+        self.assertEqual(search(self.user, 'soil')[0].url, reverse(
+            'project:note_detail', kwargs={'project_id': self.project.pk, 'pk': self.note.pk}
+        ))
+
+    def test_title_matches_rank_first(self):
+        """Test normal case: bm25 weights a title match above a body match"""
+        self.assertEqual(self._titles('garden')[0], '<mark>Garden</mark>')
+
+    def test_snippets_are_escaped_and_highlighted(self):
+        """Test edge case: stored text is escaped, only the match markers are HTML"""
+        result = search(self.user, 'acid')[0]
+        self.assertIn('&lt;<mark>acid</mark>&gt;', result.snippet)
+
+    def test_prefix_and_diacritics(self):
+        """Test normal case: the last word matches as a prefix, accents are folded"""
+        Task.objects.create(
+            name='Café visit', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        self.assertIn('<mark>Café</mark> visit', self._titles('cafe'))
+        self.assertIn('Buy <mark>hose</mark>', self._titles('ho'))
+        self.assertNotIn('Buy <mark>hose</mark>', self._titles('ho '))
+
+    def test_scoped_to_owner(self):
+        """Test invalid input: other users never see someone else's rows"""
+        other = Project.objects.create(name='Garden shed', created_by=self.other_user)
+        self.assertEqual(self._titles('shed'), [])
+        self.assertEqual(search(self.other_user, 'garden')[0].object_id, other.pk)
+        self.assertEqual(len(search(self.other_user, 'garden')), 1)
+
+    def test_triggers_follow_updates_and_deletes(self):
+        """Test normal case: saves, queryset updates and deletes keep the index in sync"""
+        self.task.name = 'Buy rake'
+        self.task.save()
+        Todolist.objects.filter(pk=self.todolist.pk).update(name='Weeding')
+        self.note.delete()
+
+        self.assertEqual(self._titles('rake'), ['Buy <mark>rake</mark>'])
+        self.assertEqual(self._titles('watering'), [])
+        self.assertEqual(self._titles('weeding'), ['<mark>Weeding</mark>'])
+        self.assertEqual(self._titles('soil'), [])
+
+    def test_bulk_inserts_are_indexed(self):
+        """Test normal case: rows written by bulk_create are indexed too"""
+        Task.objects.bulk_create([
+            Task(name=f'Seed {i}', rank=str(i + 1), project=self.project,
+                 todolist=self.todolist, created_by=self.user)
+            for i in range(3)
+        ])
+        self.assertEqual(len(search(self.user, 'seed')), 3)
+
+    def test_full_rank_window_is_reported(self):
+        """Test edge case: a query filling the rank window says its ranking is partial"""
+        self.assertFalse(search(self.user, 'garden').windowed)
+
+        with patch('search.fts.RANK_WINDOW', 2):
+            results = search(self.user, 'garden')
+            self.assertTrue(results.windowed)
+            self.client.login(email='testuser@example.com', password='testpass123')
+            response = self.client.get(reverse('search:search'), {'q': 'garden'})
+        self.assertContains(response, 'most recently added matches')
+
+    def test_query_syntax_is_neutralised(self):
+        """Test invalid input: FTS5 operators and punctuation are treated as words"""
+        self.assertIsNone(match_expression('"*:^ -'))
+        self.assertEqual(match_expression('title: NEAR(xy'), '"title" "NEAR" "xy"*')
+        self.assertEqual(match_expression('a b'), '"a" "b"')
+        self.assertEqual(search(self.user, 'garden OR "'), search(self.user, 'garden or'))
+        self.assertEqual(search(self.user, '()'), [])
+
+    def test_rebuild_command(self):
+        """Test normal case: the index can be rebuilt from the source tables"""
+        out = io.StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('rows indexed: 4', out.getvalue())
+        self.assertEqual(len(search(self.user, 'garden')), 2)
+
+    def test_view(self):
+        """Test normal case: the search page and its JSON variant list results"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        url = reverse('search:search')
+
+        response = self.client.get(url, {'q': 'hose'})
+        self.assertTemplateUsed(response, 'search/search.html')
+        self.assertContains(response, 'Buy <mark>hose</mark>', html=False)
+
+        data = self.client.get(url, {'q': 'hose', 'format': 'json'}).json()
+        self.assertEqual(data['results'][0]['id'], str(self.task.pk))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_view_requires_login(self):
+        """Test invalid input: anonymous users are sent to the login page"""
+        response = self.client.get(reverse('search:search'), {'q': 'garden'})
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,44 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_http_methods
+
+from .fts import RANK_WINDOW, SearchResults, search as search_index
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+@login_required(login_url='/login')
+@require_http_methods(["GET"])
+def search(request):
+    """
+    Search the authenticated user's projects, to-do lists, tasks and notes.
+    Results are ranked with bm25 and carry highlighted snippets (see search.fts).
+    A query matching more than RANK_WINDOW rows is ranked among the newest
+    of them only, and the page says so.
+    """
+    # Not stripped: a trailing space means the last word is complete.
+    query = request.GET.get('q', '')[:200]
+    results = search_index(request.user, query) if query.strip() else SearchResults()
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'query': query,
+            'windowed': results.windowed,
+            'results': [
+                {
+                    'kind': result.label,
+                    'id': str(result.object_id),
+                    'url': result.url,
+                    'title': result.title,
+                    'snippet': result.snippet,
+                }
+                for result in results
+            ],
+        })
+
+    return render(request, 'search/search.html', {'query': query, 'results': results, 'rank_window': RANK_WINDOW})
@@ -0,0 +1,220 @@
+"""
+Set-based task updates that skip the load / modify / save() cycle.
+
+Bulk actions are one or two UPDATE/DELETE statements over `id IN (...)`,
+restricted to the todolist (and so to the owner's project) that the
+caller already checked. Counter deltas come from the statements' own row
+counts rather than from a prior SELECT: actions that need to know how
+many of the affected tasks were done run one statement per is_done value.
+
+toggle_task() flips a single task with one conditional UPDATE that also
+performs the ownership check, and move_task() reorders one by rewriting
+only its rank (and its list, for a move to another column of the board).
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from main.background import retry_locked, run_after_commit
+from project import fragments
+from project.models import Project
+from todolist.models import Todolist
+
+from .models import Task
+from .ranking import RANK_MAX_LENGTH, rank_between, spread_ranks
+
+
+logger = logging.getLogger(__name__)
+
+BULK_ACTIONS = ('done', 'undone', 'delete', 'move')
+BULK_MAX_TASKS = 500
+REBALANCE_BATCH_SIZE = 1000
+
+
+def bulk_update_tasks(todolist, action, task_ids, target=None):
+    """
+    Apply `action` to the tasks of `todolist` whose ids are in `task_ids`
+    and return how many tasks changed. Ids that are not in the todolist
+    are ignored. `target` is the todolist to move tasks into, for 'move'.
+
+    Raises IntegrityError for a move that would duplicate a task name in
+    the target todolist.
+    """
+    tasks = Task.objects.filter(todolist=todolist, project_id=todolist.project_id, pk__in=task_ids)
+
+    with transaction.atomic():
+        if action in ('done', 'undone'):
+            is_done = action == 'done'
+            changed = tasks.filter(is_done=not is_done).update(is_done=is_done)
+            delta = changed if is_done else -changed
+            Todolist.objects.filter(pk=todolist.pk).adjust(completed_task_count=delta)
+            Project.objects.filter(pk=todolist.project_id).adjust(completed_task_count=delta)
+
+        elif action == 'delete':
+            completed, _ = tasks.filter(is_done=True).delete()
+            changed = completed + tasks.delete()[0]
+            deltas = {'task_count': -changed, 'completed_task_count': -completed}
+            Todolist.objects.filter(pk=todolist.pk).adjust(**deltas)
+            Project.objects.filter(pk=todolist.project_id).adjust(**deltas)
+
+        elif action == 'move':
+            if target.project_id != todolist.project_id:
+                raise ValueError('Tasks can only be moved within their project.')
+            if target.pk == todolist.pk:
+                return 0
+            completed = tasks.filter(is_done=True).update(todolist=target)
+            changed = completed + tasks.update(todolist=target)
+            # The project's totals are unchanged by a move.
+            Todolist.objects.filter(pk=todolist.pk).adjust(
+                task_count=-changed, completed_task_count=-completed
+            )
+            Todolist.objects.filter(pk=target.pk).adjust(
+                task_count=changed, completed_task_count=completed
+            )
+
+        else:
+            raise ValueError(f'Unknown bulk action: {action!r}')
+
+        if changed:
+            fragments.invalidate_project(todolist.project_id)
+
+    return changed
+
+
+def _supports_update_returning(connection):
+    if connection.vendor == 'postgresql':
+        return True
+    return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+
+
+def _flip_returning(connection, user, project_id, todolist_id, task_id):
+    qn = connection.ops.quote_name
+    prep = Task._meta.pk.get_db_prep_value
+    sql = (
+        'UPDATE {task} SET {is_done} = NOT {is_done} '
+        'WHERE {id} = %s AND {todolist} = %s AND {project} = %s '
+        'AND EXISTS (SELECT 1 FROM {projects} WHERE {projects}.{id} = %s AND {projects}.{owner} = %s '
+        'AND {projects}.{deleting_at} IS NULL) '
+        'RETURNING {is_done}'
+    ).format(
+        task=qn(Task._meta.db_table),
+        projects=qn(Project._meta.db_table),
+        is_done=qn('is_done'),
+        id=qn('id'),
+        todolist=qn('todolist_id'),
+        project=qn('project_id'),
+        owner=qn('created_by_id'),
+        deleting_at=qn('deleting_at'),
+    )
+    params = [prep(value, connection) for value in (task_id, todolist_id, project_id, project_id, user.pk)]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return None if row is None else bool(row[0])
+
+
+def _flip_orm(user, project_id, todolist_id, task_id):
+    task = Task.objects.filter(
+        pk=task_id, todolist_id=todolist_id, project_id=project_id, project__created_by=user,
+        project__deleting_at__isnull=True,
+    )
+    if not task.update(is_done=Case(When(is_done=True, then=Value(False)), default=Value(True))):
+        return None
+    # The UPDATE holds the row lock until commit, so this reads our own write.
+    return task.values_list('is_done', flat=True).get()
+
+
+def toggle_task(user, project_id, todolist_id, task_id):
+    """
+    Flip is_done on a task owned (through its project) by `user` and move
+    the completed counters with it. Returns the new is_done, or None if no
+    such task exists for that user, or its project is being deleted.
+
+    The flip is a single `UPDATE ... SET is_done = NOT is_done ... RETURNING`
+    joined to the ownership check, so concurrent toggles never read a stale
+    value, and nothing is loaded beforehand. Databases without UPDATE ...
+    RETURNING fall back to the same UPDATE followed by a read.
+    """
+    with transaction.atomic():
+        connection = transaction.get_connection()
+        if _supports_update_returning(connection):
+            is_done = _flip_returning(connection, user, project_id, todolist_id, task_id)
+        else:
+            is_done = _flip_orm(user, project_id, todolist_id, task_id)
+        if is_done is None:
+            return None
+
+        delta = 1 if is_done else -1
+        Todolist.objects.filter(pk=todolist_id).adjust(completed_task_count=delta)
+        Project.objects.filter(pk=project_id).adjust(completed_task_count=delta)
+        fragments.invalidate_project(project_id)
+
+    return is_done
+
+
+def _neighbour_ranks(todolist, after_id, before_id):
+    ids = [pk for pk in (after_id, before_id) if pk]
+    ranks = dict(
+        Task.objects.filter(todolist=todolist, pk__in=ids).values_list('pk', 'rank')
+    ) if ids else {}
+    return ranks.get(after_id), ranks.get(before_id)
+
+
+def move_task(todolist, task_id, after_id=None, before_id=None, target=None):
+    """
+    Place a task of `todolist` between the tasks `after_id` (the one it now
+    follows) and `before_id` (the one it now precedes) of `target`, the
+    todolist itself unless given; leave either neighbour out for the start
+    or the end of the list. Returns the new rank, or None if the task is not
+    in the todolist.
+
+    Within a list only the rank is written. A move to another list of the
+    project rewrites the task's list and rank in the same UPDATE, one per
+    is_done value so the counters know what moved.
+
+    Raises ValueError if the neighbours are not in that order or `target`
+    is in another project, and IntegrityError if `target` already has a
+    task with the same name.
+    """
+    target = target or todolist
+    if target.project_id != todolist.project_id:
+        raise ValueError('Tasks can only be moved within their project.')
+    before, after = _neighbour_ranks(target, after_id, before_id)
+    if before and after and before == after:
+        # The neighbours share a key (e.g. tasks moved in from another
+        # list): spread the list out again first.
+        rebalance_todolist(target.pk)
+        before, after = _neighbour_ranks(target, after_id, before_id)
+
+    rank = rank_between(before, after)
+    task = Task.objects.filter(pk=task_id, todolist=todolist)
+    if target.pk == todolist.pk:
+        if not task.update(rank=rank):
+            return None
+    else:
+        with transaction.atomic():
+            completed = 0
+            if not task.filter(is_done=False).update(todolist=target, rank=rank):
+                completed = task.filter(is_done=True).update(todolist=target, rank=rank)
+                if not completed:
+                    return None
+            # The project's totals are unchanged by a move.
+            Todolist.objects.filter(pk=todolist.pk).adjust(task_count=-1, completed_task_count=-completed)
+            Todolist.objects.filter(pk=target.pk).adjust(task_count=1, completed_task_count=completed)
+            fragments.invalidate_project(todolist.project_id)
+    if len(rank) > RANK_MAX_LENGTH:
+        run_after_commit(retry_locked, rebalance_todolist, target.pk)
+    return rank
+
+
+def rebalance_todolist(todolist_id):
+    """Rewrite the ranks of a todolist's tasks as short, evenly spaced keys."""
+    with transaction.atomic():
+        pks = list(
+            Task.objects.filter(todolist_id=todolist_id).order_by('rank', 'id').values_list('pk', flat=True)
+        )
+        tasks = [Task(pk=pk, rank=rank) for pk, rank in zip(pks, spread_ranks(len(pks)))]
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=REBALANCE_BATCH_SIZE)
+    logger.info(f"Rebalanced {len(pks)} task ranks in todolist {todolist_id}")
+    return len(pks)
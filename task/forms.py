@@ -1,12 +1,32 @@
+import datetime
+import uuid
+
 from django import forms
+from django.utils import timezone
+
+from main.forms import ConstraintErrorsMixin
+
+from .bulk import BULK_ACTIONS, BULK_MAX_TASKS
+from .importing import IMPORT_FORMATS
+from .models import Task, TaskRecurrence
+from .recurrence import CronRule, rule_for
+from .scheduler import MAX_OCCURRENCES_PER_RUN
+
 
-from .models import Task
+TASK_NAME_ERRORS = {
+    'task_todolist_name_uniq': ('name', 'A task with this name already exists.'),
+}
 
 
-class TaskForm(forms.ModelForm):
+class TaskForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = TASK_NAME_ERRORS
+
     class Meta:
         model = Task
-        fields = ['name', 'description']
+        fields = ['name', 'description', 'due_at']
+        widgets = {
+            'due_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+        }
 
     def clean_name(self):
         name = self.cleaned_data['name'].strip()
@@ -14,8 +34,6 @@ class TaskForm(forms.ModelForm):
             raise forms.ValidationError('Name cannot be empty.')
         if len(name) > 100:
             raise forms.ValidationError('Name cannot exceed 100 characters.')
-        if Task.objects.filter(name=name).exists():
-            raise forms.ValidationError('A task with this name already exists.')
         return name
 
     def clean_description(self):
@@ -23,10 +41,15 @@ class TaskForm(forms.ModelForm):
         return description
 
 
-class EditTaskForm(forms.ModelForm):
+class EditTaskForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = TASK_NAME_ERRORS
+
     class Meta:
         model = Task
-        fields = ['name', 'description']
+        fields = ['name', 'description', 'due_at']
+        widgets = {
+            'due_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+        }
 
     def clean_name(self):
         name = self.cleaned_data['name'].strip()
@@ -39,3 +62,100 @@ class EditTaskForm(forms.ModelForm):
     def clean_description(self):
         description = self.cleaned_data['description'].strip()
         return description
+
+
+class MultipleUUIDField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return [uuid.UUID(str(item)) for item in value]
+        except ValueError:
+            raise forms.ValidationError('Invalid task selection.')
+
+
+class TaskBulkForm(forms.Form):
+    action = forms.ChoiceField(choices=[(action, action) for action in BULK_ACTIONS])
+    tasks = MultipleUUIDField()
+    target = forms.UUIDField(required=False)
+
+    def clean_tasks(self):
+        tasks = self.cleaned_data['tasks']
+        if len(tasks) > BULK_MAX_TASKS:
+            raise forms.ValidationError(f'Select at most {BULK_MAX_TASKS} tasks at a time.')
+        return tasks
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('action') == 'move' and not cleaned_data.get('target'):
+            raise forms.ValidationError({'target': 'Choose a to-do list to move the tasks to.'})
+        return cleaned_data
+
+
+class TaskReorderForm(forms.Form):
+    """
+    The reordered task's new neighbours; leave one out for either end. Give
+    `todolist` to move the task into another list of its project.
+    """
+    after = forms.UUIDField(required=False)
+    before = forms.UUIDField(required=False)
+    todolist = forms.UUIDField(required=False)
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(
+        choices=[('', 'From the file name')] + [(fmt, fmt.upper()) for fmt in IMPORT_FORMATS],
+        required=False,
+    )
+
+
+class TaskRecurrenceForm(forms.ModelForm):
+    """
+    A repeat: daily or weekly at the time of `starts_at`, or on a custom
+    cron rule. The rule is computed in clean() and stored on the instance.
+    """
+    starts_at = forms.DateTimeField(
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M')
+    )
+    cron = forms.CharField(
+        required=False, max_length=100, help_text='minute hour day month weekday, e.g. "0 9 * * 1-5"'
+    )
+
+    class Meta:
+        model = TaskRecurrence
+        fields = ['name', 'description', 'frequency', 'ends_at']
+        widgets = {
+            'ends_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+        }
+
+    def clean_name(self):
+        name = self.cleaned_data['name'].strip()
+        if not name:
+            raise forms.ValidationError('Name cannot be empty.')
+        if len(name) > 100:
+            raise forms.ValidationError('Name cannot exceed 100 characters.')
+        return name
+
+    def clean(self):
+        cleaned_data = super().clean()
+        frequency, starts_at = cleaned_data.get('frequency'), cleaned_data.get('starts_at')
+        if not frequency or not starts_at:
+            return cleaned_data
+        if frequency == 'cron' and not cleaned_data.get('cron'):
+            raise forms.ValidationError({'cron': 'Enter a rule for a custom repeat.'})
+        try:
+            rule = rule_for(frequency, starts_at, cleaned_data.get('cron', ''))
+            now = timezone.now()
+            # One more than allowed within a day means it fires too often.
+            fired = CronRule(rule).occurrences(now, now + datetime.timedelta(days=1), MAX_OCCURRENCES_PER_RUN + 1)
+        except ValueError as e:
+            raise forms.ValidationError({'cron': str(e)})
+        if len(fired) > MAX_OCCURRENCES_PER_RUN:
+            raise forms.ValidationError(
+                {'cron': f'A repeat can fire at most {MAX_OCCURRENCES_PER_RUN} times a day.'}
+            )
+        self.instance.rule = rule
+        return cleaned_data
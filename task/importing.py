@@ -0,0 +1,192 @@
+"""
+Streaming task import from CSV or JSONL.
+
+import_tasks() reads the file one row at a time and handles IMPORT_BATCH_SIZE
+rows at once: each batch is validated with the same rules as TaskForm,
+checked for names that already exist with one query, and written with one
+executemany() INSERT (project.bulk.insert_rows) in its own transaction. Only the current batch and up to
+IMPORT_MAX_ERRORS rejected rows are held in memory, whatever the size of
+the file.
+
+Expected columns (CSV header or JSON object keys): `name` (required),
+`description`, `is_done` and `due_at` (optional; ISO 8601, in the site's
+time zone unless it carries an offset). Other columns, such as the `id`
+and `todolist` of an export, are ignored.
+"""
+import csv
+import json
+import uuid
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from project import fragments
+from project.bulk import insert_rows
+from project.models import Project
+from todolist.models import Todolist
+
+from .models import Task
+from .ranking import rank_after
+
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+# Attempts at a batch that keeps losing names to concurrent writers.
+IMPORT_BATCH_ATTEMPTS = 3
+NAME_MAX_LENGTH = 100
+IMPORT_FIELDS = ('id', 'name', 'description', 'is_done', 'due_at', 'rank', 'project', 'todolist', 'created_by')
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x', 'done'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'open'}
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    # (line number, reason) for the first IMPORT_MAX_ERRORS rejected rows.
+    errors: list = field(default_factory=list)
+
+    def reject(self, line, reason):
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append((line, reason))
+
+
+def guess_format(filename):
+    """'jsonl' for .jsonl/.ndjson files, 'csv' for anything else."""
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def _csv_records(lines):
+    reader = csv.DictReader(lines)
+    if 'name' not in (reader.fieldnames or []):
+        raise ValueError("The CSV file needs a header row with a 'name' column.")
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def _jsonl_records(lines):
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Invalid JSON.'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Expected a JSON object.'
+            continue
+        yield line_number, record, None
+
+
+def _clean(record):
+    """Return (name, description, is_done, due_at) for a record, or raise ValueError."""
+    name = str(record.get('name') or '').strip()
+    if not name:
+        raise ValueError('Name cannot be empty.')
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f'Name cannot exceed {NAME_MAX_LENGTH} characters.')
+
+    description = str(record.get('description') or '').strip()
+
+    is_done = record.get('is_done')
+    if not isinstance(is_done, bool):
+        value = str(is_done if is_done is not None else '').strip().lower()
+        if value not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError(f'Invalid is_done value: {is_done!r}.')
+        is_done = value in TRUE_VALUES
+
+    due_at = str(record.get('due_at') or '').strip() or None
+    if due_at is not None:
+        try:
+            parsed = parse_datetime(due_at)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValueError(f'Invalid due_at value: {due_at!r}.')
+        due_at = parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+    return name, description, is_done, due_at
+
+
+def _write_batch(todolist, user, batch, result, rank):
+    """Insert a validated batch and return the rank of its last task."""
+    existing = set(
+        Task.objects.filter(todolist=todolist, name__in={name for _, name, *_ in batch})
+                    .values_list('name', flat=True)
+    )
+    rows, rejects = [], []
+    for line, name, description, is_done, due_at in batch:
+        if name in existing:
+            rejects.append((line, 'A task with this name already exists.'))
+            continue
+        existing.add(name)
+        rank = rank_after(rank)
+        rows.append((
+            uuid.uuid4(), name, description, is_done, due_at, rank, todolist.project_id, todolist.pk, user.pk,
+        ))
+    if rows:
+        # Nothing from the model layer runs, so the counters move here.
+        completed = sum(row[3] for row in rows)
+        with transaction.atomic():
+            insert_rows(Task, IMPORT_FIELDS, rows, batch_size=len(rows))
+            Todolist.objects.filter(pk=todolist.pk).adjust(task_count=len(rows), completed_task_count=completed)
+            Project.objects.filter(pk=todolist.project_id).adjust(task_count=len(rows), completed_task_count=completed)
+            fragments.invalidate_project(todolist.project_id)
+
+    result.imported += len(rows)
+    for line, reason in rejects:
+        result.reject(line, reason)
+    return rank
+
+
+def import_tasks(todolist, user, lines, fmt, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import tasks into `todolist` from `lines`, a text file of format `fmt`
+    ('csv' or 'jsonl'), appending them in file order. Returns an
+    ImportResult; rows that fail validation or duplicate a task name are
+    rejected and reported, the rest are imported.
+
+    Every batch commits on its own, so an import that fails part-way keeps
+    the batches before it. Raises ValueError if the file cannot be read as
+    `fmt` at all, and IntegrityError if a batch still conflicts with
+    concurrent writes after IMPORT_BATCH_ATTEMPTS attempts.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f'Unknown import format: {fmt!r}')
+    records = _csv_records(lines) if fmt == 'csv' else _jsonl_records(lines)
+
+    result = ImportResult()
+    rank = Task.objects.filter(todolist=todolist).order_by('-rank').values_list('rank', flat=True).first()
+    batch = []
+    for line, record, error in records:
+        if error is None:
+            try:
+                batch.append((line, *_clean(record)))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            result.reject(line, error)
+        if len(batch) >= batch_size:
+            rank = _write_batch_retrying(todolist, user, batch, result, rank)
+            batch = []
+    if batch:
+        _write_batch_retrying(todolist, user, batch, result, rank)
+    result.errors.sort()
+    return result
+
+
+def _write_batch_retrying(todolist, user, batch, result, rank):
+    # A task added by someone else between the name check and the insert
+    # fails the whole batch on the unique constraint; checking again
+    # rejects it like any other duplicate.
+    for attempt in range(1, IMPORT_BATCH_ATTEMPTS + 1):
+        try:
+            return _write_batch(todolist, user, batch, result, rank)
+        except IntegrityError:
+            if attempt == IMPORT_BATCH_ATTEMPTS:
+                raise
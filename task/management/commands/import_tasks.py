@@ -0,0 +1,45 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from task.importing import IMPORT_BATCH_SIZE, IMPORT_FORMATS, guess_format, import_tasks
+from todolist.models import Todolist
+
+
+class Command(BaseCommand):
+    help = (
+        'Import tasks into a to-do list from a CSV or JSONL file, streaming it '
+        'in batches. Rejected rows are reported with their line numbers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('todolist', help='Id of the to-do list to import into.')
+        parser.add_argument('path', help='CSV or JSONL file to import.')
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS,
+            help='File format; guessed from the file name by default.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+            help='Rows validated and inserted per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            todolist = Todolist.objects.select_related('project').get(pk=options['todolist'])
+        except (Todolist.DoesNotExist, ValidationError):
+            raise CommandError(f"To-do list {options['todolist']} does not exist.")
+
+        fmt = options['format'] or guess_format(options['path'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as lines:
+                result = import_tasks(
+                    todolist, todolist.project.created_by, lines, fmt, batch_size=options['batch_size']
+                )
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'Import failed: {e}')
+
+        for line, reason in result.errors:
+            self.stderr.write(f"line {line}: {reason}")
+        if result.rejected > len(result.errors):
+            self.stderr.write(f"... and {result.rejected - len(result.errors)} more rejected rows")
+        self.stdout.write(f"tasks imported: {result.imported}, rows rejected: {result.rejected}")
@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from task.scheduler import RECURRENCE_BATCH_SIZE, RECURRENCE_HORIZON, materialize
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the tasks of repeating tasks that fall due within the horizon. '
+        'Run it periodically (e.g. hourly from cron), more often than the horizon.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-hours', type=float, default=RECURRENCE_HORIZON.total_seconds() / 3600,
+            help='Create occurrences due within this many hours.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=RECURRENCE_BATCH_SIZE,
+            help='Repeating tasks handled per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        created = materialize(
+            horizon=datetime.timedelta(hours=options['horizon_hours']), batch_size=options['batch_size']
+        )
+        self.stdout.write(f"tasks created: {created}")
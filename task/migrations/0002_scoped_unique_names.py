@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('task', '0001_initial'),
+        ('todolist', '0003_scoped_unique_names'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('todolist', 'name'), name='task_todolist_name_uniq'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# A frozen copy of task.ranking.spread_ranks() as of this migration, so
+# later changes to the ranking code never change what it writes.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+RANK_WIDTH = 6
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def spread_ranks(count):
+    width = RANK_WIDTH
+    while (BASE ** width // 2) // (count + 1) < 2:
+        width += 1
+    step = (BASE ** width // 2) // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = i * step
+        if value % BASE == 0:
+            value += 1
+        keys.append(_encode(value, width))
+    return keys
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    Todolist = apps.get_model('todolist', 'Todolist')
+
+    # Existing tasks had no order; start them off in id order.
+    for todolist_id in Todolist.objects.values_list('pk', flat=True).iterator():
+        pks = list(Task.objects.filter(todolist_id=todolist_id).order_by('pk').values_list('pk', flat=True))
+        tasks = [Task(pk=pk, rank=rank) for pk, rank in zip(pks, spread_ranks(len(pks)))]
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('task', '0002_scoped_unique_names'),
+        ('todolist', '0003_scoped_unique_names'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['todolist', 'rank'], name='task_todolist_rank_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
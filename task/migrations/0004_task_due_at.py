@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('task', '0003_task_rank'),
+        ('todolist', '0003_scoped_unique_names'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_at__isnull', False), ('is_done', False)), fields=['created_by', 'due_at', 'id'], name='task_open_due_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('task', '0005_taskrecurrence'),
+        ('todolist', '0003_scoped_unique_names'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', False)), fields=['todolist', 'rank', 'id'], name='task_todolist_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', True)), fields=['todolist', 'rank', 'id'], name='task_todolist_done_idx'),
+        ),
+    ]
@@ -1,10 +1,14 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 
 from account.models import User
+from project import fragments
 from project.models import Project
 from todolist.models import Todolist
 
+from .ranking import rank_after
+
 
 class Task(models.Model):
 
@@ -12,11 +16,117 @@ class Task(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     is_done = models.BooleanField(default=False)
+    due_at = models.DateTimeField(blank=True, null=True)
+    # Lexicographic sort key within the todolist (see task.ranking).
+    rank = models.CharField(max_length=255, default='', editable=False)
 
     # Relationship models.
     project = models.ForeignKey(Project, related_name='tasks', on_delete=models.CASCADE)
     todolist = models.ForeignKey(Todolist, related_name='tasks', on_delete=models.CASCADE)
     created_by = models.ForeignKey(User, related_name='tasks', on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['todolist', 'name'], name='task_todolist_name_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['todolist', 'rank'], name='task_todolist_rank_idx'),
+            # The list page's open/done filters: one range scan in rank
+            # order. Partial rather than a leading is_done column, because
+            # is_done=False compiles to NOT is_done, which SQLite can match
+            # against an index condition but not seek with.
+            models.Index(
+                fields=['todolist', 'rank', 'id'], name='task_todolist_open_idx', condition=Q(is_done=False),
+            ),
+            models.Index(
+                fields=['todolist', 'rank', 'id'], name='task_todolist_done_idx', condition=Q(is_done=True),
+            ),
+            # Serves the owner's upcoming/overdue page (created_by is always
+            # the project's owner). Only open tasks with a due date are
+            # indexed, so the page is one range scan however many tasks are
+            # done or undated.
+            models.Index(
+                fields=['created_by', 'due_at', 'id'], name='task_open_due_idx',
+                condition=Q(is_done=False, due_at__isnull=False),
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            if adding and not self.rank:
+                self.rank = rank_after(
+                    Task.objects.filter(todolist_id=self.todolist_id).order_by('-rank')
+                                .values_list('rank', flat=True).first()
+                )
+            super().save(*args, **kwargs)
+            if adding:
+                self.adjust_counters(tasks=1, completed=int(self.is_done))
+            fragments.invalidate_project(self.project_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.adjust_counters(tasks=-1, completed=-int(self.is_done))
+            fragments.invalidate_project(self.project_id)
+        return result
+
+    def set_done(self, is_done):
+        """
+        Persist a new is_done value and move the completed-task counters on
+        the todolist and project with it, all in one transaction.
+        """
+        if is_done == self.is_done:
+            return
+        with transaction.atomic():
+            self.is_done = is_done
+            super().save(update_fields=['is_done'])
+            self.adjust_counters(completed=1 if is_done else -1)
+            fragments.invalidate_project(self.project_id)
+
+    def adjust_counters(self, tasks=0, completed=0):
+        """Apply task deltas to the parent todolist and project counters."""
+        Todolist.objects.filter(pk=self.todolist_id).adjust(
+            task_count=tasks, completed_task_count=completed
+        )
+        Project.objects.filter(pk=self.project_id).adjust(
+            task_count=tasks, completed_task_count=completed
+        )
+
+
+class TaskRecurrence(models.Model):
+    """
+    A repeating task. Occurrences are only created as Task rows shortly
+    before they are due, by task.scheduler; `next_at` is the first one
+    not created yet, or None once the repeat has ended.
+    """
+    FREQUENCIES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('cron', 'Custom'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    frequency = models.CharField(max_length=10, choices=FREQUENCIES, default='daily')
+    # Five-field cron expression (see task.recurrence).
+    rule = models.CharField(max_length=100)
+    next_at = models.DateTimeField(blank=True, null=True)
+    ends_at = models.DateTimeField(blank=True, null=True)
+
+    project = models.ForeignKey(Project, related_name='recurrences', on_delete=models.CASCADE)
+    todolist = models.ForeignKey(Todolist, related_name='recurrences', on_delete=models.CASCADE)
+    created_by = models.ForeignKey(User, related_name='recurrences', on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [
+            # The scheduler's range scan over repeats that are due.
+            models.Index(fields=['next_at'], name='recurrence_next_idx', condition=Q(next_at__isnull=False)),
+        ]
+
     def __str__(self):
         return self.name
@@ -0,0 +1,98 @@
+"""
+Manual task ordering with lexicographic rank keys.
+
+Every task carries a `rank` string and a todolist is read ordered by
+(rank, id) through the (todolist, rank) index. Moving a task computes a
+key that sorts between its new neighbours' keys, so a reorder is a single
+UPDATE of the moved row and nothing else is renumbered.
+
+Keys are base-36 strings (digits then lowercase letters, which sort the
+same under any collation) that never end in '0', so there is always a key
+between two others. Appending increments the last key at a fixed minimum
+width and keeps keys short; repeated inserts into the same gap lengthen
+them, and once a key grows past RANK_MAX_LENGTH the todolist is
+rebalanced in the background (see task.bulk.move_task).
+"""
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+RANK_WIDTH = 6
+RANK_MAX_LENGTH = 32
+
+
+def _digit(key, index):
+    return DIGITS.index(key[index]) if index < len(key) else 0
+
+
+def _midpoint(a, b):
+    """A key strictly between `a` and `b`; `b` is None for "no upper bound"."""
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    low = _digit(a, 0)
+    high = BASE if b is None else _digit(b, 0)
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[low] + _midpoint(a[1:], None)
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def _decode(key):
+    value = 0
+    for char in key:
+        value = value * BASE + DIGITS.index(char)
+    return value
+
+
+def rank_after(key):
+    """The next key after `key` for appending, at least RANK_WIDTH long."""
+    if not key:
+        return _midpoint('', None)
+    width = max(len(key), RANK_WIDTH)
+    value = _decode(key.ljust(width, '0')) + 1
+    if value % BASE == 0:
+        value += 1
+    if value >= BASE ** width:
+        return key + _midpoint('', None)
+    return _encode(value, width)
+
+
+def rank_between(before, after):
+    """
+    A key that sorts after `before` and before `after`. Either may be
+    None (or empty) for the start or the end of the list.
+    """
+    if before and after and before >= after:
+        raise ValueError(f'Rank keys out of order: {before!r} >= {after!r}')
+    if not after:
+        return rank_after(before)
+    return _midpoint(before or '', after)
+
+
+def spread_ranks(count):
+    """
+    `count` evenly spaced keys of equal width in the lower half of the key
+    space, leaving the upper half for appends.
+    """
+    width = RANK_WIDTH
+    while (BASE ** width // 2) // (count + 1) < 2:
+        width += 1
+    step = (BASE ** width // 2) // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = i * step
+        if value % BASE == 0:
+            value += 1
+        keys.append(_encode(value, width))
+    return keys
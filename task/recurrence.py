@@ -0,0 +1,111 @@
+"""
+Recurrence rules for repeating tasks.
+
+A rule is a five-field cron expression, `minute hour day month weekday`,
+read in the site's time zone. Each field is `*`, a number, a range `a-b`,
+a step `*/n` or `a-b/n`, or a comma-separated list of those; weekdays run
+from 0 (Sunday) to 6, and 7 is Sunday too. As in cron, a rule that
+restricts both the day of the month and the weekday fires on either.
+
+"Daily" and "weekly" repeats are stored as the equivalent cron rule (see
+rule_for), so one engine serves all three. Nothing here touches the
+database.
+"""
+import datetime
+
+from django.utils import timezone
+
+
+FREQUENCIES = ('daily', 'weekly', 'cron')
+# name, lowest, highest
+CRON_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+# A rule that never fires within this many years is rejected.
+SEARCH_YEARS = 5
+
+_MINUTE = datetime.timedelta(minutes=1)
+_HOUR = datetime.timedelta(hours=1)
+_DAY = datetime.timedelta(days=1)
+
+
+def _parse_field(text, name, lowest, highest):
+    values = set()
+    for part in text.split(','):
+        span, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if span == '*':
+                start, end = lowest, highest
+            elif '-' in span:
+                start, end = (int(value) for value in span.split('-', 1))
+            else:
+                start = int(span)
+                # `a/n` runs from a to the end of the range, as in cron.
+                end = highest if '/' in part else start
+        except ValueError:
+            raise ValueError(f'Invalid {name} field: {text!r}.')
+        if step < 1 or not lowest <= start <= end <= highest:
+            raise ValueError(f'Invalid {name} field: {text!r}.')
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronRule:
+    """A parsed cron expression; raises ValueError if it is malformed."""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError('A rule needs five fields: minute hour day month weekday.')
+        self.expression = ' '.join(fields)
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(text, *spec) for text, spec in zip(fields, CRON_FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = fields[2].startswith('*')
+        self.any_weekday = fields[4].startswith('*')
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        # Python counts weekdays from Monday, cron from Sunday.
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment):
+        """The first time strictly after the aware datetime `moment` that the rule fires."""
+        local = timezone.localtime(moment).replace(tzinfo=None, second=0, microsecond=0) + _MINUTE
+        limit = local + datetime.timedelta(days=366 * SEARCH_YEARS)
+        while local < limit:
+            if local.month not in self.months:
+                local = datetime.datetime(local.year + local.month // 12, local.month % 12 + 1, 1)
+            elif not self._day_matches(local):
+                local = datetime.datetime(local.year, local.month, local.day) + _DAY
+            elif local.hour not in self.hours:
+                local = local.replace(minute=0) + _HOUR
+            elif local.minute not in self.minutes:
+                local += _MINUTE
+            else:
+                return timezone.make_aware(local)
+        raise ValueError(f'The rule {self.expression!r} never fires.')
+
+    def occurrences(self, after, until, limit):
+        """Up to `limit` firing times in (after, until], in order."""
+        moments = []
+        moment = self.next_after(after)
+        while moment <= until and len(moments) < limit:
+            moments.append(moment)
+            moment = self.next_after(moment)
+        return moments
+
+
+def rule_for(frequency, starts_at, expression=''):
+    """
+    The cron expression for a repeat: 'daily' and 'weekly' fire at the
+    local time (and weekday) of `starts_at`, 'cron' uses `expression`.
+    """
+    if frequency == 'cron':
+        return CronRule(expression).expression
+    local = timezone.localtime(starts_at)
+    weekday = (local.weekday() + 1) % 7 if frequency == 'weekly' else '*'
+    return f'{local.minute} {local.hour} * * {weekday}'
@@ -0,0 +1,200 @@
+"""
+Lazy materialization of repeating tasks.
+
+A TaskRecurrence becomes Task rows only shortly before each occurrence is
+due: materialize() creates the occurrences that fall within
+RECURRENCE_HORIZON of now and moves each rule's next_at past them, so
+task_task never holds more than a horizon's worth of future repeats. Run
+it periodically, more often than the horizon (the
+`materialize_recurrences` management command).
+
+Due rules are read RECURRENCE_BATCH_SIZE at a time through the partial
+next_at index, and each batch is written in one transaction: one query
+for the names already taken, one for the lists' last ranks, one
+executemany() INSERT (project.bulk.insert_rows), the counters, and one
+bulk_update() of next_at. Occurrences missed while the scheduler was not
+running collapse into one overdue task.
+
+upcoming_occurrences() lists the occurrences not created yet, computed
+from rules the caller already loaded, for display.
+"""
+import datetime
+import logging
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from main.background import retry_locked
+from project import fragments
+from project.bulk import insert_rows
+from project.models import Project
+from todolist.models import Todolist
+
+from .models import Task, TaskRecurrence
+from .ranking import rank_after
+from .recurrence import CronRule
+
+
+logger = logging.getLogger(__name__)
+
+RECURRENCE_HORIZON = datetime.timedelta(days=1)
+RECURRENCE_BATCH_SIZE = 500
+# Per rule and run; a rule may fire at most this often per day.
+MAX_OCCURRENCES_PER_RUN = 24
+VIRTUAL_HORIZON = datetime.timedelta(days=7)
+VIRTUAL_LIMIT = 20
+OCCURRENCE_FIELDS = ('id', 'name', 'description', 'is_done', 'due_at', 'rank', 'project', 'todolist', 'created_by')
+
+
+def occurrence_name(name, due_at):
+    """Task names are unique per list, so each occurrence carries its time."""
+    return f'{name} ({timezone.localtime(due_at):%Y-%m-%d %H:%M})'
+
+
+@dataclass
+class Occurrence:
+    recurrence: TaskRecurrence
+    due_at: datetime.datetime
+
+    @property
+    def name(self):
+        return occurrence_name(self.recurrence.name, self.due_at)
+
+
+def first_occurrence(rule, starts_at, now=None):
+    """The first time `rule` fires at or after both `starts_at` and now."""
+    start = max(starts_at, now or timezone.now())
+    return CronRule(rule).next_after(start - datetime.timedelta(minutes=1))
+
+
+def _advance(recurrence, now, until):
+    """Return (occurrences to create, new next_at) for a due rule."""
+    cron = CronRule(recurrence.rule)
+    moments, moment = [], recurrence.next_at
+    if moment < now:
+        # Missed while the scheduler was not running: create the first
+        # one only, then carry on from now.
+        moments.append(moment)
+        moment = cron.next_after(now)
+    while moment <= until and len(moments) < MAX_OCCURRENCES_PER_RUN:
+        moments.append(moment)
+        moment = cron.next_after(moment)
+
+    ends_at = recurrence.ends_at
+    if ends_at is not None:
+        moments = [when for when in moments if when <= ends_at]
+        if moment > ends_at:
+            moment = None
+    return moments, moment
+
+
+def _materialize_batch(recurrences, now, until):
+    plans = []
+    for recurrence in recurrences:
+        try:
+            plans.append((recurrence, *_advance(recurrence, now, until)))
+        except ValueError as e:
+            logger.warning(f"Stopping recurrence {recurrence.pk}: {str(e)}")
+            plans.append((recurrence, [], None))
+
+    todolist_ids = {recurrence.todolist_id for recurrence in recurrences}
+    wanted = {
+        occurrence_name(recurrence.name, moment)
+        for recurrence, moments, _ in plans for moment in moments
+    }
+
+    with transaction.atomic():
+        taken, ranks = set(), {}
+        if wanted:
+            taken = set(
+                Task.objects.filter(todolist_id__in=todolist_ids, name__in=wanted)
+                            .values_list('todolist_id', 'name')
+            )
+            ranks = dict(
+                Task.objects.filter(todolist_id__in=todolist_ids).order_by().values('todolist_id')
+                            .annotate(last=Max('rank')).values_list('todolist_id', 'last')
+            )
+
+        rows, per_todolist, per_project = [], Counter(), Counter()
+        for recurrence, moments, _ in plans:
+            for moment in moments:
+                name = occurrence_name(recurrence.name, moment)
+                if (recurrence.todolist_id, name) in taken:
+                    continue
+                taken.add((recurrence.todolist_id, name))
+                rank = ranks[recurrence.todolist_id] = rank_after(ranks.get(recurrence.todolist_id))
+                rows.append((
+                    uuid.uuid4(), name, recurrence.description or '', False, moment, rank,
+                    recurrence.project_id, recurrence.todolist_id, recurrence.created_by_id,
+                ))
+                per_todolist[recurrence.todolist_id] += 1
+                per_project[recurrence.project_id] += 1
+
+        if rows:
+            # Nothing from the model layer runs, so the counters move here.
+            insert_rows(Task, OCCURRENCE_FIELDS, rows, batch_size=len(rows))
+            for todolist_id, count in per_todolist.items():
+                Todolist.objects.filter(pk=todolist_id).adjust(task_count=count)
+            for project_id, count in per_project.items():
+                Project.objects.filter(pk=project_id).adjust(task_count=count)
+                fragments.invalidate_project(project_id)
+        TaskRecurrence.objects.bulk_update(
+            [TaskRecurrence(pk=recurrence.pk, next_at=next_at) for recurrence, _, next_at in plans],
+            ['next_at'], batch_size=RECURRENCE_BATCH_SIZE,
+        )
+    return len(rows)
+
+
+def _materialize_batch_retrying(recurrences, now, until):
+    # An occurrence created by a concurrent run between the name check and
+    # the insert fails the batch on the unique constraint; checking again
+    # skips it like any other taken name.
+    try:
+        return retry_locked(_materialize_batch, recurrences, now, until)
+    except IntegrityError:
+        return retry_locked(_materialize_batch, recurrences, now, until)
+
+
+def materialize(now=None, horizon=RECURRENCE_HORIZON, batch_size=RECURRENCE_BATCH_SIZE, recurrences=None):
+    """
+    Create the tasks for every occurrence of `recurrences` (all repeats by
+    default) due before now + `horizon`, and return how many were created.
+    """
+    now = now or timezone.now()
+    until = now + horizon
+    if recurrences is None:
+        recurrences = TaskRecurrence.objects.all()
+
+    created = 0
+    while True:
+        # Every rule in a batch leaves it with next_at past `until` (or
+        # later, if it hit MAX_OCCURRENCES_PER_RUN), so this terminates.
+        batch = list(recurrences.filter(next_at__lte=until).order_by('next_at')[:batch_size])
+        if not batch:
+            return created
+        created += _materialize_batch_retrying(batch, now, until)
+
+
+def upcoming_occurrences(recurrences, now=None, horizon=VIRTUAL_HORIZON, limit=VIRTUAL_LIMIT):
+    """
+    The next `limit` occurrences of the loaded `recurrences` within
+    `horizon` that have no task yet, soonest first. No queries are run.
+    """
+    until = (now or timezone.now()) + horizon
+    occurrences = []
+    for recurrence in recurrences:
+        if recurrence.next_at is None:
+            continue
+        cron = CronRule(recurrence.rule)
+        moment = recurrence.next_at
+        for _ in range(limit):
+            if moment > until or (recurrence.ends_at and moment > recurrence.ends_at):
+                break
+            occurrences.append(Occurrence(recurrence, moment))
+            moment = cron.next_after(moment)
+    occurrences.sort(key=lambda occurrence: occurrence.due_at)
+    return occurrences[:limit]
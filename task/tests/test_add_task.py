@@ -132,6 +132,30 @@ class AddTaskViewTests(TestCase):
         self.assertIn(mock_errors.as_text.return_value, messages)
         self.assertEqual(Task.objects.count(), 0)
 
+    def test_add_task_post_duplicate_name(self):
+        """POST with a name already used in the list is rejected by the constraint."""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        Task.objects.create(
+            name='Existing', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        other_list = Todolist.objects.create(name='Other List', project=self.project, created_by=self.user)
+        Task.objects.create(
+            name='Elsewhere', project=self.project, todolist=other_list, created_by=self.user
+        )
+        url = reverse('task:add', kwargs={'project_id': self.project.pk, 'todolist_id': self.todolist.pk})
+
+        response = self.client.post(url, data={'name': 'Existing', 'description': ''})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['form'].errors['name'], ['A task with this name already exists.'])
+        self.assertEqual(Task.objects.filter(name='Existing').count(), 1)
+
+        # The same name in another list is fine.
+        response = self.client.post(url, data={'name': 'Elsewhere', 'description': ''})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Task.objects.filter(name='Elsewhere').count(), 2)
+
     def test_add_task_unauthenticated(self):
         """Unauthenticated request redirects to login."""
         response = self.client.get(
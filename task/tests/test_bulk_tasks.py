@@ -0,0 +1,181 @@
+import uuid
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.models import Project
+from todolist.models import Todolist
+from task.bulk import bulk_update_tasks
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class BulkTaskTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='Test List', project=self.project, created_by=self.user
+        )
+        self.target = Todolist.objects.create(
+            name='Target List', project=self.project, created_by=self.user
+        )
+        self.tasks = [
+            Task.objects.create(
+                name=f'Task {i}', is_done=i < 2, project=self.project,
+                todolist=self.todolist, created_by=self.user
+            )
+            for i in range(5)
+        ]
+        self.url = reverse(
+            'task:bulk', kwargs={'project_id': self.project.pk, 'todolist_id': self.todolist.pk}
+        )
+
+    def _ids(self, tasks):
+        return [str(task.pk) for task in tasks]
+
+    def _counters(self, obj):
+        obj.refresh_from_db()
+        return obj.task_count, obj.completed_task_count
+
+    def test_mark_done(self):
+        """Normal case: done updates only the open tasks and the completed counters"""
+        changed = bulk_update_tasks(self.todolist, 'done', [task.pk for task in self.tasks[1:4]])
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(Task.objects.filter(is_done=True).count(), 4)
+        self.assertEqual(self._counters(self.todolist), (5, 4))
+        self.assertEqual(self._counters(self.project), (5, 4))
+
+    def test_mark_undone(self):
+        """Normal case: undone reopens done tasks"""
+        bulk_update_tasks(self.todolist, 'undone', [task.pk for task in self.tasks])
+
+        self.assertFalse(Task.objects.filter(is_done=True).exists())
+        self.assertEqual(self._counters(self.project), (5, 0))
+
+    def test_delete(self):
+        """Normal case: delete removes the tasks and both counters"""
+        changed = bulk_update_tasks(self.todolist, 'delete', [task.pk for task in self.tasks[:3]])
+
+        self.assertEqual(changed, 3)
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(self._counters(self.todolist), (2, 0))
+        self.assertEqual(self._counters(self.project), (2, 0))
+
+    def test_move(self):
+        """Normal case: move relinks tasks and shifts counters between the lists"""
+        changed = bulk_update_tasks(
+            self.todolist, 'move', [task.pk for task in self.tasks[:3]], target=self.target
+        )
+
+        self.assertEqual(changed, 3)
+        self.assertEqual(self.target.tasks.count(), 3)
+        self.assertEqual(self._counters(self.todolist), (2, 0))
+        self.assertEqual(self._counters(self.target), (3, 2))
+        self.assertEqual(self._counters(self.project), (5, 2))
+
+    def test_query_count_is_constant(self):
+        """Performance: the number of queries does not depend on how many tasks are selected"""
+        with self.assertNumQueries(5):  # savepoint, UPDATE, two counter UPDATEs, release
+            bulk_update_tasks(self.todolist, 'done', [task.pk for task in self.tasks])
+
+    def test_ignores_tasks_from_other_lists(self):
+        """Edge case: ids outside the todolist are not touched"""
+        foreign = Task.objects.create(
+            name='Foreign', project=self.project, todolist=self.target, created_by=self.user
+        )
+
+        changed = bulk_update_tasks(self.todolist, 'delete', [foreign.pk])
+
+        self.assertEqual(changed, 0)
+        self.assertTrue(Task.objects.filter(pk=foreign.pk).exists())
+
+    def test_view_marks_done(self):
+        """Normal case: the endpoint applies the action and redirects to the list"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.post(self.url, {'action': 'done', 'tasks': self._ids(self.tasks)})
+
+        self.assertRedirects(
+            response, f'/projects/{self.project.pk}/{self.todolist.pk}/', fetch_redirect_response=False
+        )
+        self.assertEqual(Task.objects.filter(is_done=True).count(), 5)
+
+    def test_view_move_name_conflict(self):
+        """Edge case: a move that would duplicate a name is rolled back and reported"""
+        Task.objects.create(
+            name='Task 0', project=self.project, todolist=self.target, created_by=self.user
+        )
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.client.post(
+            self.url, {'action': 'move', 'tasks': self._ids(self.tasks), 'target': str(self.target.pk)}
+        )
+
+        self.assertEqual(self.todolist.tasks.count(), 5)
+        self.assertEqual(self._counters(self.target), (1, 0))
+
+    def test_view_move_requires_target(self):
+        """Invalid input: move without a target list changes nothing"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.client.post(self.url, {'action': 'move', 'tasks': self._ids(self.tasks)})
+
+        self.assertEqual(self.todolist.tasks.count(), 5)
+
+    def test_view_invalid_ids(self):
+        """Invalid input: malformed task ids are rejected"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.client.post(self.url, {'action': 'delete', 'tasks': ['not-a-uuid']})
+
+        self.assertEqual(Task.objects.count(), 5)
+
+    def test_view_non_owner(self):
+        """Non-owner gets 404 and nothing changes"""
+        self.client.login(email='otheruser@example.com', password='testpass123')
+
+        response = self.client.post(self.url, {'action': 'delete', 'tasks': self._ids(self.tasks)})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Task.objects.count(), 5)
+
+    def test_view_move_to_foreign_list(self):
+        """Invalid input: a target list from another project returns 404"""
+        other_project = Project.objects.create(name='Other', created_by=self.other_user)
+        foreign = Todolist.objects.create(name='Foreign', project=other_project, created_by=self.other_user)
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.post(
+            self.url, {'action': 'move', 'tasks': self._ids(self.tasks), 'target': str(foreign.pk)}
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.todolist.tasks.count(), 5)
+
+    def test_view_get_not_allowed(self):
+        """Invalid method: GET returns 405"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_view_unknown_todolist(self):
+        """Invalid input: unknown todolist returns 404"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        url = reverse('task:bulk', kwargs={'project_id': self.project.pk, 'todolist_id': uuid.uuid4()})
+
+        self.assertEqual(self.client.post(url, {'action': 'done'}).status_code, 404)
@@ -0,0 +1,128 @@
+import csv
+import datetime
+import io
+import json
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from project.models import Project
+from todolist.models import Todolist
+from task.bulk import move_task
+from task.exporting import export_lines
+from task.importing import import_tasks
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class ExportTasksTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='A list', project=self.project, created_by=self.user
+        )
+        self.other_list = Todolist.objects.create(
+            name='B list', project=self.project, created_by=self.user
+        )
+        self.tasks = [
+            Task.objects.create(
+                name=f'Task {i}', description='Line one\nline, two' if i == 0 else None, is_done=i == 1,
+                due_at=timezone.make_aware(datetime.datetime(2030, 1, 2, 9, 30)) if i == 1 else None,
+                project=self.project, todolist=self.todolist, created_by=self.user
+            )
+            for i in range(3)
+        ]
+        Task.objects.create(
+            name='Elsewhere', project=self.project, todolist=self.other_list, created_by=self.user
+        )
+        self.client.login(email='testuser@example.com', password='testpass123')
+        self.url = reverse('task:export', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk
+        })
+
+    def _content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_todolist_csv(self):
+        """Test normal case: a to-do list exports as CSV in rank order"""
+        move_task(self.todolist, self.tasks[2].pk, before_id=self.tasks[0].pk)
+
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="a-list.csv"')
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        self.assertEqual([row['name'] for row in rows], ['Task 2', 'Task 0', 'Task 1'])
+        self.assertEqual(rows[1]['description'], 'Line one\nline, two')
+        self.assertEqual([row['is_done'] for row in rows], ['false', 'false', 'true'])
+
+    def test_project_jsonl(self):
+        """Test normal case: a project exports every list's tasks as JSONL"""
+        response = self.client.get(
+            reverse('project:export', kwargs={'pk': self.project.pk}), {'format': 'jsonl'}
+        )
+
+        records = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(
+            [(record['todolist'], record['name']) for record in records],
+            [('A list', 'Task 0'), ('A list', 'Task 1'), ('A list', 'Task 2'), ('B list', 'Elsewhere')],
+        )
+        self.assertEqual(records[0]['id'], str(self.tasks[0].pk))
+
+    def test_header_before_query(self):
+        """Test normal case: the CSV header is produced before the database is read"""
+        lines = export_lines([Task.objects.filter(todolist=self.todolist)], 'csv')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(next(lines), 'id,todolist,name,description,is_done,due_at\r\n')
+
+    def test_round_trip(self):
+        """Test normal case: an export imports back into another list"""
+        target = Todolist.objects.create(name='Copy', project=self.project, created_by=self.user)
+
+        content = self._content(self.client.get(self.url))
+        result = import_tasks(target, self.user, io.StringIO(content), 'csv')
+
+        self.assertEqual(result.imported, 3)
+        copied = Task.objects.get(todolist=target, name='Task 1')
+        self.assertTrue(copied.is_done)
+        self.assertEqual(copied.due_at, self.tasks[1].due_at)
+        self.assertIsNone(Task.objects.get(todolist=target, name='Task 0').due_at)
+
+    def test_jsonl_round_trip(self):
+        """Test normal case: a JSONL export keeps due dates through an import"""
+        target = Todolist.objects.create(name='Copy', project=self.project, created_by=self.user)
+
+        content = self._content(self.client.get(self.url, {'format': 'jsonl'}))
+        result = import_tasks(target, self.user, io.StringIO(content), 'jsonl')
+
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(Task.objects.get(todolist=target, name='Task 1').due_at, self.tasks[1].due_at)
+
+    def test_first_row_is_not_buffered(self):
+        """Test normal case: a JSONL export hands out its first row on its own"""
+        lines = export_lines([Task.objects.filter(todolist=self.todolist)], 'jsonl')
+
+        self.assertEqual(json.loads(next(lines))['name'], 'Task 0')
+        self.assertEqual(len(next(lines).splitlines()), 2)
+
+    def test_invalid_requests(self):
+        """Test invalid input: unknown formats and other users' lists return 404"""
+        self.assertEqual(self.client.get(self.url, {'format': 'xml'}).status_code, 404)
+
+        User.objects.create_user(name='otheruser', email='other@example.com', password='testpass123')
+        self.client.login(email='other@example.com', password='testpass123')
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(
+            self.client.get(reverse('project:export', kwargs={'pk': self.project.pk})).status_code, 404
+        )
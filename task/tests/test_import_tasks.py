@@ -0,0 +1,157 @@
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.models import Project
+from todolist.models import Todolist
+from task.importing import guess_format, import_tasks
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class ImportTasksTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='Test List', project=self.project, created_by=self.user
+        )
+        Task.objects.create(
+            name='Existing', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        self.url = reverse(
+            'task:import', kwargs={'project_id': self.project.pk, 'todolist_id': self.todolist.pk}
+        )
+
+    def _import(self, text, fmt, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return import_tasks(self.todolist, self.user, io.StringIO(text), fmt, **kwargs)
+
+    def _names(self):
+        return list(
+            Task.objects.filter(todolist=self.todolist).order_by('rank', 'id').values_list('name', flat=True)
+        )
+
+    def test_csv_import_in_batches(self):
+        """Test normal case: CSV rows are appended in file order, batch by batch"""
+        rows = 'name,description,is_done\n' + ''.join(f'Task {i},Row {i},{i % 2}\n' for i in range(7))
+
+        # The last rank, then per batch: the name check, one INSERT and the two
+        # counter updates inside a savepoint.
+        with self.assertNumQueries(1 + 3 * 6):
+            result = self._import(rows, 'csv', batch_size=3)
+
+        self.assertEqual((result.imported, result.rejected), (7, 0))
+        self.assertEqual(self._names(), ['Existing'] + [f'Task {i}' for i in range(7)])
+        self.todolist.refresh_from_db()
+        self.project.refresh_from_db()
+        self.assertEqual((self.todolist.task_count, self.todolist.completed_task_count), (8, 3))
+        self.assertEqual((self.project.task_count, self.project.completed_task_count), (8, 3))
+
+    def test_jsonl_import(self):
+        """Test normal case: JSONL objects are imported, booleans included"""
+        lines = '\n'.join(json.dumps(row) for row in [
+            {'name': 'One', 'is_done': True},
+            {'name': 'Two', 'description': 'Second'},
+        ])
+
+        result = self._import(lines, 'jsonl')
+
+        self.assertEqual(result.imported, 2)
+        self.assertTrue(Task.objects.get(name='One').is_done)
+        self.assertEqual(Task.objects.get(name='Two').description, 'Second')
+
+    def test_rejected_rows_are_reported(self):
+        """Test invalid input: bad rows are rejected with their line numbers, the rest import"""
+        lines = '\n'.join([
+            json.dumps({'name': 'Good'}),
+            'not json',
+            json.dumps(['a list']),
+            json.dumps({'name': ''}),
+            json.dumps({'name': 'x' * 101}),
+            json.dumps({'name': 'Existing'}),
+            json.dumps({'name': 'Good'}),
+            json.dumps({'name': 'Odd', 'is_done': 'maybe'}),
+            json.dumps({'name': 'Late', 'due_at': 'next week'}),
+        ])
+
+        result = self._import(lines, 'jsonl', batch_size=2)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.rejected, 8)
+        self.assertEqual([line for line, _ in result.errors], [2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertIn('already exists', dict(result.errors)[6])
+
+    def test_csv_without_name_column(self):
+        """Test invalid input: a CSV file without a name column is refused outright"""
+        with self.assertRaises(ValueError):
+            self._import('title\nOne\n', 'csv')
+        self.assertEqual(self._names(), ['Existing'])
+
+    def test_guess_format(self):
+        """Test normal case: the format follows the file extension"""
+        self.assertEqual(guess_format('tasks.JSONL'), 'jsonl')
+        self.assertEqual(guess_format('tasks.ndjson'), 'jsonl')
+        self.assertEqual(guess_format('tasks.csv'), 'csv')
+
+    def test_import_view(self):
+        """Test normal case: uploading a file imports it and lists rejected rows"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        upload = SimpleUploadedFile('tasks.csv', '﻿name\nUploaded\nExisting\n'.encode(), content_type='text/csv')
+
+        response = self.client.post(self.url, {'file': upload})
+
+        self.assertTemplateUsed(response, 'task/import.html')
+        self.assertEqual(response.context['result'].imported, 1)
+        self.assertContains(response, 'A task with this name already exists.')
+        self.assertIn('Uploaded', self._names())
+
+    def test_import_view_keeps_conflicting(self):
+        """Test edge case: a batch that conflicts on every attempt is reported instead of failing"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        upload = SimpleUploadedFile('tasks.csv', b'name\nUploaded\n', content_type='text/csv')
+
+        with patch('task.importing._write_batch', side_effect=IntegrityError('UNIQUE constraint failed')) as write:
+            response = self.client.post(self.url, {'file': upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(write.call_count, 3)
+        self.assertContains(response, 'The list kept changing during the import')
+        self.assertNotIn('Uploaded', self._names())
+
+    def test_import_view_other_user(self):
+        """Test invalid input: importing into someone else's list returns 404"""
+        User.objects.create_user(name='otheruser', email='other@example.com', password='testpass123')
+        self.client.login(email='other@example.com', password='testpass123')
+
+        response = self.client.post(self.url, {'file': SimpleUploadedFile('tasks.csv', b'name\nX\n')})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_command(self):
+        """Test normal case: the management command imports a file and reports rejects"""
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('{"name": "From file"}\n{"name": ""}\n')
+        self.addCleanup(os.unlink, handle.name)
+        out, err = io.StringIO(), io.StringIO()
+
+        call_command('import_tasks', str(self.todolist.pk), handle.name, stdout=out, stderr=err)
+
+        self.assertIn('tasks imported: 1, rows rejected: 1', out.getvalue())
+        self.assertIn('line 2: Name cannot be empty.', err.getvalue())
@@ -0,0 +1,204 @@
+import datetime
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from project.models import Project
+from todolist.models import Todolist
+from task.models import Task, TaskRecurrence
+from task.recurrence import CronRule, rule_for
+from task.scheduler import materialize, upcoming_occurrences
+
+
+User = get_user_model()
+
+
+def at(*args):
+    return timezone.make_aware(datetime.datetime(*args))
+
+
+class CronRuleTests(TestCase):
+    def test_daily_and_steps(self):
+        """Test normal case: fixed times and steps fire at the next matching minute"""
+        self.assertEqual(CronRule('30 9 * * *').next_after(at(2030, 1, 1, 9, 30)), at(2030, 1, 2, 9, 30))
+        self.assertEqual(CronRule('*/15 * * * *').next_after(at(2030, 1, 1, 9, 31)), at(2030, 1, 1, 9, 45))
+        self.assertEqual(CronRule('0 22/1 * * *').next_after(at(2030, 1, 1, 23, 1)), at(2030, 1, 2, 22, 0))
+
+    def test_weekdays_and_month_days(self):
+        """Test normal case: a rule restricting both day and weekday fires on either"""
+        # 2030-01-01 is a Tuesday.
+        self.assertEqual(CronRule('0 9 * * 1-5').next_after(at(2030, 1, 4, 10, 0)), at(2030, 1, 7, 9, 0))
+        self.assertEqual(CronRule('0 9 * * 7').next_after(at(2030, 1, 1)), at(2030, 1, 6, 9, 0))
+        self.assertEqual(CronRule('0 0 15 * 0').next_after(at(2030, 1, 7)), at(2030, 1, 13))
+        self.assertEqual(CronRule('0 0 1 */3 *').next_after(at(2030, 1, 2)), at(2030, 4, 1))
+
+    def test_rule_for(self):
+        """Test normal case: daily and weekly repeats become cron rules at the start time"""
+        starts_at = at(2030, 1, 1, 8, 5)
+        self.assertEqual(rule_for('daily', starts_at), '5 8 * * *')
+        self.assertEqual(rule_for('weekly', starts_at), '5 8 * * 2')
+        self.assertEqual(rule_for('cron', starts_at, ' 0  9 * * 1 '), '0 9 * * 1')
+
+    def test_invalid_rules(self):
+        """Test invalid input: malformed rules and rules that never fire raise ValueError"""
+        for expression in ['', '* * * *', '60 * * * *', '*/0 * * * *', 'a * * * *', '5-1 * * * *']:
+            with self.assertRaises(ValueError):
+                CronRule(expression)
+        with self.assertRaises(ValueError):
+            CronRule('0 0 30 2 *').next_after(at(2030, 1, 1))
+
+
+class MaterializeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        self.now = at(2030, 1, 1, 12, 0)
+
+    def _recurrence(self, rule, next_at, **kwargs):
+        return TaskRecurrence.objects.create(
+            name='Water plants', rule=rule, next_at=next_at, project=self.project,
+            todolist=self.todolist, created_by=self.user, **kwargs
+        )
+
+    def test_creates_occurrences_within_horizon(self):
+        """Test normal case: only occurrences due within the horizon become tasks"""
+        recurrence = self._recurrence('0 */6 * * *', at(2030, 1, 1, 18, 0))
+
+        self.assertEqual(materialize(now=self.now), 4)
+
+        tasks = list(Task.objects.filter(todolist=self.todolist).order_by('due_at'))
+        self.assertEqual([task.due_at for task in tasks], [
+            at(2030, 1, 1, 18), at(2030, 1, 2, 0), at(2030, 1, 2, 6), at(2030, 1, 2, 12),
+        ])
+        self.assertEqual(tasks[0].name, 'Water plants (2030-01-01 18:00)')
+        self.assertEqual([task.rank for task in tasks], sorted(task.rank for task in tasks))
+        recurrence.refresh_from_db()
+        self.assertEqual(recurrence.next_at, at(2030, 1, 2, 18, 0))
+        self.todolist.refresh_from_db()
+        self.project.refresh_from_db()
+        self.assertEqual((self.todolist.task_count, self.project.task_count), (4, 4))
+
+    def test_rerun_is_idempotent(self):
+        """Test edge case: running again creates nothing new, even if next_at was reset"""
+        recurrence = self._recurrence('0 9 * * *', at(2030, 1, 2, 9, 0))
+        materialize(now=self.now)
+        self.assertEqual(materialize(now=self.now), 0)
+
+        TaskRecurrence.objects.filter(pk=recurrence.pk).update(next_at=at(2030, 1, 2, 9, 0))
+        self.assertEqual(materialize(now=self.now), 0)
+        self.assertEqual(Task.objects.filter(todolist=self.todolist).count(), 1)
+
+    def test_missed_occurrences_collapse(self):
+        """Test edge case: a week without the scheduler leaves one overdue task"""
+        self._recurrence('0 9 * * *', at(2029, 12, 25, 9, 0))
+
+        materialize(now=self.now)
+
+        self.assertEqual(
+            list(Task.objects.filter(todolist=self.todolist).order_by('due_at').values_list('due_at', flat=True)),
+            [at(2029, 12, 25, 9, 0), at(2030, 1, 2, 9, 0)]
+        )
+
+    def test_ends_at_stops_the_rule(self):
+        """Test edge case: a rule past its end stops with no next occurrence"""
+        recurrence = self._recurrence('0 */6 * * *', at(2030, 1, 1, 18, 0), ends_at=at(2030, 1, 2, 1, 0))
+
+        self.assertEqual(materialize(now=self.now), 2)
+
+        recurrence.refresh_from_db()
+        self.assertIsNone(recurrence.next_at)
+        self.assertEqual(materialize(now=self.now + datetime.timedelta(days=3)), 0)
+
+    def test_batches(self):
+        """Test normal case: due rules are processed in batches"""
+        for hour in range(5):
+            TaskRecurrence.objects.create(
+                name=f'Rule {hour}', rule=f'0 {hour + 13} * * *', next_at=at(2030, 1, 1, hour + 13),
+                project=self.project, todolist=self.todolist, created_by=self.user,
+            )
+        self.assertEqual(materialize(now=self.now, batch_size=2), 5)
+        self.todolist.refresh_from_db()
+        self.assertEqual(self.todolist.task_count, 5)
+
+    def test_upcoming_occurrences_run_no_queries(self):
+        """Test normal case: coming occurrences are computed from loaded rules"""
+        recurrences = [self._recurrence('0 9 * * *', at(2030, 1, 2, 9, 0))]
+        with self.assertNumQueries(0):
+            occurrences = upcoming_occurrences(recurrences, now=self.now, limit=3)
+        self.assertEqual([o.due_at for o in occurrences], [at(2030, 1, 2, 9), at(2030, 1, 3, 9), at(2030, 1, 4, 9)])
+        self.assertEqual(occurrences[0].name, 'Water plants (2030-01-02 09:00)')
+
+
+class RecurrenceViewTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        self.url = reverse('task:add_recurrence', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk
+        })
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def test_add_creates_first_occurrence(self):
+        """Test normal case: a repeat starting now creates its first task right away"""
+        starts_at = timezone.localtime() + datetime.timedelta(hours=1)
+        response = self.client.post(self.url, {
+            'name': 'Stand-up', 'description': '', 'frequency': 'daily',
+            'starts_at': starts_at.strftime('%Y-%m-%dT%H:%M'), 'cron': '', 'ends_at': '',
+        })
+
+        self.assertRedirects(response, f'/projects/{self.project.pk}/{self.todolist.pk}/')
+        recurrence = TaskRecurrence.objects.get(todolist=self.todolist)
+        self.assertEqual(recurrence.rule, f'{starts_at.minute} {starts_at.hour} * * *')
+        self.assertEqual(Task.objects.filter(todolist=self.todolist, name__startswith='Stand-up').count(), 1)
+
+    def test_rule_firing_too_often(self):
+        """Test invalid input: a custom rule firing more than hourly is rejected"""
+        response = self.client.post(self.url, {
+            'name': 'Spam', 'frequency': 'cron', 'cron': '*/5 * * * *',
+            'starts_at': '2030-01-01T09:00', 'ends_at': '',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('at most 24 times a day', response.context['form'].errors['cron'][0])
+        self.assertFalse(TaskRecurrence.objects.exists())
+
+    def test_todolist_lists_repeats(self):
+        """Test normal case: the list shows its repeats and their coming occurrences"""
+        TaskRecurrence.objects.create(
+            name='Backup', rule='0 3 * * *', next_at=timezone.now() + datetime.timedelta(days=2),
+            project=self.project, todolist=self.todolist, created_by=self.user,
+        )
+        response = self.client.get(f'/projects/{self.project.pk}/{self.todolist.pk}/')
+
+        self.assertEqual(len(response.context['recurrences']), 1)
+        self.assertTrue(response.context['occurrences'])
+        self.assertContains(response, 'Backup')
+
+    def test_delete_keeps_created_tasks(self):
+        """Test normal case: stopping a repeat leaves its tasks in the list"""
+        recurrence = TaskRecurrence.objects.create(
+            name='Backup', rule='0 3 * * *', next_at=timezone.now(),
+            project=self.project, todolist=self.todolist, created_by=self.user,
+        )
+        materialize(recurrences=TaskRecurrence.objects.filter(pk=recurrence.pk))
+        url = reverse('task:delete_recurrence', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': recurrence.pk
+        })
+
+        self.client.get(url)
+
+        self.assertFalse(TaskRecurrence.objects.exists())
+        self.assertTrue(Task.objects.filter(todolist=self.todolist).exists())
@@ -0,0 +1,169 @@
+import random
+
+from django.test import TestCase, Client, SimpleTestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from project.models import Project
+from todolist.models import Todolist
+from task.bulk import move_task, rebalance_todolist
+from task.models import Task
+from task.ranking import RANK_MAX_LENGTH, rank_after, rank_between, spread_ranks
+
+
+User = get_user_model()
+
+
+class RankKeyTests(SimpleTestCase):
+    def test_between_sorts_between(self):
+        """Test normal case: random inserts always land strictly between their neighbours"""
+        rng = random.Random(7)
+        keys = [rank_between(None, None)]
+        for _ in range(500):
+            i = rng.randint(0, len(keys))
+            before = keys[i - 1] if i else None
+            after = keys[i] if i < len(keys) else None
+            key = rank_between(before, after)
+            keys.insert(i, key)
+            self.assertFalse(key.endswith('0'))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_append_keeps_keys_short(self):
+        """Test normal case: appending thousands of keys does not lengthen them"""
+        key = None
+        for _ in range(5000):
+            new = rank_after(key)
+            self.assertGreater(new, key or '')
+            key = new
+        self.assertLessEqual(len(key), 6)
+
+    def test_repeated_inserts_in_one_gap_grow(self):
+        """Test edge case: inserting at the same spot lengthens keys until a rebalance is due"""
+        low, high = rank_after(None), rank_after(rank_after(None))
+        for _ in range(200):
+            high = rank_between(low, high)
+        self.assertGreater(len(high), RANK_MAX_LENGTH)
+
+    def test_spread_is_ordered(self):
+        """Test normal case: rebalanced keys are ordered, unique and leave room for appends"""
+        keys = spread_ranks(1000)
+        self.assertEqual(keys, sorted(set(keys)))
+        self.assertLess(keys[-1], 'i')
+
+    def test_out_of_order(self):
+        """Test invalid input: neighbours in the wrong order are rejected"""
+        with self.assertRaises(ValueError):
+            rank_between('b', 'a')
+
+
+class TaskRankingTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='Test List', project=self.project, created_by=self.user
+        )
+        self.tasks = [
+            Task.objects.create(
+                name=f'Task {i}', project=self.project, todolist=self.todolist, created_by=self.user
+            )
+            for i in range(4)
+        ]
+
+    def _order(self):
+        return list(
+            Task.objects.filter(todolist=self.todolist).order_by('rank', 'id').values_list('name', flat=True)
+        )
+
+    def test_new_tasks_are_appended(self):
+        """Test normal case: tasks keep the order they were added in"""
+        self.assertEqual(self._order(), ['Task 0', 'Task 1', 'Task 2', 'Task 3'])
+
+    def test_move_updates_one_row(self):
+        """Test normal case: a move reads the neighbours and updates only the moved task"""
+        first, second, third, fourth = self.tasks
+
+        with self.assertNumQueries(2):
+            move_task(self.todolist, fourth.pk, after_id=first.pk, before_id=second.pk)
+        move_task(self.todolist, first.pk, after_id=third.pk)
+
+        self.assertEqual(self._order(), ['Task 3', 'Task 1', 'Task 2', 'Task 0'])
+
+    def test_move_to_top(self):
+        """Test edge case: no `after` moves the task to the start of the list"""
+        move_task(self.todolist, self.tasks[2].pk, before_id=self.tasks[0].pk)
+
+        self.assertEqual(self._order()[0], 'Task 2')
+
+    def test_long_keys_schedule_rebalance(self):
+        """Test edge case: once keys get too long the list is rebalanced after commit"""
+        first, second = self.tasks[0], self.tasks[1]
+        with self.captureOnCommitCallbacks() as callbacks:
+            for task in self.tasks[2:] * 100:
+                move_task(self.todolist, task.pk, after_id=first.pk, before_id=second.pk)
+                second = task
+        self.assertTrue(callbacks)
+
+        rebalance_todolist(self.todolist.pk)
+
+        ranks = list(Task.objects.filter(todolist=self.todolist).values_list('rank', flat=True))
+        self.assertTrue(all(len(rank) <= 6 for rank in ranks))
+        self.assertEqual(self._order(), ['Task 0', 'Task 3', 'Task 2', 'Task 1'])
+
+    def test_tied_neighbours_are_rebalanced(self):
+        """Test edge case: neighbours sharing a key are spread out before the move"""
+        first, second, third, _ = self.tasks
+        Task.objects.filter(pk=second.pk).update(rank=Task.objects.get(pk=first.pk).rank)
+        # Tied tasks are shown in id order; the client sends them as displayed.
+        after, before = sorted([first, second], key=lambda task: task.pk)
+
+        move_task(self.todolist, third.pk, after_id=after.pk, before_id=before.pk)
+
+        order = self._order()
+        self.assertEqual(order.index('Task 2'), order.index(after.name) + 1)
+        self.assertEqual(order.index(before.name), order.index('Task 2') + 1)
+
+    def test_reorder_view(self):
+        """Test normal case: the reorder endpoint moves the task and returns its rank"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        url = reverse('task:reorder', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': self.tasks[0].pk
+        })
+
+        response = self.client.post(url, {'after': self.tasks[3].pk, 'before': ''})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._order()[-1], 'Task 0')
+
+    def test_reorder_view_invalid(self):
+        """Test invalid input: bad ids, reversed neighbours and other users are rejected"""
+        url = reverse('task:reorder', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': self.tasks[0].pk
+        })
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.assertEqual(self.client.post(url, {'after': 'nope'}).status_code, 400)
+        self.assertEqual(
+            self.client.post(url, {'after': self.tasks[3].pk, 'before': self.tasks[1].pk}).status_code, 400
+        )
+
+        User.objects.create_user(name='otheruser', email='other@example.com', password='testpass123')
+        self.client.login(email='other@example.com', password='testpass123')
+        self.assertEqual(self.client.post(url, {'after': self.tasks[3].pk}).status_code, 404)
+
+    def test_todolist_page_uses_rank_order(self):
+        """Test normal case: the to-do list page lists tasks by rank"""
+        move_task(self.todolist, self.tasks[3].pk, before_id=self.tasks[0].pk)
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.get(reverse('todolist:todolist', kwargs={
+            'project_id': self.project.pk, 'pk': self.todolist.pk
+        }))
+
+        self.assertEqual([task.name for task in response.context['tasks']][:2], ['Task 3', 'Task 0'])
@@ -0,0 +1,133 @@
+import uuid
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+
+from project.models import Project
+from todolist.models import Todolist
+from task.bulk import _flip_orm, toggle_task
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class ToggleDoneTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            name='otheruser',
+            email='otheruser@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Test Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(
+            name='Test List', project=self.project, created_by=self.user
+        )
+        self.task = Task.objects.create(
+            name='Task', project=self.project, todolist=self.todolist, created_by=self.user
+        )
+        self.url = reverse('task:toggle_done', kwargs={
+            'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': self.task.pk
+        })
+
+    def _completed(self):
+        self.project.refresh_from_db()
+        self.todolist.refresh_from_db()
+        return self.project.completed_task_count, self.todolist.completed_task_count
+
+    def test_toggle_task_flips_both_ways(self):
+        """Test normal case: toggle_task flips is_done and the completed counters"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIs(toggle_task(self.user, self.project.pk, self.todolist.pk, self.task.pk), True)
+        self.assertEqual(self._completed(), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIs(toggle_task(self.user, self.project.pk, self.todolist.pk, self.task.pk), False)
+        self.assertEqual(self._completed(), (0, 0))
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_done)
+
+    def test_toggle_task_other_owner(self):
+        """Test invalid input: a task in someone else's project is left alone"""
+        self.assertIsNone(toggle_task(self.other_user, self.project.pk, self.todolist.pk, self.task.pk))
+        self.assertIsNone(toggle_task(self.user, self.project.pk, self.todolist.pk, uuid.uuid4()))
+
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_done)
+        self.assertEqual(self._completed(), (0, 0))
+
+    def test_toggle_task_project_being_deleted(self):
+        """Test edge case: tasks of a project being deleted cannot be toggled"""
+        Project.objects.filter(pk=self.project.pk).update(deleting_at=timezone.now())
+
+        self.assertIsNone(toggle_task(self.user, self.project.pk, self.todolist.pk, self.task.pk))
+        self.assertIsNone(_flip_orm(self.user, self.project.pk, self.todolist.pk, self.task.pk))
+        self.client.login(email='testuser@example.com', password='testpass123')
+        self.assertEqual(self.client.post(self.url).status_code, 404)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_done)
+        self.assertEqual(self._completed(), (0, 0))
+
+    def test_orm_fallback(self):
+        """Test normal case: the fallback without UPDATE ... RETURNING gives the same result"""
+        self.assertIs(_flip_orm(self.user, self.project.pk, self.todolist.pk, self.task.pk), True)
+        self.assertIs(_flip_orm(self.user, self.project.pk, self.todolist.pk, self.task.pk), False)
+        self.assertIsNone(_flip_orm(self.other_user, self.project.pk, self.todolist.pk, self.task.pk))
+
+    def test_toggle_is_constant_queries(self):
+        """Test normal case: a toggle is the conditional UPDATE plus the two counter updates"""
+        with self.assertNumQueries(5):  # SAVEPOINT/RELEASE around UPDATE ... RETURNING + 2 counters
+            toggle_task(self.user, self.project.pk, self.todolist.pk, self.task.pk)
+
+    def test_view_json(self):
+        """Test normal case: the view answers with JSON when asked for it"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.post(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.json(), {'id': str(self.task.pk), 'is_done': True})
+        self.assertEqual(self._completed(), (1, 1))
+
+    def test_view_fragment(self):
+        """Test normal case: in-page requests get the status fragment back"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.post(self.url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertTemplateUsed(response, 'task/_toggle.html')
+        self.assertContains(response, 'data-toggle')
+        self.assertContains(response, 'Done')
+
+    def test_view_redirects_without_js(self):
+        """Test normal case: a plain form post redirects back to the to-do list"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        response = self.client.post(self.url)
+
+        self.assertRedirects(
+            response, f'/projects/{self.project.pk}/{self.todolist.pk}/', fetch_redirect_response=False
+        )
+
+    def test_view_other_owner_404(self):
+        """Test invalid input: toggling another user's task returns 404"""
+        self.client.login(email='otheruser@example.com', password='testpass123')
+
+        response = self.client.post(self.url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 404)
+        self.task.refresh_from_db()
+        self.assertFalse(self.task.is_done)
+
+    def test_view_get_not_allowed(self):
+        """Test invalid input: GET is rejected"""
+        self.client.login(email='testuser@example.com', password='testpass123')
+
+        self.assertEqual(self.client.get(self.url).status_code, 405)
@@ -9,8 +9,14 @@ app_name = 'task'
 
 urlpatterns = [
     path('add/', views.add, name='add'),
+    path('bulk/', views.bulk, name='bulk'),
+    path('import/', views.import_view, name='import'),
+    path('export/', views.export, name='export'),
+    path('repeat/', views.add_recurrence, name='add_recurrence'),
+    path('repeat/<uuid:pk>/delete/', views.delete_recurrence, name='delete_recurrence'),
     path('<uuid:pk>', views.detail, name='detail'),
     path('<uuid:pk>/toggle_done/', views.toggle_done, name='toggle_done'),
+    path('<uuid:pk>/reorder/', views.reorder, name='reorder'),
     path('<uuid:pk>/edit/', views.edit, name='edit'),
     path('<uuid:pk>/delete/', views.delete, name='delete'),
 ]
\ No newline at end of file
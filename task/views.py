@@ -1,17 +1,25 @@
+import io
 import logging
 
-from sqlite3 import IntegrityError
-
 from django.contrib import messages
+from django.db import IntegrityError
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 
-from project.models import Project
+from audit import log as audit
+from main import rendering
+from project.resolvers import resolve_path
 from todolist.models import Todolist
 
+from .bulk import bulk_update_tasks, move_task, toggle_task
+from .exporting import EXPORT_FORMATS, export_response
+from .importing import guess_format, import_tasks
 from .models import Task
-from .forms import TaskForm, EditTaskForm
+from .forms import TaskBulkForm, TaskForm, EditTaskForm, TaskImportForm, TaskRecurrenceForm, TaskReorderForm
+from .scheduler import first_occurrence, materialize
 
 
 # Configure logging
@@ -23,21 +31,22 @@ FORM_MESSAGES = {
     'task_updated': 'Task updated successfully.',
     'tast_done': 'Task marked as done',
     'task_deleted': 'Task deleted successfully.',
+    'tasks_updated': '{count} tasks updated.',
+    'tasks_imported': '{imported} tasks imported, {rejected} rows rejected.',
+    'import_conflict': 'The list kept changing during the import; some rows were not imported. Please try again.',
+    'recurrence_created': 'Repeating task created successfully.',
+    'recurrence_deleted': 'Repeating task deleted successfully.',
 }
 
 
 @login_required(login_url='/login/')
 @require_http_methods(["GET", "POST"])
-def add(request, project_id, todolist_id):
+@resolve_path()
+def add(request, project, todolist):
     """
     Add a task to a to-do list within a project owned by the authenticated user.
     """
-    project = get_object_or_404(
-        Project,
-        pk=project_id,
-        created_by=request.user
-    )
-    todolist = get_object_or_404(Todolist, pk=todolist_id, project=project)
+    project_id, todolist_id = project.pk, todolist.pk
 
     if request.method == 'POST':
         form = TaskForm(request.POST)
@@ -47,9 +56,12 @@ def add(request, project_id, todolist_id):
                 task.project = project
                 task.todolist = todolist
                 task.created_by = request.user
-                task.save()
-                messages.success(request, FORM_MESSAGES['task_created'])
-                return redirect(f'/projects/{project_id}/{todolist_id}/')
+                if form.save_unique(task):
+                    audit.record(request.user, 'create', 'task', task.pk, project.pk)
+                    rendering.warm(task.description)
+                    messages.success(request, FORM_MESSAGES['task_created'])
+                    return redirect(f'/projects/{project_id}/{todolist_id}/')
+                messages.error(request, form.errors.as_text())
             except IntegrityError as e:
                 logger.error(f"Error creating task for project_id={project_id}, todolist_id={todolist_id}: {str(e)}")
                 messages.error(request, form.errors.as_text())
@@ -68,18 +80,11 @@ def add(request, project_id, todolist_id):
 
 @login_required(login_url='/login')
 @require_http_methods(["GET"])
-def detail(request, project_id, todolist_id, pk):
+@resolve_path(pk='task')
+def detail(request, project, todolist, task):
     """
     Display details of a task within a to-do list and project owned by the authenticated user.
     """
-    project = get_object_or_404(
-        Project,
-        created_by=request.user,
-        pk=project_id
-    )
-    todolist = get_object_or_404(Todolist, project=project, pk=todolist_id)
-    task = get_object_or_404(Task, project=project, todolist=todolist, pk=pk)
-
     context = {
         'project': project,
         'todolist': todolist,
@@ -94,39 +99,194 @@ def detail(request, project_id, todolist_id, pk):
 def toggle_done(request, project_id, todolist_id, pk):
     """
     Toggle the 'is_done' status of a task within a to-do list and project owned by the authenticated user.
-    """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist, pk=todolist_id, project=project)
-    task = get_object_or_404(Task, pk=pk, project=project, todolist=todolist)
+    The flip and the ownership check are a single UPDATE (see task.bulk.toggle_task).
 
+    Responds with JSON when the client accepts it, with the task's status
+    fragment for in-page (XMLHttpRequest/fetch) requests, and otherwise
+    redirects back to the to-do list.
+    """
     try:
-        task.is_done = not task.is_done  # Toggle the current state
-        task.save()
-        messages.success(request, FORM_MESSAGES['tast_done'])
-    except IntegrityError:
+        is_done = toggle_task(request.user, project_id, todolist_id, pk)
+    except IntegrityError as e:
         logger.error(f"Error toggling is_done for task pk={pk}, project_id={project_id}, todolist_id={todolist_id}: {str(e)}")
         messages.error(request, 'Failed to update task status due to a database error.')
+        return redirect(f'/projects/{project_id}/{todolist_id}/')
+
+    if is_done is None:
+        raise Http404('No task matches the given query.')
+    audit.record(request.user, 'toggle', 'task', pk, project_id, {'is_done': is_done})
 
+    if request.GET.get('format') == 'json' or 'application/json' in request.headers.get('Accept', ''):
+        return JsonResponse({'id': str(pk), 'is_done': is_done})
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return render(request, 'task/_toggle.html', {
+            'task_base_url': f'/projects/{project_id}/{todolist_id}/',
+            'task': {'id': pk, 'is_done': is_done},
+        })
+
+    messages.success(request, FORM_MESSAGES['tast_done'])
     return redirect(f'/projects/{project_id}/{todolist_id}/')
 
 
+@login_required(login_url='/login')
+@require_http_methods(["POST"])
+@resolve_path()
+def bulk(request, project, todolist):
+    """
+    Mark done or undone, delete, or move many tasks of a to-do list at once.
+    Ownership is checked with a single query and the action runs as one
+    set-based statement per is_done value (see task.bulk).
+    """
+    project_id, todolist_id = project.pk, todolist.pk
+    redirect_url = f'/projects/{project_id}/{todolist_id}/'
+
+    form = TaskBulkForm(request.POST)
+    if not form.is_valid():
+        messages.error(request, form.errors.as_text())
+        return redirect(redirect_url)
+
+    action = form.cleaned_data['action']
+    target = None
+    changes = None
+    if action == 'move':
+        target = get_object_or_404(Todolist, pk=form.cleaned_data['target'], project_id=project_id)
+        changes = {'todolist': str(target.pk)}
+    elif action != 'delete':
+        changes = {'is_done': action == 'done'}
+
+    # Only tasks that really are in the list are logged as changed.
+    task_ids = list(todolist.tasks.filter(pk__in=form.cleaned_data['tasks']).values_list('pk', flat=True))
+    try:
+        count = bulk_update_tasks(todolist, action, task_ids, target=target)
+        audit.record_many(
+            request.user, 'delete' if action == 'delete' else 'update', 'task', task_ids, project_id, changes
+        )
+        messages.success(request, FORM_MESSAGES['tasks_updated'].format(count=count))
+    except IntegrityError as e:
+        logger.error(f"Bulk {action} failed for todolist_id={todolist_id}: {str(e)}")
+        messages.error(request, 'Some tasks could not be moved: the target list already has tasks with the same names.')
+
+    return redirect(redirect_url)
+
+
 @login_required(login_url='/login')
 @require_http_methods(["GET", "POST"])
-def edit(request, project_id, todolist_id, pk):
+@resolve_path()
+def import_view(request, project, todolist):
+    """
+    Import tasks into a to-do list from an uploaded CSV or JSONL file.
+    The upload is read row by row and written in batches (see task.importing);
+    rejected rows are listed on the result page.
+    """
+    project_id, todolist_id = project.pk, todolist.pk
+    result = None
+
+    if request.method == 'POST':
+        form = TaskImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt = form.cleaned_data['format'] or guess_format(upload.name)
+            try:
+                with io.TextIOWrapper(upload.open('rb'), encoding='utf-8-sig', newline='') as lines:
+                    result = import_tasks(todolist, request.user, lines, fmt)
+                # One event for the list rather than one per imported row.
+                audit.record(request.user, 'update', 'todolist', todolist.pk, project_id, {
+                    'imported': result.imported, 'rejected': result.rejected,
+                })
+                messages.success(request, FORM_MESSAGES['tasks_imported'].format(
+                    imported=result.imported, rejected=result.rejected
+                ))
+            except (ValueError, UnicodeDecodeError) as e:
+                logger.warning(f"Import into todolist_id={todolist_id} failed: {str(e)}")
+                messages.error(request, f'The file could not be imported: {e}')
+            except IntegrityError as e:
+                logger.error(f"Import into todolist_id={todolist_id} kept conflicting: {str(e)}")
+                messages.error(request, FORM_MESSAGES['import_conflict'])
+        else:
+            messages.error(request, form.errors.as_text())
+    else:
+        form = TaskImportForm()
+
+    return render(request, 'task/import.html', {
+        'project': project,
+        'todolist': todolist,
+        'form': form,
+        'result': result,
+    })
+
+
+@login_required(login_url='/login')
+@require_http_methods(["GET"])
+@resolve_path()
+def export(request, project, todolist):
+    """
+    Download the tasks of a to-do list as CSV (default) or JSONL (?format=jsonl),
+    streamed as they are read (see task.exporting).
+    """
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        raise Http404('Unknown export format.')
+
+    tasks = Task.objects.filter(todolist=todolist).order_by('rank', 'id')
+    return export_response([tasks], fmt, todolist.name)
+
+
+@login_required(login_url='/login')
+@require_http_methods(["POST"])
+@resolve_path()
+def reorder(request, project, todolist, pk):
+    """
+    Move a task to a new position in its to-do list, between the tasks given
+    as `after` and `before`, or into another list of the project given as
+    `todolist` (the board's columns). Only the moved task's row is written
+    (see task.ranking); answers with JSON for the drag-and-drop scripts.
+    """
+    project_id, todolist_id = project.pk, todolist.pk
+    form = TaskReorderForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    target = todolist
+    if form.cleaned_data['todolist'] not in (None, todolist_id):
+        target = get_object_or_404(Todolist, pk=form.cleaned_data['todolist'], project_id=project_id)
+
+    try:
+        rank = move_task(todolist, pk, form.cleaned_data['after'], form.cleaned_data['before'], target=target)
+    except ValueError as e:
+        logger.warning(f"Invalid reorder of task pk={pk} in todolist_id={todolist_id}: {str(e)}")
+        return JsonResponse({'errors': {'__all__': ['The neighbouring tasks are out of order.']}}, status=400)
+    except IntegrityError as e:
+        logger.warning(f"Move of task pk={pk} to todolist_id={target.pk} failed: {str(e)}")
+        return JsonResponse({'errors': {'__all__': ['That list already has a task with this name.']}}, status=409)
+
+    if rank is None:
+        raise Http404('No task matches the given query.')
+    changes = {'rank': rank}
+    if target is not todolist:
+        changes['todolist'] = str(target.pk)
+    audit.record(request.user, 'update', 'task', pk, project_id, changes)
+    return JsonResponse({'id': str(pk), 'rank': rank, 'todolist': str(target.pk)})
+
+
+@login_required(login_url='/login')
+@require_http_methods(["GET", "POST"])
+@resolve_path(pk='task')
+def edit(request, project, todolist, task):
     """
     Edit a task within a to-do list and project owned by the authenticated user.
     """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist, pk=todolist_id, project=project)
-    task = get_object_or_404(Task, pk=pk, project=project, todolist=todolist)
+    project_id, todolist_id, pk = project.pk, todolist.pk, task.pk
 
     if request.method == 'POST':
         form = EditTaskForm(request.POST, instance=task)
         if form.is_valid():
             try:
-                form.save()
-                messages.success(request, FORM_MESSAGES['task_updated'])
-                return redirect(f'/projects/{project_id}/{todolist_id}/')
+                if form.save_unique():
+                    audit.record(request.user, 'update', 'task', task.pk, project.pk, {'fields': form.changed_data})
+                    rendering.warm(task.description)
+                    messages.success(request, FORM_MESSAGES['task_updated'])
+                    return redirect(f'/projects/{project_id}/{todolist_id}/')
+                messages.error(request, form.errors.as_text())
             except IntegrityError as e:
                 logger.error(f"Error updating task pk={pk} for project_id={project_id}, todolist_id={todolist_id}: {str(e)}")
                 messages.error(request, form.errors.as_text())
@@ -143,19 +303,63 @@ def edit(request, project_id, todolist_id, pk):
 
 @require_http_methods(["DELETE", "GET"])
 @login_required(login_url='/login/')
-def delete(request, project_id, todolist_id, pk):
+@resolve_path(pk='task')
+def delete(request, project, todolist, task):
     """
     Delete a task from a to-do list within a project owned by the authenticated user.
     """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist, pk=todolist_id, project=project)
-    task = get_object_or_404(todolist.tasks, pk=pk)
+    project_id, todolist_id, pk = project.pk, todolist.pk, task.pk
 
     try:
         task.delete()
+        audit.record(request.user, 'delete', 'task', pk, project.pk)
         messages.success(request, FORM_MESSAGES['task_deleted'])
     except IntegrityError:
         logger.error(f"IntegrityError deleting task pk={pk} for project_id={project_id}, todolist_id={todolist_id}")
         messages.error(request, 'Failed to delete task due to a database error.')
 
     return redirect(f'/projects/{project_id}/{todolist_id}/')
+
+
+@login_required(login_url='/login')
+@require_http_methods(["GET", "POST"])
+@resolve_path()
+def add_recurrence(request, project, todolist):
+    """
+    Add a repeating task to a to-do list. Only the occurrences due soon are
+    created as tasks, now and then by the scheduler (see task.scheduler).
+    """
+    if request.method == 'POST':
+        form = TaskRecurrenceForm(request.POST)
+        if form.is_valid():
+            recurrence = form.save(commit=False)
+            recurrence.project = project
+            recurrence.todolist = todolist
+            recurrence.created_by = request.user
+            recurrence.next_at = first_occurrence(recurrence.rule, form.cleaned_data['starts_at'])
+            recurrence.save()
+            materialize(recurrences=todolist.recurrences.filter(pk=recurrence.pk))
+            messages.success(request, FORM_MESSAGES['recurrence_created'])
+            return redirect(f'/projects/{project.pk}/{todolist.pk}/')
+        messages.error(request, form.errors.as_text())
+    else:
+        form = TaskRecurrenceForm(initial={'starts_at': timezone.localtime().replace(second=0, microsecond=0)})
+
+    return render(request, 'task/add_recurrence.html', {
+        'project': project,
+        'todolist': todolist,
+        'form': form,
+    })
+
+
+@login_required(login_url='/login')
+@require_http_methods(["DELETE", "GET"])
+@resolve_path()
+def delete_recurrence(request, project, todolist, pk):
+    """
+    Stop a repeating task. Occurrences already created stay in the list.
+    """
+    recurrence = get_object_or_404(todolist.recurrences, pk=pk)
+    recurrence.delete()
+    messages.success(request, FORM_MESSAGES['recurrence_deleted'])
+    return redirect(f'/projects/{project.pk}/{todolist.pk}/')
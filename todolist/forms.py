@@ -1,9 +1,18 @@
 from django import forms
 
+from main.forms import ConstraintErrorsMixin
+
 from .models import Todolist
 
 
-class TodolistForm(forms.ModelForm):
+TODOLIST_NAME_ERRORS = {
+    'todolist_project_name_uniq': ('name', 'A todo list with this name already exists.'),
+}
+
+
+class TodolistForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = TODOLIST_NAME_ERRORS
+
     class Meta:
         model = Todolist
         fields = ['name', 'description']
@@ -16,8 +25,6 @@ class TodolistForm(forms.ModelForm):
             raise forms.ValidationError('Name cannot be longer than 100 characters.')
         if name.isalnum():
             raise forms.ValidationError('Name must be alphabetical.')
-        if Todolist.objects.filter(name=name).exists():
-            raise forms.ValidationError('A todo list with this name already exists.')
         return name
 
     def clean_description(self):
@@ -27,7 +34,9 @@ class TodolistForm(forms.ModelForm):
         return description
 
 
-class EditTodolistForm(forms.ModelForm):
+class EditTodolistForm(ConstraintErrorsMixin, forms.ModelForm):
+    constraint_errors = TODOLIST_NAME_ERRORS
+
     class Meta:
         model = Todolist
         fields = ['name', 'description']
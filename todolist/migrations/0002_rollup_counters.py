@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todolist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todolist',
+            name='completed_task_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='todolist',
+            name='task_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
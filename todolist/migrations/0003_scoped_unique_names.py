@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-18 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0013_scoped_unique_names'),
+        ('todolist', '0002_rollup_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='todolist',
+            constraint=models.UniqueConstraint(fields=('project', 'name'), name='todolist_project_name_uniq'),
+        ),
+    ]
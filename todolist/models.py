@@ -1,8 +1,10 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Q
 
 from account.models import User
-from project.models import Project
+from project import fragments
+from project.models import CounterQuerySet, Project
 
 
 class Todolist(models.Model):
@@ -15,5 +17,41 @@ class Todolist(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='todolists')
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='todolists')
 
+    # Denormalized rollups, kept in step by Task.save()/delete().
+    task_count = models.IntegerField(default=0)
+    completed_task_count = models.IntegerField(default=0)
+
+    objects = CounterQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'name'], name='todolist_project_name_uniq'),
+        ]
+
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                Project.objects.filter(pk=self.project_id).adjust(todolist_count=1)
+            fragments.invalidate_project(self.project_id)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # The tasks go with the list through the cascade; take their
+            # totals off the project in the same transaction.
+            totals = self.tasks.aggregate(
+                tasks=Count('pk'),
+                completed=Count('pk', filter=Q(is_done=True)),
+            )
+            result = super().delete(*args, **kwargs)
+            Project.objects.filter(pk=self.project_id).adjust(
+                todolist_count=-1,
+                task_count=-totals['tasks'],
+                completed_task_count=-totals['completed'],
+            )
+            fragments.invalidate_project(self.project_id)
+        return result
@@ -139,6 +139,20 @@ class TodolistAddViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Todolist.objects.filter(name='Duplicate Name').count(), 1)
 
+    def test_add_post_same_name_in_other_project(self):
+        """Names only have to be unique within a project."""
+        self.client.login(email='testuser@example.com', password='testpass123')
+        other_project = Project.objects.create(name='Other Project', created_by=self.user)
+        Todolist.objects.create(project=other_project, name='Shared Name', created_by=self.user)
+
+        response = self.client.post(
+            reverse('todolist:add', kwargs={'project_id': self.project.pk}),
+            data={'name': 'Shared Name', 'description': ''}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Todolist.objects.filter(name='Shared Name').count(), 2)
+
     def test_add_unauthenticated(self):
         """Unauthenticated → login redirect."""
         response = self.client.get(reverse('todolist:add', kwargs={'project_id': self.project.pk}))
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from project.models import Project
+from todolist.models import Todolist
+from task.models import Task
+
+
+User = get_user_model()
+
+
+class TodolistPagesTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            name='testuser',
+            email='testuser@gmail.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(name='Project', created_by=self.user)
+        self.todolist = Todolist.objects.create(name='List', project=self.project, created_by=self.user)
+        self.tasks = [
+            Task.objects.create(
+                name=f'Task {i}', is_done=i % 2 == 1, project=self.project,
+                todolist=self.todolist, created_by=self.user,
+            )
+            for i in range(5)
+        ]
+        self.url = reverse('todolist:todolist', kwargs={'project_id': self.project.pk, 'pk': self.todolist.pk})
+        self.client.login(email='testuser@gmail.com', password='testpass123')
+
+    def _scroll(self, params=None):
+        """Load the page, then follow each fragment's next page link."""
+        response = self.client.get(self.url, params or {})
+        seen, next_url = list(response.context['tasks']), response.context['next_url']
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertTemplateUsed(response, 'todolist/_tasks.html')
+            seen.extend(response.context['tasks'])
+            next_url = response.context['next_url']
+        return seen
+
+    def test_first_page_then_fragments(self):
+        """Test normal case: the list renders one page and scrolling loads the rest in order"""
+        with patch('todolist.views.TASK_PAGE_SIZE', 2):
+            response = self.client.get(self.url)
+            self.assertEqual(response.context['tasks'], self.tasks[:2])
+            self.assertContains(response, 'data-next-page')
+            self.assertEqual(self._scroll(), self.tasks)
+
+    def test_status_filter(self):
+        """Test normal case: the open and done filters carry over to the next pages"""
+        with patch('todolist.views.TASK_PAGE_SIZE', 1):
+            self.assertEqual(self._scroll({'status': 'done'}), [self.tasks[1], self.tasks[3]])
+            self.assertEqual(self._scroll({'status': 'open'}), self.tasks[0::2])
+            self.assertEqual(self._scroll({'status': 'bogus'}), self.tasks)
+
+    def test_task_links(self):
+        """Test normal case: task links built from the list's URL point at the task views"""
+        response = self.client.get(self.url)
+        task = self.tasks[0]
+        for name in ['detail', 'toggle_done', 'reorder']:
+            url = reverse(f'task:{name}', kwargs={
+                'project_id': self.project.pk, 'todolist_id': self.todolist.pk, 'pk': task.pk
+            })
+            self.assertContains(response, f'"{url}"')
+
+    def test_invalid_cursor(self):
+        """Test invalid input: a tampered cursor is a 404 for fragments and resets the page"""
+        fragment = reverse('todolist:tasks', kwargs={'project_id': self.project.pk, 'pk': self.todolist.pk})
+        self.assertEqual(self.client.get(fragment, {'cursor': 'garbage!'}).status_code, 404)
+        self.assertRedirects(self.client.get(self.url, {'cursor': 'garbage!'}), self.url)
+
+    def test_fragment_queries_do_not_grow(self):
+        """Test edge case: a fragment costs the same queries however many tasks it holds"""
+        fragment = reverse('todolist:tasks', kwargs={'project_id': self.project.pk, 'pk': self.todolist.pk})
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(fragment)
+        for i in range(20):
+            Task.objects.create(name=f'More {i}', project=self.project, todolist=self.todolist, created_by=self.user)
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(fragment)
+        self.assertEqual(len(small), len(large))
+
+    def test_filtered_page_uses_index(self):
+        """Test normal case: a filtered page is one range scan of its partial status index"""
+        cursor = self._cursor()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'status': 'open', 'cursor': cursor})
+        task_queries = [q['sql'] for q in queries.captured_queries if '"task_task"."rank"' in q['sql']]
+        self.assertEqual(len(task_queries), 1)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {task_queries[0]}')
+                plan = ' '.join(str(row) for row in cursor.fetchall())
+            self.assertIn('task_todolist_open_idx', plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def _cursor(self):
+        with patch('todolist.views.TASK_PAGE_SIZE', 1):
+            return self.client.get(self.url, {'status': 'open'}).context['next_url'].split('cursor=')[1].split('&')[0]
@@ -11,6 +11,7 @@ app_name = 'todolist'
 urlpatterns = [
     path('add/', views.add, name='add'),
     path('<uuid:pk>/', views.todolist, name='todolist'),
+    path('<uuid:pk>/tasks/', views.tasks, name='tasks'),
     path('<uuid:pk>/edit/', views.edit, name='edit'),
     path('<uuid:pk>/delete/', views.delete, name='delete'),
 ]
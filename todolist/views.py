@@ -1,15 +1,20 @@
 import logging
+from urllib.parse import urlencode
 
 from django.urls import reverse
+from django.http import Http404
 from django.contrib import messages
 from django.db import IntegrityError
 from django.core.exceptions import MultipleObjectsReturned
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404, render, redirect
+from django.shortcuts import render, redirect
 from django.views.decorators.http import require_http_methods
 
-from project.models import Project
-from .models import Todolist
+from audit import log as audit
+from project.loaders import with_preview
+from project.pagination import InvalidCursor, keyset_paginate
+from project.resolvers import resolve_path
+from task.scheduler import upcoming_occurrences
 from .forms import TodolistForm, EditTodolistForm
 
 
@@ -23,18 +28,50 @@ FORM_MESSAGES = {
     'delete': 'To-do list deleted successfully.',
 }
 
+TASK_PAGE_SIZE = 50
+TASK_ORDERING = ('rank', 'id')
+# ?status= filters, served by the partial open and done indexes.
+TASK_STATUSES = {'open': False, 'done': True}
+
+
+def _task_page(request, project, todolist):
+    """
+    The page of the list's tasks after ?cursor=, optionally filtered by
+    ?status=, and the context to render it with todolist/_tasks.html.
+    Raises InvalidCursor for a tampered cursor.
+    """
+    status = request.GET.get('status')
+    tasks = with_preview(todolist.tasks.all(), 'description')
+    if status in TASK_STATUSES:
+        tasks = tasks.filter(is_done=TASK_STATUSES[status])
+    else:
+        status = ''
+    page = keyset_paginate(tasks, TASK_ORDERING, request.GET.get('cursor'), TASK_PAGE_SIZE)
+
+    base_url = reverse('todolist:todolist', kwargs={'project_id': project.pk, 'pk': todolist.pk})
+    next_url = None
+    if page.has_next:
+        query = {'cursor': page.next_cursor, **({'status': status} if status else {})}
+        next_url = f'{base_url}tasks/?{urlencode(query)}'
+    return {
+        'project': project,
+        'todolist': todolist,
+        'tasks': page.items,
+        'status': status,
+        # Task URLs are built from this prefix instead of a reverse per task.
+        'task_base_url': base_url,
+        'next_url': next_url,
+    }
+
 
 @login_required(login_url='/login')
 @require_http_methods(["GET", "POST"])
-def add(request, project_id):
+@resolve_path()
+def add(request, project):
     """
     Add a to-do list to a project owned by the authenticated user.
     """
-    project = get_object_or_404(
-        Project,
-        pk=project_id,
-        created_by=request.user
-    )
+    project_id = project.pk
 
     if request.method == 'POST':
         form = TodolistForm(request.POST)
@@ -43,9 +80,11 @@ def add(request, project_id):
                 todolist = form.save(commit=False)
                 todolist.project = project
                 todolist.created_by = request.user
-                todolist.save()
-                messages.success(request, FORM_MESSAGES['success'])
-                return redirect(f'/projects/{project_id}/')
+                if form.save_unique(todolist):
+                    audit.record(request.user, 'create', 'todolist', todolist.pk, project.pk)
+                    messages.success(request, FORM_MESSAGES['success'])
+                    return redirect(f'/projects/{project_id}/')
+                messages.error(request, form.errors.as_text())
             except IntegrityError as e:
                 logger.error(f"Error creating to-do list for project_id={project_id}: {str(e)}")
                 messages.error(request, form.errors.as_text())
@@ -64,40 +103,69 @@ def add(request, project_id):
 
 @login_required(login_url='/login')
 @require_http_methods(["GET"])
-def todolist(request, project_id, pk):
+@resolve_path(pk='todolist')
+def todolist(request, project, todolist):
     """
     Display details of a to-do list within a project owned by the authenticated user.
+    Only the first page of tasks is rendered; the page fetches the rest from
+    the `tasks` view as the user scrolls.
     """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist.objects.prefetch_related('tasks'), pk=pk, project=project)
-
+    try:
+        context = _task_page(request, project, todolist)
+    except InvalidCursor:
+        return redirect(request.path)
+    # One query for the list's repeats; their coming occurrences are
+    # computed from the rules, not read.
+    recurrences = list(todolist.recurrences.order_by('name'))
     try:
         return render(request, 'todolist/todolist.html', {
-            'project': project,
-            'todolist': todolist,
+            **context,
+            'move_targets': project.todolists.exclude(pk=todolist.pk).only('id', 'name'),
+            'recurrences': recurrences,
+            'occurrences': upcoming_occurrences(recurrences),
         })
     except MultipleObjectsReturned:
-        logger.error(f"Multiple to-do lists found with pk={pk} for project_id={project_id}")
+        logger.error(f"Multiple to-do lists found with pk={todolist.pk} for project_id={project.pk}")
         messages.error(request, 'An error occurred while retrieving the to-do list.')
         return redirect(reverse('project:projects'))
 
 
+@login_required(login_url='/login')
+@require_http_methods(["GET"])
+@resolve_path(pk='todolist')
+def tasks(request, project, todolist):
+    """
+    The next page of a to-do list's tasks as an HTML fragment, for infinite
+    scrolling. Each page seeks to its ?cursor= through an index, so it costs
+    the same however far down the list it is.
+    """
+    try:
+        context = _task_page(request, project, todolist)
+    except InvalidCursor:
+        raise Http404('Invalid page cursor.')
+    return render(request, 'todolist/_tasks.html', context)
+
+
 @login_required(login_url='/login')
 @require_http_methods(["GET", "POST"])
-def edit(request, project_id, pk):
+@resolve_path(pk='todolist')
+def edit(request, project, todolist):
     """
     Edit a to-do list within a project owned by the authenticated user.
     """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist, pk=pk, project=project)
+    project_id, pk = project.pk, todolist.pk
 
     if request.method == 'POST':
         form = EditTodolistForm(request.POST, instance=todolist)
         if form.is_valid():
             try:
-                form.save()
-                messages.success(request, FORM_MESSAGES['update'])
-                return redirect(f'/projects/{project_id}/')
+                if form.save_unique():
+                    audit.record(
+                        request.user, 'update', 'todolist', todolist.pk, project.pk, {'fields': form.changed_data}
+                    )
+                    messages.success(request, FORM_MESSAGES['update'])
+                    return redirect(f'/projects/{project_id}/')
+                messages.error(request, form.errors.as_text())
             except IntegrityError as e:
                 logger.error(f"Error updating to-do list pk={pk} for project_id={project_id}: {str(e)}")
                 messages.error(request, 'Failed to update to-do list due to a database error.')
@@ -115,15 +183,16 @@ def edit(request, project_id, pk):
 
 @login_required(login_url='/login')
 @require_http_methods(["DELETE", "GET"])
-def delete(request, project_id, pk):
+@resolve_path(pk='todolist')
+def delete(request, project, todolist):
     """
     Delete a to-do list from a project owned by the authenticated user.
     """
-    project = get_object_or_404(Project, pk=project_id, created_by=request.user)
-    todolist = get_object_or_404(Todolist, pk=pk, project=project)
+    project_id, pk = project.pk, todolist.pk
 
     try:
         todolist.delete()
+        audit.record(request.user, 'delete', 'todolist', pk, project.pk)
         messages.success(request, FORM_MESSAGES['delete'])
     except IntegrityError:
         logger.error(f"IntegrityError deleting to-do list pk={pk} for project_id={project_id}")